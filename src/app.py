@@ -1,12 +1,46 @@
-from flask import Flask, render_template, request, jsonify
-from scrapers.social_media_scraper import SocialMediaScraper
-from models.clone_model import DigitalClone
-from utils.text_processor import TextProcessor
+from flask import Flask, Response, render_template, request, jsonify, url_for, stream_with_context
+from models.model_registry import get_model_registry
+from models.clone_store import CloneStore
+from scrapers.driver_pool import get_driver_pool
+from scrapers.backends import create_backend
+from utils.job_queue import JobQueue, JobQueueFull
+from utils.nltk_resources import get_nltk_resources
+from utils.response_cache import get_response_cache
+from utils.sentiment import get_sentiment_engine
+from pipeline import build_clone, refresh_clone
+import config
+import json
 import os
+import threading
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 
+# Eksik NLTK verilerinde uygulama açılırken anlaşılır bir hatayla dur
+nltk_resources = get_nltk_resources()
+
+model_registry = get_model_registry()
+if config.PRELOAD_MODELS:
+    model_registry.warm_up()
+
+clone_store = CloneStore(config.CLONE_DIR,
+                         max_cached_clones=config.CLONE_CACHE_SIZE,
+                         max_cached_bytes=config.CLONE_CACHE_MB * 1024 * 1024,
+                         registry=model_registry)
+
+driver_pool = get_driver_pool()
+if config.PRELOAD_BROWSERS:
+    driver_pool.warm_up()
+
+if config.SCRAPER_BACKEND == 'replay':
+    scraper_backend = create_backend('replay', root=config.REPLAY_DIR)
+elif config.SCRAPER_BACKEND == 'synthetic':
+    scraper_backend = create_backend('synthetic', num_posts=config.SYNTHETIC_POSTS)
+else:
+    scraper_backend = create_backend('selenium', driver_pool=driver_pool)
+
+job_queue = JobQueue(max_workers=config.JOB_WORKERS, max_pending=config.JOB_MAX_PENDING)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -18,25 +52,71 @@ def create_clone():
         return jsonify({'error': 'URL gerekli'}), 400
 
     try:
-        # Sosyal medya verilerini çek
-        scraper = SocialMediaScraper()
-        profile_data = scraper.scrape_profile(social_media_url)
+        # Klon oluşturma arka planda çalışır, istemci iş durumunu sorgular
+        job = job_queue.submit(build_clone, kind='create_clone',
+                               url=social_media_url,
+                               clone_store=clone_store,
+                               registry=model_registry,
+                               scraper=scraper_backend)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
 
-        # Metin işleme
-        processor = TextProcessor()
-        processed_data = processor.process(profile_data)
+    return jsonify({
+        'success': True,
+        'job_id': job.job_id,
+        'status_url': url_for('job_status', job_id=job.job_id),
+        'message': 'Klon oluşturma başlatıldı'
+    }), 202
 
-        # Dijital klon oluştur
-        clone = DigitalClone()
-        clone.train(processed_data)
+@app.route('/refresh_clone', methods=['POST'])
+def refresh_clone_route():
+    clone_id = request.values.get('clone_id')
+    if not clone_id:
+        return jsonify({'error': 'Klon kimliği gerekli'}), 400
+    if not clone_store.exists(clone_id):
+        return jsonify({'error': 'Klon bulunamadı'}), 404
 
+    # Bu klon için zaten bekleyen/çalışan bir güncelleme varsa yenisi kuyruğa alınmaz
+    job = job_queue.find_active('refresh_clone', clone_id=clone_id)
+    if job is not None:
         return jsonify({
             'success': True,
-            'message': 'Dijital klon başarıyla oluşturuldu'
-        })
+            'job_id': job.job_id,
+            'status_url': url_for('job_status', job_id=job.job_id),
+            'message': 'Klon güncellemesi zaten sürüyor'
+        }), 202
 
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    try:
+        # Yalnızca yeni gönderiler toplanıp klona eklenir
+        job = job_queue.submit(refresh_clone, kind='refresh_clone',
+                               clone_id=clone_id,
+                               clone_store=clone_store,
+                               scraper=scraper_backend)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+
+    return jsonify({
+        'success': True,
+        'job_id': job.job_id,
+        'status_url': url_for('job_status', job_id=job.job_id),
+        'message': 'Klon güncelleme başlatıldı'
+    }), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    if not job_queue.cancel(job_id):
+        return jsonify({'error': 'İş zaten tamamlandı'}), 409
+    return jsonify(job.to_dict())
 
 @app.route('/ask_clone', methods=['POST'])
 def ask_clone():
@@ -44,12 +124,79 @@ def ask_clone():
     if not question:
         return jsonify({'error': 'Soru gerekli'}), 400
 
+    clone_id = request.values.get('clone_id')
+    if not clone_id:
+        return jsonify({'error': 'Klon kimliği gerekli'}), 400
+
     try:
-        clone = DigitalClone()
+        clone = clone_store.get(clone_id)
+        if clone is None:
+            return jsonify({'error': 'Klon bulunamadı'}), 404
+
         response = clone.generate_response(question)
         return jsonify({'response': response})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/ask_clone/stream', methods=['POST'])
+def ask_clone_stream():
+    # Server-Sent Events: üretilen tokenler 'token', kişiselleştirilmiş tam yanıt 'final' olayıyla gönderilir
+    question = request.form.get('question')
+    if not question:
+        return jsonify({'error': 'Soru gerekli'}), 400
+
+    clone_id = request.values.get('clone_id')
+    if not clone_id:
+        return jsonify({'error': 'Klon kimliği gerekli'}), 400
+
+    try:
+        clone = clone_store.get(clone_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    if clone is None:
+        return jsonify({'error': 'Klon bulunamadı'}), 404
+
+    # İstemci bağlantıyı kapatınca (GeneratorExit) üretim iş parçacığı da durdurulur
+    stop_event = threading.Event()
+
+    def events():
+        try:
+            for event, text in clone.stream_response(question, stop_event):
+                yield f"event: {event}\ndata: {json.dumps({'text': text}, ensure_ascii=False)}\n\n"
+        finally:
+            stop_event.set()
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/search', methods=['GET'])
+def search():
+    # Önbellekteki tüm 'hashing' klonlarının gönderilerinde tek sorguyla arama
+    question = request.args.get('q')
+    if not question:
+        return jsonify({'error': 'Sorgu gerekli'}), 400
+
+    try:
+        top_k = int(request.args.get('top_k', config.RETRIEVAL_TOP_K))
+    except ValueError:
+        return jsonify({'error': 'Geçersiz top_k'}), 400
+    top_k = max(1, min(top_k, 100))
+
+    results = clone_store.search(question, top_k)
+    return jsonify({'results': [{'clone_id': clone_id, 'post': post, 'score': score}
+                                for clone_id, post, score in results]})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return jsonify({
+        'models': model_registry.metrics(),
+        'nltk': {'load_seconds': nltk_resources.load_seconds},
+        'clone_store': clone_store.metrics(),
+        'response_cache': get_response_cache().metrics(),
+        'sentiment': get_sentiment_engine().metrics(),
+        'jobs': job_queue.metrics(),
+        'browsers': driver_pool.metrics()
+    })
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,75 @@
+# Kullanım: cd src && python -m benchmarks.compact_posts_benchmark --posts 10000
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import tracemalloc
+import argparse
+import gc
+import os
+
+from scrapers.backends import generate_synthetic_profile
+from utils.text_processor import TextProcessor
+
+
+def _rss_bytes():
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def measure(post_count, compact):
+    # İşlenmiş verinin bellekte kalan boyutunu ölçer (girdi profili ölçüme dahil edilmez)
+    profile_data = generate_synthetic_profile('https://twitter.com/sentetik', post_count, seed=post_count)
+    processor = TextProcessor(workers=1, compact=compact)
+    processor.process(generate_synthetic_profile('https://twitter.com/isinma', 10, seed=1))
+    gc.collect()
+
+    rss_before = _rss_bytes()
+    tracemalloc.start()
+    processed_data = processor.process(profile_data)
+    gc.collect()
+    retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = _rss_bytes()
+
+    return {
+        'mode': 'compact' if compact else 'dict',
+        'posts': len(processed_data['posts']),
+        'retained_bytes': retained_bytes,
+        'peak_bytes': peak_bytes,
+        'rss_delta_bytes': rss_after - rss_before if rss_before is not None and rss_after is not None else None
+    }
+
+
+def check_parity(post_count):
+    # Sıkıştırılmış gönderiler sözlük arayüzünden eski çıktıyla aynı değerleri vermeli
+    profile_data = generate_synthetic_profile('https://twitter.com/sentetik', post_count, seed=post_count)
+    expected = TextProcessor(workers=1, compact=False).process(profile_data)
+    actual = TextProcessor(workers=1, compact=True).process(profile_data)
+    posts_equal = all(compact_post.to_dict() == post for compact_post, post in zip(actual['posts'], expected['posts']))
+    return posts_equal and actual['aggregate_analysis'] == expected['aggregate_analysis']
+
+
+def run(post_count):
+    # Her mod ayrı bir süreçte ölçülür, böylece RSS farkları birbirini etkilemez
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for compact in (False, True):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(measure, post_count, compact).result())
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='İşlenmiş gönderilerin sözlük ve sıkıştırılmış bellek kullanımı')
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--parity-posts', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'mod':<8} {'gönderi':>8} {'kalan (MB)':>11} {'tepe (MB)':>10} {'RSS farkı (MB)':>15}")
+    for result in run(args.posts):
+        rss = result['rss_delta_bytes']
+        print(f"{result['mode']:<8} {result['posts']:>8} {result['retained_bytes'] / 2 ** 20:>11.1f} "
+              f"{result['peak_bytes'] / 2 ** 20:>10.1f} {rss / 2 ** 20 if rss is not None else float('nan'):>15.1f}")
+    print(f"aynı çıktı: {check_parity(args.parity_posts)}")
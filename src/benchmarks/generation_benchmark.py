@@ -0,0 +1,61 @@
+# Kullanım: cd src && python -m benchmarks.generation_benchmark --clients 16 --questions 4 --batch-sizes 1 8
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import time
+
+from models.generation_batcher import GenerationBatcher
+from models.model_registry import get_model_registry
+
+QUESTIONS = [
+    'Bugün ne yaptın?',
+    'En sevdiğin yemek hangisi?',
+    'Hafta sonu için planların neler?',
+    'Son okuduğun kitap neydi?'
+]
+
+
+def run(registry, batch_size, max_wait_ms, clients, questions_per_client):
+    # Eşzamanlı kullanıcılar aynı kayıt defterine soru gönderir
+    batcher = GenerationBatcher(registry, max_batch_size=batch_size, max_wait_ms=max_wait_ms)
+
+    def client(client_id):
+        latencies = []
+        for i in range(questions_per_client):
+            started = time.perf_counter()
+            batcher.generate(QUESTIONS[(client_id + i) % len(QUESTIONS)])
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        latencies = sorted(latency for result in executor.map(client, range(clients)) for latency in result)
+    elapsed = time.perf_counter() - started
+
+    metrics = batcher.metrics()
+    return {
+        'batch_size': batch_size,
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        'mean_batch_size': metrics['mean_batch_size']
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mikro-parti yanıt üretiminin verim ve gecikme ölçümü')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--questions', type=int, default=4)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--max-wait-ms', type=int, default=20)
+    args = parser.parse_args()
+
+    registry = get_model_registry().warm_up()
+
+    print(f"{'parti':>6} {'istek':>6} {'süre (s)':>9} {'istek/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'ort. parti':>11}")
+    for batch_size in args.batch_sizes:
+        result = run(registry, batch_size, args.max_wait_ms, args.clients, args.questions)
+        print(f"{result['batch_size']:>6} {result['requests']:>6} {result['seconds']:>9.2f} "
+              f"{result['requests_per_second']:>8.2f} {result['p50_ms']:>9.0f} {result['p95_ms']:>9.0f} "
+              f"{result['mean_batch_size']:>11.2f}")
@@ -0,0 +1,161 @@
+# Kullanım: cd src && python -m benchmarks.html_parser_parity [--live] [--repeat 20]
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from scrapers.html_parsers import (parse_twitter_profile, parse_twitter_tweets, parse_instagram_post,
+                                   parse_linkedin_profile, parse_linkedin_posts)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'html')
+
+# Canlı okumada tweet düğümlerine konan işaret; her ölçümden önce temizlenir
+CLEAR_SEEN_JS = "document.querySelectorAll('[data-arpa-seen]').forEach(node => delete node.dataset.arpaSeen);"
+
+
+def fixture_platform(name):
+    # twitter.html, instagram_video.html -> twitter, instagram
+    return name.split('.', 1)[0].split('_', 1)[0]
+
+
+def load_fixtures():
+    with open(os.path.join(FIXTURE_DIR, 'expected.json'), 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+
+    fixtures = []
+    for name in sorted(expected):
+        with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+            fixtures.append((name, f.read(), expected[name]))
+    return fixtures
+
+
+def snapshot_records(platform, html):
+    if platform == 'twitter':
+        return parse_twitter_tweets(html)
+    if platform == 'instagram':
+        record = parse_instagram_post(html)
+        return [record] if record is not None else []
+    return parse_linkedin_posts(html)
+
+
+def snapshot_profile(platform, html):
+    if platform == 'twitter':
+        return parse_twitter_profile(html)
+    if platform == 'linkedin':
+        return parse_linkedin_profile(html)
+    return None
+
+
+def live_records(scraper, platform):
+    # 'live' modundaki WebDriver okuma yolu
+    from scrapers.social_media_scraper import COLLECT_TWEETS_JS, TWEET_SELECTOR
+
+    if platform == 'twitter':
+        scraper.driver.execute_script(CLEAR_SEEN_JS)
+        return scraper.driver.execute_script(COLLECT_TWEETS_JS, TWEET_SELECTOR)
+    if platform == 'instagram':
+        return [scraper._read_instagram_modal()]
+    return scraper._read_linkedin_posts()
+
+
+def live_profile(driver, platform):
+    # _scrape_twitter / _scrape_linkedin içindeki profil seçicileri
+    from selenium.webdriver.common.by import By
+
+    if platform == 'twitter':
+        return {
+            'name': driver.find_element(By.CSS_SELECTOR, '[data-testid="UserName"]').text,
+            'bio': driver.find_element(By.CSS_SELECTOR, '[data-testid="UserDescription"]').text
+        }
+    if platform == 'linkedin':
+        return {
+            'name': driver.find_element(By.CSS_SELECTOR, '.text-heading-xlarge').text,
+            'headline': driver.find_element(By.CSS_SELECTOR, '.text-body-medium').text
+        }
+    return None
+
+
+def _best_seconds(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def run_offline(fixtures, repeat):
+    # Tarayıcı olmadan: ayrıştırıcı çıktısı expected.json içindeki beklenen kayıtlarla karşılaştırılır
+    results = []
+    for name, html, expected in fixtures:
+        platform = fixture_platform(name)
+        records, seconds = _best_seconds(lambda: snapshot_records(platform, html), repeat)
+        results.append({
+            'fixture': name,
+            'records': len(records),
+            'same': records == expected['records'] and
+                    snapshot_profile(platform, html) == expected.get('profile_info'),
+            'parse_seconds': seconds
+        })
+    return results
+
+
+def run_live(fixtures, repeat):
+    # Her fikstür tarayıcıda açılır; aynı DOM üzerinde anlık görüntü ve canlı okuma karşılaştırılır
+    from scrapers.social_media_scraper import SocialMediaScraper
+    from scrapers.driver_pool import DriverPool
+
+    pool = DriverPool(size=1)
+    pool.warm_up()
+    results = []
+    try:
+        with pool.lease() as driver:
+            scraper = SocialMediaScraper(driver_pool=pool, parse_mode='live')
+            scraper.driver = driver
+            for name, _, _ in fixtures:
+                platform = fixture_platform(name)
+                driver.get(Path(FIXTURE_DIR, name).as_uri())
+
+                snapshot, snapshot_seconds = _best_seconds(
+                    lambda: snapshot_records(platform, driver.page_source), repeat)
+                live, live_seconds = _best_seconds(lambda: live_records(scraper, platform), repeat)
+                profile = snapshot_profile(platform, driver.page_source)
+
+                results.append({
+                    'fixture': name,
+                    'records': len(live),
+                    'same': snapshot == live and profile == live_profile(driver, platform),
+                    'snapshot_seconds': snapshot_seconds,
+                    'live_seconds': live_seconds
+                })
+    finally:
+        pool.close()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='lxml ayrıştırıcıları ile WebDriver okumasının kayıtlı HTML üzerinde karşılaştırması')
+    parser.add_argument('--live', action='store_true', help='Fikstürleri headless Chrome ile açıp canlı okumayla karşılaştır')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    mismatches = 0
+
+    print(f"{'fikstür':<26} {'kayıt':>6} {'beklenen':>9} {'lxml (ms)':>10}")
+    for result in run_offline(fixtures, args.repeat):
+        mismatches += not result['same']
+        print(f"{result['fixture']:<26} {result['records']:>6} {'aynı' if result['same'] else 'FARKLI':>9} "
+              f"{result['parse_seconds'] * 1000:>10.3f}")
+
+    if args.live:
+        print(f"\n{'fikstür':<26} {'kayıt':>6} {'canlı':>9} {'snapshot (ms)':>14} {'live (ms)':>10}")
+        for result in run_live(fixtures, args.repeat):
+            mismatches += not result['same']
+            print(f"{result['fixture']:<26} {result['records']:>6} {'aynı' if result['same'] else 'FARKLI':>9} "
+                  f"{result['snapshot_seconds'] * 1000:>14.3f} {result['live_seconds'] * 1000:>10.3f}")
+
+    if mismatches:
+        raise SystemExit(f'{mismatches} fikstürde ayrıştırma farkı var')
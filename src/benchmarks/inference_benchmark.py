@@ -0,0 +1,94 @@
+# Kullanım: cd src && python -m benchmarks.inference_benchmark --backends torch quantized onnx --threads 4
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import argparse
+import time
+
+QUESTIONS = [
+    'Bugün ne yaptın?',
+    'En sevdiğin yemek hangisi?',
+    'Hafta sonu için planların neler?',
+    'Son okuduğun kitap neydi?',
+    'Sabahları kahve mi çay mı içersin?',
+    'Hangi şehirde yaşamak isterdin?',
+    'En son hangi filmi izledin?',
+    'Boş zamanlarında ne yaparsın?'
+]
+
+
+def measure(backend, num_threads, interop_threads, repeat):
+    # Her altyapı ayrı bir süreçte ölçülür; iş parçacığı ayarları ve bellek birbirini etkilemez
+    import config
+    config.INFERENCE_THREADS = num_threads
+    config.INFERENCE_INTEROP_THREADS = interop_threads
+
+    import torch
+    from models.generation_batcher import GenerationBatcher
+    from models.model_registry import ModelRegistry, _process_rss_bytes
+
+    registry = ModelRegistry(backend=backend)
+    rss_before = _process_rss_bytes()
+    started = time.perf_counter()
+    registry.warm_up()
+    load_seconds = time.perf_counter() - started
+    rss_after_load = _process_rss_bytes()
+
+    # Karşılaştırılabilir süreler için tüm altyapılarda aynı sabit uzunluklu açgözlü üretim
+    batcher = GenerationBatcher(registry, generate_kwargs={'max_new_tokens': 32, 'min_new_tokens': 32,
+                                                           'do_sample': False})
+    batcher._generate_batch(QUESTIONS[:1])
+
+    latencies = []
+    for _ in range(repeat):
+        for question in QUESTIONS:
+            torch.manual_seed(0)
+            started = time.perf_counter()
+            batcher._generate_batch([question])
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        batcher._generate_batch(QUESTIONS)
+    batch_seconds = time.perf_counter() - started
+
+    metrics = registry.metrics()
+    return {
+        'backend': backend,
+        'threads': metrics['threads'],
+        'load_seconds': load_seconds,
+        'model_bytes': metrics['parameter_bytes'],
+        'rss_delta_bytes': rss_after_load - rss_before,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        'questions_per_second': len(QUESTIONS) * repeat / batch_seconds
+    }
+
+
+def run(backends, num_threads, interop_threads, repeat):
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                results.append(executor.submit(measure, backend, num_threads, interop_threads, repeat).result())
+            except Exception as e:
+                print(f"{backend} error: {str(e)}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Çıkarım altyapılarının gecikme, verim ve bellek karşılaştırması')
+    parser.add_argument('--backends', nargs='+', default=['torch', 'quantized', 'onnx'])
+    parser.add_argument('--threads', type=int, default=0)
+    parser.add_argument('--interop-threads', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'altyapı':<10} {'iş parç.':>9} {'yükleme (s)':>12} {'model (MB)':>11} {'RSS farkı (MB)':>15} "
+          f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'soru/s (parti)':>15}")
+    for result in run(args.backends, args.threads, args.interop_threads, args.repeat):
+        threads = f"{result['threads']['intra_op']}/{result['threads']['inter_op']}"
+        print(f"{result['backend']:<10} {threads:>9} {result['load_seconds']:>12.1f} "
+              f"{result['model_bytes'] / 2 ** 20:>11.1f} {result['rss_delta_bytes'] / 2 ** 20:>15.1f} "
+              f"{result['p50_ms']:>9.0f} {result['p95_ms']:>9.0f} {result['questions_per_second']:>15.2f}")
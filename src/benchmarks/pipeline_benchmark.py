@@ -0,0 +1,80 @@
+# Kullanım: cd src && python -m benchmarks.pipeline_benchmark --backend synthetic --clones 100 --posts 200
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+import argparse
+import tempfile
+import time
+
+from scrapers.backends import create_backend
+from models.clone_store import CloneStore
+from utils.text_processor import TextProcessor
+from pipeline import build_clone
+
+
+class StageTimer:
+    # build_clone'un job arayüzünü taklit ederek aşama sürelerini toplar
+    def __init__(self):
+        self.durations = {}
+        self._stage = None
+        self._started = None
+
+    def update(self, stage=None, progress=None):
+        now = time.perf_counter()
+        if self._stage is not None:
+            self.durations[self._stage] = now - self._started
+        self._stage = stage
+        self._started = now
+
+    def finish(self):
+        self.update(None)
+        return self.durations
+
+
+def run(backend, urls, clones, workers):
+    store = CloneStore(tempfile.mkdtemp(prefix='arpa-bench-'), max_cached_clones=1)
+    processor = TextProcessor()
+    stage_totals = defaultdict(float)
+    posts_total = 0
+
+    def build_one(i):
+        timer = StageTimer()
+        url = urls[i % len(urls)]
+        result = build_clone(url, store, job=timer, scraper=backend, processor=processor)
+        return timer.finish(), result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for durations, result in executor.map(build_one, range(clones)):
+            for stage, seconds in durations.items():
+                stage_totals[stage] += seconds
+            posts_total += len(store.get(result['clone_id']).profile_data['posts'])
+    elapsed = time.perf_counter() - start
+
+    return {
+        'seconds': elapsed,
+        'clones_per_second': clones / elapsed,
+        'posts_per_second': posts_total / elapsed,
+        'stage_seconds': dict(stage_totals)
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Veri toplama -> metin işleme -> eğitim hattının uçtan uca ölçümü')
+    parser.add_argument('--backend', choices=['synthetic', 'replay'], default='synthetic')
+    parser.add_argument('--replay-dir', default='recordings')
+    parser.add_argument('--urls', nargs='+', default=['https://twitter.com/sentetik'])
+    parser.add_argument('--clones', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.backend == 'replay':
+        backend = create_backend('replay', root=args.replay_dir)
+    else:
+        backend = create_backend('synthetic', num_posts=args.posts)
+
+    result = run(backend, args.urls, args.clones, args.workers)
+    print(f"{args.clones} klon, {result['seconds']:.2f} s")
+    print(f"{result['clones_per_second']:.2f} klon/s, {result['posts_per_second']:.1f} gönderi/s")
+    for stage, seconds in result['stage_seconds'].items():
+        print(f"  {stage:<8} {seconds:.2f} s")
@@ -0,0 +1,90 @@
+# Kullanım: cd src && python -m benchmarks.retrieval_benchmark --posts 10000 100000 --topics 200
+import argparse
+import time
+
+import numpy as np
+
+from models.retrieval import ExactSparseIndex, HashingIndex, IVFIndex
+
+
+def generate_texts(post_count, topic_count, seed=0):
+    # Konu yapılı sentetik gönderiler: her gönderi bir konunun kelimeleri ve ortak kelimelerden oluşur
+    rng = np.random.default_rng(seed)
+    topics = [rng.choice(20000, 30, replace=False) for _ in range(topic_count)]
+    texts = []
+    for _ in range(post_count):
+        words = np.concatenate([rng.choice(topics[rng.integers(topic_count)], 8), rng.integers(0, 300, 4)])
+        texts.append(' '.join(f'k{word}' for word in words))
+    return texts
+
+
+def brute_force(matrix, query, top_k):
+    scores = np.asarray((matrix @ query.T).todense()).ravel()
+    rows = np.argpartition(-scores, min(top_k, len(scores) - 1))[:top_k]
+    return rows[np.argsort(-scores[rows], kind='stable')], scores
+
+
+def run(post_count, topic_count, query_count, top_k, n_probe):
+    texts = generate_texts(post_count, topic_count, seed=post_count)
+    index = HashingIndex()
+    index.fit(texts)
+
+    started = time.perf_counter()
+    exact = ExactSparseIndex(index.matrix)
+    exact_build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ann = IVFIndex.build(index.matrix)
+    ann._get_list_matrix()
+    ann_build = time.perf_counter() - started
+
+    # Sorgular gönderilerden alınan kısa parçalardır
+    rng = np.random.default_rng(1)
+    queries = [index.transform(' '.join(texts[rng.integers(post_count)].split()[:6])) for _ in range(query_count)]
+
+    timings = {'brute': 0.0, 'exact': 0.0, 'ann': 0.0}
+    recalls = []
+    for query in queries:
+        started = time.perf_counter()
+        brute_force(index.matrix, query, top_k)
+        timings['brute'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        _, exact_scores = exact.search(query, top_k)
+        timings['exact'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        _, ann_scores = ann.search(query, top_k, n_probe=n_probe)
+        timings['ann'] += time.perf_counter() - started
+
+        # Eşit skorlu gönderiler yer değiştirebileceğinden recall skor eşiğiyle ölçülür
+        if len(exact_scores):
+            recalls.append(np.sum(ann_scores >= exact_scores[-1] - 1e-9) / len(exact_scores))
+
+    return {
+        'posts': post_count,
+        'exact_build': exact_build,
+        'ann_build': ann_build,
+        'brute_ms': timings['brute'] / query_count * 1000,
+        'exact_ms': timings['exact'] / query_count * 1000,
+        'ann_ms': timings['ann'] / query_count * 1000,
+        'recall': float(np.mean(recalls)) if recalls else 1.0
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gönderi arama dizinlerinin sorgu süresi ve isabeti')
+    parser.add_argument('--posts', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--topics', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--probes', type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'gönderi':>8} {'kurulum exact (s)':>18} {'kurulum ann (s)':>16} "
+          f"{'tümü (ms)':>10} {'exact (ms)':>11} {'ann (ms)':>9} {'ann recall':>11}")
+    for post_count in args.posts:
+        result = run(post_count, args.topics, args.queries, args.top_k, args.probes)
+        print(f"{result['posts']:>8} {result['exact_build']:>18.2f} {result['ann_build']:>16.2f} "
+              f"{result['brute_ms']:>10.2f} {result['exact_ms']:>11.2f} {result['ann_ms']:>9.2f} "
+              f"{result['recall']:>11.3f}")
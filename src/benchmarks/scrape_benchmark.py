@@ -0,0 +1,48 @@
+# Kullanım: cd src && python -m benchmarks.scrape_benchmark https://twitter.com/kullanici --modes fixed adaptive
+from scrapers.social_media_scraper import SocialMediaScraper
+from scrapers.driver_pool import DriverPool
+import argparse
+import time
+
+
+def run(urls, modes, repeat=1, max_posts=None):
+    pool = DriverPool(size=1)
+    # Tarayıcı açılış maliyeti ölçüme dahil edilmesin
+    pool.warm_up()
+
+    results = {}
+    try:
+        for mode in modes:
+            scraper = SocialMediaScraper(driver_pool=pool, wait_mode=mode, max_posts=max_posts)
+            total_seconds = 0.0
+            total_posts = 0
+            for _ in range(repeat):
+                for url in urls:
+                    start = time.perf_counter()
+                    profile_data = scraper.scrape_profile(url)
+                    total_seconds += time.perf_counter() - start
+                    total_posts += len(profile_data['posts'])
+
+            results[mode] = {
+                'seconds': total_seconds,
+                'posts': total_posts,
+                'seconds_per_post': total_seconds / total_posts if total_posts else float('nan')
+            }
+    finally:
+        pool.close()
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bekleme modlarına göre gönderi başına veri toplama süresi')
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--modes', nargs='+', default=['fixed', 'adaptive'])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--max-posts', type=int, default=None)
+    args = parser.parse_args()
+
+    results = run(args.urls, args.modes, args.repeat, args.max_posts)
+    print(f"{'mod':<10} {'süre (s)':>10} {'gönderi':>8} {'s/gönderi':>10}")
+    for mode, result in results.items():
+        print(f"{mode:<10} {result['seconds']:>10.2f} {result['posts']:>8} {result['seconds_per_post']:>10.3f}")
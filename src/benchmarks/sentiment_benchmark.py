@@ -0,0 +1,97 @@
+# Kullanım: cd src && python -m benchmarks.sentiment_benchmark --texts 10000 --duplicates 0.3
+import argparse
+import random
+import time
+
+from utils.nltk_resources import get_nltk_resources
+from utils.sentiment import SentimentEngine
+
+FILLER = ['the', 'movie', 'was', 'today', 'we', 'went', 'to', 'city', 'team', 'game', 'coffee', 'with', 'friends',
+          'bugün', 'kahve', 'maç', 'hafta', 'sonu', 'kitap']
+PUNCTUATION = ['.', '!', '?', '!!', '??', '...']
+
+
+def synthetic_texts(count, duplicates, seed=0):
+    # VADER sözlüğünden duygu kelimeleri, artırıcılar, olumsuzlamalar ve 'but' içeren kısa metinler;
+    # duplicates oranındaki metinler önceki metinlerin tekrarıdır (retweet, kopya gönderi)
+    sia = get_nltk_resources().sia
+    rng = random.Random(seed)
+    lexicon = sorted(sia.lexicon)
+    boosters = sorted(sia.constants.BOOSTER_DICT)
+    negations = sorted(sia.constants.NEGATE)
+
+    texts = []
+    for _ in range(count):
+        if texts and rng.random() < duplicates:
+            texts.append(rng.choice(texts))
+            continue
+        words = []
+        for _ in range(rng.randint(4, 20)):
+            roll = rng.random()
+            if roll < 0.2:
+                words.append(rng.choice(lexicon))
+            elif roll < 0.27:
+                words.append(rng.choice(boosters))
+            elif roll < 0.32:
+                words.append(rng.choice(negations))
+            elif roll < 0.34:
+                words.append('but')
+            else:
+                words.append(rng.choice(FILLER))
+        texts.append(' '.join(words) + rng.choice(PUNCTUATION))
+    return texts
+
+
+def _label(compound):
+    if compound > 0.05:
+        return 'positive'
+    if compound < -0.05:
+        return 'negative'
+    return 'neutral'
+
+
+def run(count, duplicates, repeat):
+    texts = synthetic_texts(count, duplicates, seed=count)
+    sia = get_nltk_resources().sia
+
+    started = time.perf_counter()
+    baseline = [sia.polarity_scores(text) for text in texts]
+    loop_seconds = time.perf_counter() - started
+
+    results = []
+    for backend in ('vader', 'lexicon'):
+        best = None
+        for _ in range(repeat):
+            # Her tekrar boş önbellekle başlar; ölçülen süre tek bir profilin ilk işlenmesidir
+            engine = SentimentEngine(backend=backend)
+            started = time.perf_counter()
+            scores = engine.score(texts)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        results.append({
+            'backend': backend,
+            'seconds': best,
+            'speedup': loop_seconds / best,
+            'same': sum(score == expected for score, expected in zip(scores, baseline)) / count,
+            'label_agreement': sum(_label(score['compound']) == _label(expected['compound'])
+                                   for score, expected in zip(scores, baseline)) / count,
+            'max_compound_error': max(abs(score['compound'] - expected['compound'])
+                                      for score, expected in zip(scores, baseline))
+        })
+    return loop_seconds, results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gönderi başına VADER ile toplu duygu analizi altyapılarının karşılaştırması')
+    parser.add_argument('--texts', type=int, default=10000)
+    parser.add_argument('--duplicates', type=float, default=0.3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    loop_seconds, results = run(args.texts, args.duplicates, args.repeat)
+    print(f"gönderi başına polarity_scores: {loop_seconds * 1000:.1f} ms")
+    print(f"{'altyapı':<10} {'süre (ms)':>10} {'hızlanma':>9} {'birebir':>8} {'etiket':>7} {'en büyük fark':>14}")
+    for result in results:
+        print(f"{result['backend']:<10} {result['seconds'] * 1000:>10.1f} {result['speedup']:>8.1f}x "
+              f"{result['same']:>8.1%} {result['label_agreement']:>7.1%} {result['max_compound_error']:>14.4f}")
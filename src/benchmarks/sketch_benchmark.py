@@ -0,0 +1,94 @@
+# Kullanım: cd src && python -m benchmarks.sketch_benchmark --posts 10000 100000 --vocabulary 200000
+import argparse
+import pickle
+import time
+import numpy as np
+
+from utils.text_processor import PostAggregate, SketchPostAggregate
+
+NEUTRAL = {'compound': 0.0}
+COLLOCATIONS = 10
+
+
+def synthetic_posts(post_count, vocabulary, seed=0):
+    # Zipf dağılımlı bağımsız kelimeler; hashtag ve mention havuzları da uzun kuyrukludur
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(5, 30, size=post_count)
+    words = np.minimum(rng.zipf(1.2, size=int(lengths.sum())), vocabulary)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    # Olabilirlik oranıyla bulunması beklenen, her zaman birlikte geçen kelime çiftleri
+    collocations = rng.integers(0, COLLOCATIONS, size=post_count)
+    planted = rng.random(post_count) < 0.3
+    for i in range(post_count):
+        tokens = [f'w{word}' for word in words[offsets[i]:offsets[i + 1]].tolist()]
+        if planted[i]:
+            tokens.extend((f'c{collocations[i]}a', f'c{collocations[i]}b'))
+        yield {
+            'filtered_tokens': tokens,
+            'sentences': [tokens],
+            'hashtags': [f'#h{tag}' for tag in np.minimum(rng.zipf(1.5, size=rng.integers(0, 3)), 50000).tolist()],
+            'mentions': [f'@m{user}' for user in np.minimum(rng.zipf(1.5, size=rng.integers(0, 2)), 50000).tolist()],
+            'sentiment': NEUTRAL
+        }
+
+
+def _aggregate(aggregate, posts):
+    started = time.perf_counter()
+    for post in posts:
+        aggregate.add_post(post)
+    analysis = {'sentiment_stats': {}, 'content_stats': {}}
+    aggregate.fill_analysis(analysis, aggregate.post_count)
+    return analysis, time.perf_counter() - started, len(pickle.dumps(aggregate))
+
+
+def _recall(exact, approximate):
+    exact = set(exact)
+    return len(exact & set(approximate)) / len(exact) if exact else 1.0
+
+
+def _items(counted):
+    return [item for item, _ in counted]
+
+
+def _max_count_error(exact_counts, approximate, total):
+    # En sık öğelerin sayı hatası, toplamın oranı olarak
+    errors = [abs(count - exact_counts[item]) for item, count in approximate]
+    return max(errors) / total if errors and total else 0.0
+
+
+def run(post_count, vocabulary):
+    posts = list(synthetic_posts(post_count, vocabulary, seed=post_count))
+    exact_aggregate = PostAggregate()
+    exact, exact_seconds, exact_bytes = _aggregate(exact_aggregate, posts)
+    sketch, sketch_seconds, sketch_bytes = _aggregate(SketchPostAggregate(), posts)
+
+    richness = exact['content_stats']['vocabulary_richness']
+    return {
+        'posts': post_count,
+        'exact_bytes': exact_bytes,
+        'sketch_bytes': sketch_bytes,
+        'exact_seconds': exact_seconds,
+        'sketch_seconds': sketch_seconds,
+        'word_recall': _recall(_items(exact['top_words']), _items(sketch['top_words'])),
+        'word_error': _max_count_error(exact_aggregate.word_counts, sketch['top_words'], exact_aggregate.word_total),
+        'bigram_recall': _recall(exact['top_bigrams'], sketch['top_bigrams']),
+        'hashtag_recall': _recall(_items(exact['top_hashtags']), _items(sketch['top_hashtags'])),
+        'mention_recall': _recall(_items(exact['top_mentions']), _items(sketch['top_mentions'])),
+        'richness_error': abs(sketch['content_stats']['vocabulary_richness'] - richness) / richness
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Kesin sayaçlar ile sabit bellekli taslakların bellek ve doğruluk karşılaştırması')
+    parser.add_argument('--posts', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--vocabulary', type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'gönderi':>8} {'kesin (MB)':>11} {'taslak (MB)':>12} {'kesin (s)':>10} {'taslak (s)':>11} "
+          f"{'kelime':>7} {'sayı hatası':>12} {'bigram':>7} {'hashtag':>8} {'mention':>8} {'çeşitlilik':>11}")
+    for post_count in args.posts:
+        result = run(post_count, args.vocabulary)
+        print(f"{result['posts']:>8} {result['exact_bytes'] / 2 ** 20:>11.1f} {result['sketch_bytes'] / 2 ** 20:>12.1f} "
+              f"{result['exact_seconds']:>10.2f} {result['sketch_seconds']:>11.2f} "
+              f"{result['word_recall']:>7.2f} {result['word_error']:>12.5f} {result['bigram_recall']:>7.2f} "
+              f"{result['hashtag_recall']:>8.2f} {result['mention_recall']:>8.2f} {result['richness_error']:>10.1%}")
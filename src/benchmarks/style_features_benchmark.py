@@ -0,0 +1,76 @@
+# Kullanım: cd src && python -m benchmarks.style_features_benchmark --posts 10000 --repeat 3
+from collections import defaultdict
+import argparse
+import time
+import re
+
+from models.style_features import extract_style_features
+from scrapers.backends import generate_synthetic_profile
+from utils.text_processor import TextProcessor
+
+
+def legacy_style_totals(posts):
+    # Eski DigitalClone döngüsü: her karakter Python'da gezilir, emoji regex'i gönderi başına çalışır
+    totals = {'word_length_total': 0, 'punctuation_freq': defaultdict(int), 'emoji_freq': defaultdict(int)}
+    for post in posts:
+        words = post['tokens']
+        if words:
+            totals['word_length_total'] += sum(len(word) for word in words) / len(words)
+        text = post['original_text']
+        for char in text:
+            if char in '.,!?':
+                totals['punctuation_freq'][char] += 1
+        for emoji in re.findall(r'[\U0001F300-\U0001F9FF]', text):
+            totals['emoji_freq'][emoji] += 1
+    return totals
+
+
+def vectorized_style_totals(posts):
+    features = extract_style_features(posts)
+    return {
+        'word_length_total': float(features.column('avg_word_length').sum()),
+        'punctuation_freq': dict(features.punctuation_freq),
+        'emoji_freq': dict(features.emoji_freq)
+    }
+
+
+def _best_of(fn, posts, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(posts)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(post_count, repeat):
+    profile_data = generate_synthetic_profile('https://twitter.com/sentetik', post_count, seed=post_count)
+    posts = TextProcessor(workers=1).process(profile_data)['posts']
+
+    legacy_seconds, legacy = _best_of(legacy_style_totals, posts, repeat)
+    vectorized_seconds, vectorized = _best_of(vectorized_style_totals, posts, repeat)
+
+    same = (abs(legacy['word_length_total'] - vectorized['word_length_total']) < 1e-6 * max(1, post_count) and
+            dict(legacy['punctuation_freq']) == vectorized['punctuation_freq'] and
+            dict(legacy['emoji_freq']) == vectorized['emoji_freq'])
+    return {
+        'posts': len(posts),
+        'legacy_seconds': legacy_seconds,
+        'vectorized_seconds': vectorized_seconds,
+        'same': same
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Yazım stili özelliklerinin döngü ve sütunlu çıkarım karşılaştırması')
+    parser.add_argument('--posts', type=int, nargs='+', default=[10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'gönderi':>8} {'döngü (ms)':>11} {'sütunlu (ms)':>13} {'hızlanma':>9} {'aynı':>6}")
+    for post_count in args.posts:
+        result = run(post_count, args.repeat)
+        print(f"{result['posts']:>8} {result['legacy_seconds'] * 1000:>11.1f} "
+              f"{result['vectorized_seconds'] * 1000:>13.1f} "
+              f"{result['legacy_seconds'] / result['vectorized_seconds']:>8.1f}x {str(result['same']):>6}")
@@ -0,0 +1,91 @@
+# Kullanım: cd src && python -m benchmarks.text_cleaning_benchmark --posts 5000 --repeat 3
+import argparse
+import time
+import re
+
+from nltk.tokenize import word_tokenize, sent_tokenize
+
+from utils.text_processor import TextProcessor
+
+# Temizleyicinin uç durumlarını kapsayan örnekler
+EDGE_CASES = [
+    '',
+    '   ',
+    'Merhaba DÜNYA!!! https://t.co/abc?x=1 www.ornek.com/yol devam',
+    'ht😊tp://gizli.com ve w😊ww.site.com birleşince',
+    'Noktalama: "tırnak", (parantez) [köşeli] {süslü} - tire — uzun; noktalı: iki',
+    'Emoji 🔥🔥 ve ☕ ile ✨ karışık 😂 metin 👍🏽',
+    '#hashtag@mention #çağrı @ayşe_k #@ikili a#b @c@d',
+    'Satır\nsonu\tsekme   ve bölünmez boşluk',
+    'Çok cümle. İkinci cümle! Üçüncü mü? Dördüncü... beşinci',
+    'İSTANBUL ıĞÜŞÖÇ büyük harf',
+]
+
+
+def legacy_clean_text(text):
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[\U00010000-\U0010ffff]', '', text)
+    text = re.sub(r'[^\w\s.,!?]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text.lower()
+
+
+def legacy_tokenize(content):
+    # Eski _process_post adımları: dört ayrı re.sub, iki tokenizer çağrısı ve iki findall
+    cleaned_text = legacy_clean_text(content)
+    return (cleaned_text, word_tokenize(cleaned_text), sent_tokenize(cleaned_text),
+            re.findall(r'#\w+', content), re.findall(r'@\w+', content))
+
+
+def fused_tokenize(processor, post):
+    content = post.get('content', '')
+    cleaned_text = processor._clean_text(content)
+    tokens, sentences = processor._tokenize(cleaned_text)
+    hashtags, mentions = processor._extract_entities(post, content)
+    return cleaned_text, tokens, sentences, hashtags, mentions
+
+
+def run(post_count, repeat=1):
+    # Sentetik profil üreteci veri toplayıcı modülleriyle (selenium) birlikte yüklenir; eski yol
+    # karşılaştırmaları (legacy_tokenize, EDGE_CASES) testlerde tarayıcı paketleri olmadan da kullanılır
+    from scrapers.backends import generate_synthetic_profile
+
+    processor = TextProcessor(workers=1)
+    posts = generate_synthetic_profile('https://twitter.com/sentetik', post_count, seed=post_count)['posts']
+
+    # Parite: hem veri toplayıcı listeleriyle hem de listeler olmadan aynı çıktı beklenir
+    bare_posts = [{'content': post['content']} for post in posts] + [{'content': text} for text in EDGE_CASES]
+    mismatches = 0
+    for post in posts + bare_posts:
+        if fused_tokenize(processor, post) != legacy_tokenize(post['content']):
+            mismatches += 1
+
+    timings = {}
+    for mode, fn in (('eski', lambda post: legacy_tokenize(post['content'])),
+                     ('birleşik', lambda post: fused_tokenize(processor, post))):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for post in posts:
+                fn(post)
+        timings[mode] = (time.perf_counter() - start) / repeat
+
+    return {
+        'posts': post_count,
+        'legacy_seconds': timings['eski'],
+        'fused_seconds': timings['birleşik'],
+        'speedup': timings['eski'] / timings['birleşik'] if timings['birleşik'] else None,
+        'checked': len(posts) + len(bare_posts),
+        'mismatches': mismatches
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Eski ve birleşik metin temizleme/tokenization karşılaştırması')
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    result = run(args.posts, args.repeat)
+    print(f"{result['posts']} gönderi: eski {result['legacy_seconds']:.3f} s, "
+          f"birleşik {result['fused_seconds']:.3f} s ({result['speedup']:.2f}x), "
+          f"{result['checked']} örnekte {result['mismatches']} fark")
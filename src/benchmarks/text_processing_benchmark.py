@@ -0,0 +1,45 @@
+# Kullanım: cd src && python -m benchmarks.text_processing_benchmark --posts 100 1000 10000 --workers 4
+import argparse
+import time
+
+from scrapers.backends import generate_synthetic_profile
+from utils.text_processor import TextProcessor
+
+
+def run(post_counts, workers, repeat=1):
+    processor = TextProcessor(workers=1)
+    results = []
+    for post_count in post_counts:
+        profile_data = generate_synthetic_profile('https://twitter.com/sentetik', post_count, seed=post_count)
+
+        timings = {}
+        outputs = {}
+        for mode, mode_workers in (('seri', 1), ('paralel', workers)):
+            # İlk çağrı süreç havuzunu ısıtır, ölçüme dahil edilmez
+            outputs[mode] = processor.process(profile_data, workers=mode_workers)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                processor.process(profile_data, workers=mode_workers)
+            timings[mode] = (time.perf_counter() - start) / repeat
+
+        results.append({
+            'posts': post_count,
+            'serial_seconds': timings['seri'],
+            'parallel_seconds': timings['paralel'],
+            'identical': outputs['seri'] == outputs['paralel']
+        })
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='TextProcessor seri ve paralel işleme karşılaştırması')
+    parser.add_argument('--posts', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'gönderi':>8} {'seri (s)':>10} {'paralel (s)':>12} {'hızlanma':>9} {'aynı':>6}")
+    for result in run(args.posts, args.workers, args.repeat):
+        speedup = result['serial_seconds'] / result['parallel_seconds'] if result['parallel_seconds'] else float('nan')
+        print(f"{result['posts']:>8} {result['serial_seconds']:>10.3f} {result['parallel_seconds']:>12.3f} "
+              f"{speedup:>9.2f} {str(result['identical']):>6}")
@@ -0,0 +1,121 @@
+import os
+
+
+def _env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == '':
+        return default
+    return float(value)
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == '':
+        return default
+    return int(value)
+
+
+# Dil modeli ayarları
+MODEL_NAME = os.environ.get('ARPA_MODEL_NAME', 'dbmdz/bert-base-turkish-uncased')
+
+# Uygulama açılırken tokenizer ve modeli önceden yükle
+PRELOAD_MODELS = _env_bool('ARPA_PRELOAD_MODELS')
+
+# Çıkarım altyapısı: 'torch', 'quantized' (int8 dinamik nicemleme) ya da 'onnx' (optimum[onnxruntime] gerekir)
+INFERENCE_BACKEND = os.environ.get('ARPA_INFERENCE_BACKEND', 'torch')
+# İşlem içi ve işlemler arası iş parçacığı sayıları (0: torch varsayılanı)
+INFERENCE_THREADS = _env_int('ARPA_INFERENCE_THREADS', 0)
+INFERENCE_INTEROP_THREADS = _env_int('ARPA_INFERENCE_INTEROP_THREADS', 0)
+ONNX_DIR = os.environ.get('ARPA_ONNX_DIR', 'onnx_models')
+
+# Yanıt üretimi mikro-parti ayarları: istekler en fazla GENERATION_MAX_WAIT_MS beklenip birlikte üretilir
+GENERATION_BATCH_SIZE = _env_int('ARPA_GENERATION_BATCH_SIZE', 8)
+GENERATION_MAX_WAIT_MS = _env_int('ARPA_GENERATION_MAX_WAIT_MS', 20)
+GENERATION_MAX_PENDING = _env_int('ARPA_GENERATION_MAX_PENDING', 256)
+# Aynı anda çalışabilecek en fazla akışlı (SSE) üretim
+GENERATION_MAX_STREAMS = _env_int('ARPA_GENERATION_MAX_STREAMS', 4)
+# Yanıt başına üretilecek en fazla yeni token (istem uzunluğundan bağımsız). Eski max_length=150 sınırı
+# istemi de sayıyordu; aynı üst sınır korunur, istem artık yanıtın payından düşülmez
+GENERATION_MAX_NEW_TOKENS = _env_int('ARPA_GENERATION_MAX_NEW_TOKENS', 150)
+
+# Klon deposu ayarları
+CLONE_DIR = os.environ.get('ARPA_CLONE_DIR', 'clones')
+CLONE_CACHE_SIZE = _env_int('ARPA_CLONE_CACHE_SIZE', 32)
+CLONE_CACHE_MB = _env_int('ARPA_CLONE_CACHE_MB', 256)
+
+# Yanıt önbelleği: LRU + TTL, bayt bütçeli; RESPONSE_CACHE_DB verilirse süreçler arası SQLite ile paylaşılır
+RESPONSE_CACHE_SIZE = _env_int('ARPA_RESPONSE_CACHE_SIZE', 1024)
+RESPONSE_CACHE_MB = _env_int('ARPA_RESPONSE_CACHE_MB', 16)
+RESPONSE_CACHE_TTL = _env_int('ARPA_RESPONSE_CACHE_TTL', 3600)
+RESPONSE_CACHE_DB = os.environ.get('ARPA_RESPONSE_CACHE_DB', '')
+
+# Yanıt kişiselleştirme; tohum verilirse aynı soru için aynı eklemeler yapılır (test ve karşılaştırma için)
+PERSONALIZATION_SEED = _env_int('ARPA_PERSONALIZATION_SEED', None)
+
+# Arka plan iş kuyruğu ayarları
+JOB_WORKERS = _env_int('ARPA_JOB_WORKERS', 2)
+JOB_MAX_PENDING = _env_int('ARPA_JOB_MAX_PENDING', 100)
+
+# Tarayıcı havuzu ayarları
+BROWSER_POOL_SIZE = _env_int('ARPA_BROWSER_POOL_SIZE', 2)
+BROWSER_MAX_USES = _env_int('ARPA_BROWSER_MAX_USES', 50)
+PRELOAD_BROWSERS = _env_bool('ARPA_PRELOAD_BROWSERS')
+
+# Veri toplama ayarları
+SCRAPER_WAIT_MODE = os.environ.get('ARPA_SCRAPER_WAIT_MODE', 'adaptive')
+SCRAPER_SCROLL_TIMEOUT = _env_float('ARPA_SCRAPER_SCROLL_TIMEOUT', 5.0)
+SCRAPER_MAX_POSTS = _env_int('ARPA_SCRAPER_MAX_POSTS', 0)
+SCRAPER_PARSE_MODE = os.environ.get('ARPA_SCRAPER_PARSE_MODE', 'snapshot')
+
+# Veri toplama altyapısı: 'selenium', 'replay' ya da 'synthetic'
+SCRAPER_BACKEND = os.environ.get('ARPA_SCRAPER_BACKEND', 'selenium')
+REPLAY_DIR = os.environ.get('ARPA_REPLAY_DIR', 'recordings')
+SYNTHETIC_POSTS = _env_int('ARPA_SYNTHETIC_POSTS', 100)
+
+# Metin işleme ayarları
+TEXT_WORKERS = _env_int('ARPA_TEXT_WORKERS', 1)
+TEXT_CHUNK_SIZE = _env_int('ARPA_TEXT_CHUNK_SIZE', 0)
+TEXT_PARALLEL_MIN_POSTS = _env_int('ARPA_TEXT_PARALLEL_MIN_POSTS', 500)
+# İşlenmiş gönderileri ortak sözlüğe bağlı token id dizileri olarak sakla
+TEXT_COMPACT_POSTS = _env_bool('ARPA_TEXT_COMPACT_POSTS')
+# Toplu analizde kelime/bigram/hashtag/mention sayımı: 'exact' ya da sabit bellekli 'sketch'
+TEXT_AGGREGATION = os.environ.get('ARPA_TEXT_AGGREGATION', 'exact')
+# 'sketch' modunda sayı hatası en fazla SKETCH_EPSILON * toplam, 1 - SKETCH_DELTA olasılıkla
+SKETCH_EPSILON = _env_float('ARPA_SKETCH_EPSILON', 0.001)
+SKETCH_DELTA = _env_float('ARPA_SKETCH_DELTA', 0.01)
+# Duygu analizi: 'vader' (NLTK, kesin), 'lexicon' (VADER sözlüğüyle sütunlu) ya da 'transformer'
+SENTIMENT_BACKEND = os.environ.get('ARPA_SENTIMENT_BACKEND', 'vader')
+SENTIMENT_MODEL = os.environ.get('ARPA_SENTIMENT_MODEL', '')
+SENTIMENT_BATCH_SIZE = _env_int('ARPA_SENTIMENT_BATCH_SIZE', 32)
+SENTIMENT_MAX_LENGTH = _env_int('ARPA_SENTIMENT_MAX_LENGTH', 512)
+SENTIMENT_CACHE_SIZE = _env_int('ARPA_SENTIMENT_CACHE_SIZE', 100000)
+
+# NLTK verilerinin aranacağı yerel dizin (uygulama çalışırken indirme yapılmaz)
+NLTK_DATA_DIR = os.environ.get(
+    'ARPA_NLTK_DATA',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nltk_data')
+)
+
+# Gönderileri toplandıkça işleyip klonu akış halinde eğit
+STREAM_PROCESSING = _env_bool('ARPA_STREAM_PROCESSING')
+# Akış modunda veri toplayıcının tüketiciden en fazla kaç gönderi önde gidebileceği
+STREAM_QUEUE_SIZE = _env_int('ARPA_STREAM_QUEUE_SIZE', 256)
+
+# Gönderi arama altyapısı: 'tfidf' (klon başına sözlük) ya da 'hashing' (sözlüksüz, paylaşılabilir)
+RETRIEVAL_BACKEND = os.environ.get('ARPA_RETRIEVAL_BACKEND', 'tfidf')
+RETRIEVAL_HASH_FEATURES = _env_int('ARPA_RETRIEVAL_HASH_FEATURES', 2 ** 20)
+# Gönderi arama dizini: 'exact' (ters dizin), 'ann' (IVF) ya da 'auto' (gönderi sayısına göre)
+RETRIEVAL_INDEX = os.environ.get('ARPA_RETRIEVAL_INDEX', 'auto')
+RETRIEVAL_ANN_MIN_POSTS = _env_int('ARPA_RETRIEVAL_ANN_MIN_POSTS', 100000)
+RETRIEVAL_ANN_DIM = _env_int('ARPA_RETRIEVAL_ANN_DIM', 64)
+RETRIEVAL_ANN_COLUMNS = _env_int('ARPA_RETRIEVAL_ANN_COLUMNS', 10000)
+RETRIEVAL_ANN_PROBES = _env_int('ARPA_RETRIEVAL_ANN_PROBES', 8)
+# Yanıt tonunu belirlemek için kullanılan en benzer gönderi sayısı
+RETRIEVAL_TOP_K = _env_int('ARPA_RETRIEVAL_TOP_K', 5)
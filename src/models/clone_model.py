@@ -1,31 +1,65 @@
-from transformers import pipeline, AutoModelForCausalLM, AutoTokenizer
-import torch
 import numpy as np
 from collections import defaultdict, Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import re
-import json
-import os
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from scipy import sparse
+from datetime import datetime
+import hashlib
+import threading
+import uuid
+
+import config
+
+from models.model_registry import get_model_registry
+from models.retrieval import HashingIndex, build_retrieval_index, resolve_index_kind, smooth_idf, normalize_rows
+from utils.text_processor import new_aggregate
+from utils.response_cache import get_response_cache
+from models.style_features import PERSONALITY_FEATURES, TOP_WORD_FEATURES, extract_style_features
+from models.personalization import (PersonalizationTables, personalization_rng, WORD_PROBABILITY,
+                                    SENTIMENT_EMOJI_PROBABILITY, PUNCTUATION_PROBABILITY, EMOJI_PROBABILITY)
+
+
+def post_key(text, timestamp=None):
+    # Gönderiyi içerik ve zaman damgasıyla tanımlayan 64 bitlik özet
+    digest = hashlib.blake2b(f"{text or ''}\x00{timestamp or ''}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def parse_timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+# Akış halinde eğitimde stil özellikleri bu kadar gönderide bir topluca çıkarılır
+STYLE_BATCH_SIZE = 1024
+
+# TF-IDF vektörleştiricisi ve ham terim sayılarını çıkaran CountVectorizer aynı analiz ayarlarını kullanır
+VECTORIZER_PARAMS = {
+    'max_features': 5000,
+    'stop_words': 'english',
+    'ngram_range': (1, 2)
+}
+
 
 class DigitalClone:
-    def __init__(self):
-        # Model ve tokenizer'ı yükle
-        self.model_name = "dbmdz/bert-base-turkish-uncased"
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
-        
-        # Duygu analizi pipeline'ı
-        self.sentiment_pipeline = pipeline("sentiment-analysis", 
-                                        model=self.model_name, 
-                                        tokenizer=self.tokenizer)
+    def __init__(self, registry=None, clone_id=None, retrieval_backend=None, retrieval_index=None,
+                 response_cache=None):
+        self.clone_id = clone_id or uuid.uuid4().hex
+        # Kaydedilen her sürüm yeni bir revizyon alır; yanıt önbelleği anahtarları revizyona bağlıdır
+        self.revision = None
+        # 'tfidf': klona özel sözlük, 'hashing': sözlüksüz, paylaşılabilir dizin
+        self.retrieval_backend = retrieval_backend or config.RETRIEVAL_BACKEND
+        # 'exact': ters dizinle tam arama, 'ann': yaklaşık (IVF) arama, 'auto': gönderi sayısına göre
+        self.retrieval_index = retrieval_index or config.RETRIEVAL_INDEX
+
+        # Model, tokenizer ve pipeline süreç genelindeki kayıt defterinden paylaşılır
+        self.registry = registry or get_model_registry()
+        self.model_name = self.registry.model_name
         
         # TF-IDF vektörleştirici
-        self.vectorizer = TfidfVectorizer(
-            max_features=5000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
+        self.vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
         
         self.profile_data = None
         self.personality_vector = None
@@ -33,99 +67,317 @@ class DigitalClone:
         self.sentiment_distribution = defaultdict(float)
         self.topic_interests = defaultdict(float)
         self.writing_style = {}
-        self.response_cache = {}
+        self.response_cache = response_cache or get_response_cache()
+        self.tfidf_matrix = None
+        self.hash_index = None
+        self.post_index = None
+        self.personalization = None
+        self._pending_vectorizer = None
+        self._vectorizer_lock = threading.Lock()
+        self._post_index_lock = threading.Lock()
+        self._personalization_lock = threading.Lock()
         
-        # Klon verilerini saklamak için dizin oluştur
-        os.makedirs('clones', exist_ok=True)
+        # Artımlı eğitim durumu
+        self.source_url = None
+        self.term_counts = None
+        self.post_aggregate = None
+        self.sentiment_totals = defaultdict(float)
+        self.style_totals = None
+        self.post_hashes = set()
+        self._style_pending = []
+        self._training = None
+
+    @property
+    def tokenizer(self):
+        return self.registry.tokenizer
 
-    def train(self, processed_data):
+    @property
+    def model(self):
+        return self.registry.model
+
+    @property
+    def sentiment_pipeline(self):
+        return self.registry.sentiment_pipeline
+
+    def train(self, processed_data, aggregate=None):
+        self.begin_training(aggregate)
+        for post in processed_data['posts']:
+            self.add_training_post(post)
+        self.finish_training(processed_data)
+
+    def begin_training(self, aggregate=None):
+        # Artımlı güncelleme için ham toplamlar eğitimden sonra da saklanır.
+        # aggregate: metin işlemenin aynı gönderilerle doldurduğu toplamlar; verilirse gönderiler yeniden sayılmaz
+        self.word_preferences = defaultdict(int)
+        self.sentiment_totals = defaultdict(float)
+        self.style_totals = {
+            'word_length_total': 0,
+            'punctuation_freq': defaultdict(int),
+            'emoji_freq': defaultdict(int)
+        }
+        self.post_aggregate = aggregate if aggregate is not None else new_aggregate()
+        self.post_hashes = set()
+        self._training = {'texts': [], 'posts': [], 'count_aggregate': aggregate is None}
+
+    def add_training_post(self, post):
+        self._training['texts'].append(post['cleaned_text'])
+        self._training['posts'].append({'sentiment': post['sentiment'], 'timestamp': post.get('timestamp')})
+        if self._training['count_aggregate']:
+            self.post_aggregate.add_post(post)
+        self._accumulate_post(post)
+
+    def finish_training(self, processed_data):
+        # Akış modunda processed_data gönderileri içermez; klon yalnızca özet gönderi bilgilerini saklar
+        training = self._training
+        self._training = None
+        processed_data.setdefault('posts', training['posts'])
         self.profile_data = processed_data
         
-        # Kelime tercihlerini analiz et
-        all_posts_text = []
-        for post in processed_data['posts']:
-            content = post['cleaned_text']
-            all_posts_text.append(content)
-            
-            # Kelime frekansları
-            for word, freq in post['word_frequency'].items():
-                self.word_preferences[word] += freq
-            
-            # Duygu dağılımı
-            sentiment = post['sentiment']
-            for key, value in sentiment.items():
-                self.sentiment_distribution[key] += value
+        # TF-IDF matrisini oluştur
+        if training['texts']:
+            if self.retrieval_backend == 'hashing':
+                self.hash_index = HashingIndex()
+                self.hash_index.fit(training['texts'])
+            else:
+                self._fit_tfidf(training['texts'])
+        
+        self._rebuild_post_index()
+        self._flush_style_features()
+        self._refresh_profile()
+        self._new_revision()
+
+    def update(self, new_processed_posts, profile_data=None):
+        # Yeni gönderiler mevcut toplamlara eklenir; baştan eğitim yapılmaz.
+        # Daha önce görülen gönderiler (içerik + zaman damgası) atlanır. Eklenen gönderi sayısını döner.
+        self._ensure_incremental_state()
+        
+        texts = []
+        posts = []
+        for post in new_processed_posts:
+            post_hash = post_key(post['original_text'], post.get('timestamp'))
+            if post_hash in self.post_hashes:
+                continue
+            texts.append(post['cleaned_text'])
+            posts.append({'sentiment': post['sentiment'], 'timestamp': post.get('timestamp')})
+            self.post_aggregate.add_post(post)
+            self._accumulate_post(post)
+        
+        if not posts:
+            return 0
+        
+        self.profile_data['posts'] = list(self.profile_data['posts']) + posts
+        if profile_data:
+            self.profile_data['profile_info'] = profile_data.get('profile_info') or self.profile_data.get('profile_info', {})
+            temporal_patterns = self.profile_data['aggregate_analysis'].setdefault('temporal_patterns', {})
+            for name, counts in profile_data.get('temporal_patterns', {}).items():
+                merged = {str(key): value for key, value in temporal_patterns.get(name, {}).items()}
+                for key, value in counts.items():
+                    merged[str(key)] = merged.get(str(key), 0) + value
+                temporal_patterns[name] = merged
         
-        # Duygu dağılımını normalize et
-        total_sentiment = sum(self.sentiment_distribution.values())
+        self._update_tfidf(texts)
+        self._rebuild_post_index()
+        self._flush_style_features()
+        self.post_aggregate.fill_analysis(self.profile_data['aggregate_analysis'], self.post_aggregate.post_count)
+        self._refresh_profile()
+        
+        # Eski yanıtlar yeni verilerle tutarsız olabilir
+        self._new_revision()
+        return len(posts)
+
+    def is_new_post(self, post):
+        # Ham (işlenmemiş) gönderi için: metin işlemeye girmeden önce eleme yapmaya yarar
+        self._ensure_incremental_state()
+        return post_key(post.get('content', ''), post.get('timestamp')) not in self.post_hashes
+
+    def last_post_time(self):
+        timestamps = []
+        for post in (self.profile_data or {}).get('posts', []):
+            post_time = parse_timestamp(post.get('timestamp'))
+            if post_time is not None:
+                timestamps.append(post_time)
+        return max(timestamps) if timestamps else None
+
+    def _accumulate_post(self, post):
+        self.post_hashes.add(post_key(post['original_text'], post.get('timestamp')))
+        
+        # Kelime frekansları
+        for word, freq in post['word_frequency'].items():
+            self.word_preferences[word] += freq
+        
+        # Duygu dağılımı (ham toplamlar)
+        sentiment = post['sentiment']
+        for key, value in sentiment.items():
+            self.sentiment_totals[key] += value
+        
+        # Yazım stili özellikleri gönderi grupları halinde sütunlu olarak çıkarılır
+        self._style_pending.append(post)
+        if len(self._style_pending) >= STYLE_BATCH_SIZE:
+            self._flush_style_features()
+
+    def _flush_style_features(self):
+        if not self._style_pending:
+            return
+        features = extract_style_features(self._style_pending)
+        self._style_pending = []
+        
+        # Token'sız gönderilerin ortalama kelime uzunluğu 0'dır, toplama katkı vermez
+        self.style_totals['word_length_total'] += float(features.column('avg_word_length').sum())
+        for mark, count in features.punctuation_freq.items():
+            self.style_totals['punctuation_freq'][mark] += count
+        for emoji, count in features.emoji_freq.items():
+            self.style_totals['emoji_freq'][emoji] += count
+
+    def _refresh_profile(self):
+        # Ham toplamlardan türetilen profil alanlarını yeniden hesaplar (gönderi başına maliyeti yoktur)
+        total_sentiment = sum(self.sentiment_totals.values())
+        self.sentiment_distribution = defaultdict(float, self.sentiment_totals)
         if total_sentiment > 0:
             for key in self.sentiment_distribution:
                 self.sentiment_distribution[key] /= total_sentiment
         
-        # TF-IDF matrisini oluştur
-        if all_posts_text:
-            self.tfidf_matrix = self.vectorizer.fit_transform(all_posts_text)
-            self.feature_names = self.vectorizer.get_feature_names_out()
-        
         # Yazım stili analizi
-        self._analyze_writing_style(processed_data['posts'])
+        self._analyze_writing_style(self.post_aggregate.post_count)
         
         # Konu ilgi alanlarını analiz et
-        self._analyze_topic_interests(processed_data)
+        self.topic_interests = defaultdict(float)
+        self._analyze_topic_interests(self.profile_data)
         
         # Kişilik vektörü oluştur
         self._create_personality_vector()
         
-        # Klon verilerini kaydet
-        self._save_clone_data()
+        # Kişiselleştirme tabloları yeni toplamlardan ilk yanıtta kurulur
+        with self._personalization_lock:
+            self.personalization = None
 
-    def _analyze_writing_style(self, posts):
-        total_posts = len(posts)
+    def _analyze_writing_style(self, total_posts):
         if total_posts == 0:
             return
         
-        # Yazım stili metriklerini hesapla
-        avg_sentence_length = 0
-        avg_word_length = 0
-        punctuation_freq = defaultdict(int)
-        emoji_freq = defaultdict(int)
-        hashtag_freq = 0
-        mention_freq = 0
+        aggregate = self.post_aggregate
+        hashtag_total, mention_total = aggregate.entity_totals()
+        self.writing_style = {
+            'avg_sentence_length': aggregate.sentence_total / total_posts,
+            'avg_word_length': self.style_totals['word_length_total'] / total_posts,
+            'punctuation_freq': dict(self.style_totals['punctuation_freq']),
+            'emoji_freq': dict(self.style_totals['emoji_freq']),
+            'hashtag_usage': hashtag_total / total_posts,
+            'mention_usage': mention_total / total_posts
+        }
+
+    def _fit_tfidf(self, texts):
+        # Ham terim sayıları saklanır; yeni gönderilerde yalnızca idf ve satır normları yeniden hesaplanır
+        # Sözlük ayrı bir CountVectorizer ile kurulur; TF-IDF vektörleştiricisine sözlük ve idf _set_term_counts'ta verilir
+        counter = CountVectorizer(**VECTORIZER_PARAMS)
+        counts = counter.fit_transform(texts).tocsr()
+        vocabulary = counter.vocabulary_
+        terms = np.array(sorted(vocabulary, key=vocabulary.get)) if vocabulary else np.zeros(0, dtype='<U1')
+        self._set_term_counts(counts, terms)
+
+    def _update_tfidf(self, texts):
+        if self.hash_index is not None:
+            self.hash_index.add(texts)
+            return
+        if self.retrieval_backend == 'hashing' and self.tfidf_matrix is None:
+            if len(self.profile_data['posts']) == len(texts):
+                self.hash_index = HashingIndex()
+                self.hash_index.fit(texts)
+            return
         
-        for post in posts:
-            # Cümle uzunluğu
-            sentences = post['sentences']
-            if sentences:
-                avg_sentence_length += len(sentences)
-            
-            # Kelime uzunluğu
-            words = post['tokens']
-            if words:
-                avg_word_length += sum(len(word) for word in words) / len(words)
-            
-            # Noktalama işaretleri
-            text = post['original_text']
-            for char in text:
-                if char in '.,!?':
-                    punctuation_freq[char] += 1
-            
-            # Emoji kullanımı
-            emojis = re.findall(r'[\U0001F300-\U0001F9FF]', text)
-            for emoji in emojis:
-                emoji_freq[emoji] += 1
-            
-            # Hashtag ve mention sayısı
-            hashtag_freq += len(post['hashtags'])
-            mention_freq += len(post['mentions'])
+        if self.tfidf_matrix is None or self.term_counts is None:
+            if self.tfidf_matrix is None and len(self.profile_data['posts']) == len(texts):
+                self._fit_tfidf(texts)
+            elif self.tfidf_matrix is not None:
+                # Ham sayıları olmayan eski klonlar: sözlük ve idf sabit kalır, yalnızca yeni satırlar eklenir
+                self._ensure_vectorizer()
+                self.tfidf_matrix = sparse.vstack([self.tfidf_matrix, self.vectorizer.transform(texts)]).tocsr()
+            return
         
-        self.writing_style = {
-            'avg_sentence_length': avg_sentence_length / total_posts,
-            'avg_word_length': avg_word_length / total_posts,
-            'punctuation_freq': dict(punctuation_freq),
-            'emoji_freq': dict(emoji_freq),
-            'hashtag_usage': hashtag_freq / total_posts,
-            'mention_usage': mention_freq / total_posts
+        self._ensure_vectorizer()
+        vocabulary = dict(self.vectorizer.vocabulary_)
+        terms = sorted(vocabulary, key=vocabulary.get)
+        max_features = self.vectorizer.max_features
+        analyze = self.vectorizer.build_analyzer()
+        
+        # Sözlük kararlıdır: mevcut sütunlar korunur, yeni terimler sınır dolana kadar sona eklenir
+        data = []
+        indices = []
+        indptr = [0]
+        for text in texts:
+            row = Counter()
+            for term in analyze(text):
+                column = vocabulary.get(term)
+                if column is None:
+                    if max_features is not None and len(vocabulary) >= max_features:
+                        continue
+                    column = len(vocabulary)
+                    vocabulary[term] = column
+                    terms.append(term)
+                row[column] += 1
+            for column in sorted(row):
+                indices.append(column)
+                data.append(row[column])
+            indptr.append(len(indices))
+        
+        new_counts = sparse.csr_matrix((np.array(data, dtype=np.int64), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+                                       shape=(len(texts), len(vocabulary)))
+        old_counts = self.term_counts
+        old_counts = sparse.csr_matrix((old_counts.data, old_counts.indices, old_counts.indptr),
+                                       shape=(old_counts.shape[0], len(vocabulary)))
+        self._set_term_counts(sparse.vstack([old_counts, new_counts]).tocsr(), np.array(terms))
+
+    def _set_term_counts(self, counts, terms):
+        # TfidfTransformer ile aynı formül: smooth idf ve l2 normalizasyonu
+        idf = smooth_idf(counts.shape[0], np.bincount(counts.indices, minlength=counts.shape[1]))
+        
+        # TF-IDF matrisi sayılarla aynı seyrek yapıyı paylaşır (kayıtta yalnızca değerler ayrıca saklanır)
+        counts.sort_indices()
+        weights = normalize_rows(counts.indptr, counts.data.astype(np.float64) * idf[counts.indices])
+        
+        self.term_counts = counts
+        self.tfidf_matrix = sparse.csr_matrix((weights, counts.indices.copy(), counts.indptr.copy()), shape=counts.shape)
+        self.restore_vectorizer(terms, idf)
+        self.feature_names = np.asarray(terms, dtype=object)
+
+    def _ensure_incremental_state(self):
+        # Artımlı toplamları olmadan kaydedilmiş klonlar için kaydedilen özetlerden yaklaşık toplamlar kurulur
+        if self.post_aggregate is not None:
+            return
+        
+        self.profile_data = self.profile_data or {'posts': [], 'aggregate_analysis': {}, 'profile_info': {}}
+        analysis = self.profile_data.setdefault('aggregate_analysis', {})
+        analysis.setdefault('sentiment_stats', {'positive': 0, 'negative': 0, 'neutral': 0, 'compound': 0})
+        analysis.setdefault('content_stats', {'avg_post_length': 0, 'avg_word_length': 0,
+                                              'avg_sentence_length': 0, 'vocabulary_richness': 0})
+        posts = self.profile_data['posts']
+        post_count = len(posts)
+        sentiment_stats = analysis['sentiment_stats']
+        
+        # Sayaçlar da taslaklar da sayı sözlüğüyle güncellenebilir
+        aggregate = new_aggregate()
+        aggregate.word_counts.update(dict(self.word_preferences))
+        aggregate.hashtag_counts.update(dict(analysis.get('top_hashtags', [])))
+        aggregate.mention_counts.update(dict(analysis.get('top_mentions', [])))
+        aggregate.word_total = sum(self.word_preferences.values())
+        aggregate.word_char_total = sum(len(word) * count for word, count in self.word_preferences.items())
+        aggregate.sentence_total = round(self.writing_style.get('avg_sentence_length', 0) * post_count)
+        aggregate.positive = sentiment_stats.get('positive', 0)
+        aggregate.negative = sentiment_stats.get('negative', 0)
+        aggregate.neutral = sentiment_stats.get('neutral', 0)
+        aggregate.compound_sum = sentiment_stats.get('compound', 0) * post_count
+        self.post_aggregate = aggregate
+        
+        self.word_preferences = defaultdict(int, self.word_preferences)
+        self.sentiment_totals = defaultdict(float)
+        for post in posts:
+            for key, value in post['sentiment'].items():
+                self.sentiment_totals[key] += value
+        self.style_totals = {
+            'word_length_total': self.writing_style.get('avg_word_length', 0) * post_count,
+            'punctuation_freq': defaultdict(int, self.writing_style.get('punctuation_freq', {})),
+            'emoji_freq': defaultdict(int, self.writing_style.get('emoji_freq', {}))
         }
+        self.post_hashes = set(self.post_hashes or ())
 
     def _analyze_topic_interests(self, processed_data):
         # Aggregate analysis'den konu dağılımını al
@@ -147,84 +399,56 @@ class DigitalClone:
         if not self.profile_data:
             return
 
-        features = []
-        
-        # Temel metin istatistikleri
-        content_stats = self.profile_data['aggregate_analysis']['content_stats']
-        features.extend([
-            content_stats['avg_post_length'],
-            content_stats['avg_word_length'],
-            content_stats['avg_sentence_length'],
-            content_stats['vocabulary_richness']
-        ])
-        
-        # Duygu dağılımı
-        sentiment_stats = self.profile_data['aggregate_analysis']['sentiment_stats']
-        features.extend([
-            sentiment_stats['positive'],
-            sentiment_stats['negative'],
-            sentiment_stats['neutral'],
-            sentiment_stats['compound']
-        ])
-        
-        # Yazım stili özellikleri
-        features.extend([
-            self.writing_style['avg_sentence_length'],
-            self.writing_style['avg_word_length'],
-            self.writing_style['hashtag_usage'],
-            self.writing_style['mention_usage']
-        ])
-        
-        # En sık kullanılan kelimeler
-        top_words = self.profile_data['aggregate_analysis']['top_words']
-        word_freqs = [freq for _, freq in top_words[:10]]
-        features.extend(word_freqs)
-        
-        self.personality_vector = np.array(features)
+        # Sabit şemalı vektör: sütun adları PERSONALITY_FEATURES sırasındadır
+        analysis = self.profile_data['aggregate_analysis']
+        content_stats = analysis['content_stats']
+        sentiment_stats = analysis['sentiment_stats']
+        features = {
+            'avg_post_length': content_stats['avg_post_length'],
+            'avg_word_length': content_stats['avg_word_length'],
+            'avg_sentence_length': content_stats['avg_sentence_length'],
+            'vocabulary_richness': content_stats['vocabulary_richness'],
+            'sentiment_positive': sentiment_stats['positive'],
+            'sentiment_negative': sentiment_stats['negative'],
+            'sentiment_neutral': sentiment_stats['neutral'],
+            'sentiment_compound': sentiment_stats['compound'],
+            'style_avg_sentence_length': self.writing_style['avg_sentence_length'],
+            'style_avg_word_length': self.writing_style['avg_word_length'],
+            'hashtag_usage': self.writing_style['hashtag_usage'],
+            'mention_usage': self.writing_style['mention_usage']
+        }
+        for i, (_, freq) in enumerate(analysis['top_words'][:TOP_WORD_FEATURES]):
+            features[f'top_word_{i + 1}_freq'] = freq
+        
+        self.personality_vector = np.array([features.get(name, 0) for name in PERSONALITY_FEATURES],
+                                           dtype=np.float64)
+
+    def personality_features(self):
+        if self.personality_vector is None:
+            return {}
+        return dict(zip(PERSONALITY_FEATURES, self.personality_vector.tolist()))
 
     def generate_response(self, question):
         if not self.profile_data:
             return "Henüz yeterli veri toplanmadı."
             
         # Cache'den yanıt kontrolü
-        cache_key = question.lower().strip()
-        if cache_key in self.response_cache:
-            return self.response_cache[cache_key]
+        cached = self._cached_response(question)
+        if cached is not None:
+            return cached
 
         try:
-            # Soruyu vektörleştir
-            question_vector = self.vectorizer.transform([question])
-            
-            # En benzer içeriği bul
-            similarities = cosine_similarity(question_vector, self.tfidf_matrix)
-            most_similar_idx = similarities.argmax()
-            
-            # Benzer içeriğin duygusunu al
-            similar_post = self.profile_data['posts'][most_similar_idx]
-            similar_sentiment = similar_post['sentiment']
-            
-            # Cevap oluştur
-            inputs = self.tokenizer(question, return_tensors="pt")
+            # En benzer gönderilerin duygusu, benzerlik skorlarıyla ağırlıklandırılarak birleştirilir
+            similar_sentiment = self._blend_sentiment(self.similar_posts(question))
             
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs.input_ids,
-                    max_length=150,
-                    num_return_sequences=1,
-                    temperature=0.7,
-                    top_k=50,
-                    top_p=0.95,
-                    do_sample=True,
-                    pad_token_id=self.tokenizer.eos_token_id
-                )
-            
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+            # Cevap oluştur (eşzamanlı sorular kayıt defterinde tek partide üretilir)
+            response = self.registry.generate(question)
             
             # Yanıtı kişiselleştir
-            response = self._personalize_response(response, similar_sentiment)
+            response = self._personalize_response(response, similar_sentiment, self._request_rng(question))
             
             # Yanıtı cache'e ekle
-            self.response_cache[cache_key] = response
+            self._cache_response(question, response)
             
             return response
             
@@ -232,25 +456,134 @@ class DigitalClone:
             print(f"Response generation error: {str(e)}")
             return "Üzgünüm, şu anda yanıt oluşturamıyorum."
 
-    def _personalize_response(self, response, sentiment):
+    def stream_response(self, question, stop_event=None):
+        # ('token', parça) olayları üretildikçe, ardından kişiselleştirilmiş tam yanıt ('final', yanıt) döner
+        if not self.profile_data:
+            yield 'final', "Henüz yeterli veri toplanmadı."
+            return
+
+        cached = self._cached_response(question)
+        if cached is not None:
+            yield 'final', cached
+            return
+
         try:
+            similar_sentiment = self._blend_sentiment(self.similar_posts(question))
+            
+            parts = []
+            for text in self.registry.generate_stream(question, stop_event):
+                parts.append(text)
+                yield 'token', text
+            
+            # Kişiselleştirme yalnızca tam metin üzerinde uygulanabilir
+            response = self._personalize_response(''.join(parts), similar_sentiment, self._request_rng(question))
+            self._cache_response(question, response)
+            yield 'final', response
+            
+        except Exception as e:
+            print(f"Response streaming error: {str(e)}")
+            yield 'final', "Üzgünüm, şu anda yanıt oluşturamıyorum."
+
+    def _generation_params(self):
+        batcher = getattr(self.registry, 'generation_batcher', None)
+        return {
+            'model_name': self.model_name,
+            'backend': getattr(self.registry, 'backend', None),
+            'generate': batcher.generate_kwargs if batcher is not None else None
+        }
+
+    def _cached_response(self, question):
+        return self.response_cache.get(self.clone_id, self.revision, question, self._generation_params())
+
+    def _cache_response(self, question, response):
+        self.response_cache.put(self.clone_id, self.revision, question, response, self._generation_params())
+
+    def _new_revision(self):
+        # Eğitim ya da güncelleme sonrası önceki yanıtlar kullanılmaz; kayıtta serializer kendi revizyonunu atar
+        self.response_cache.invalidate(self.clone_id)
+        self.revision = uuid.uuid4().hex[:12]
+
+    def similar_posts(self, question, top_k=None):
+        # [(gönderi sırası, benzerlik skoru), ...] en benzer gönderiden başlayarak
+        post_index = self._get_post_index()
+        if post_index is None:
+            return []
+        rows, scores = post_index.search(self._query_vector(question), top_k or config.RETRIEVAL_TOP_K)
+        return [(int(row), float(score)) for row, score in zip(rows, scores)]
+
+    def _blend_sentiment(self, matches):
+        posts = self.profile_data['posts']
+        matches = [(row, score) for row, score in matches if row < len(posts)]
+        total_score = sum(score for _, score in matches)
+        if total_score <= 0:
+            # Benzer gönderi yoksa ya da gönderi dizini olmayan (eski formattan dönüştürülmüş) klonlar
+            return {'compound': 0.0}
+        
+        blended = defaultdict(float)
+        for row, score in matches:
+            for key, value in posts[row]['sentiment'].items():
+                blended[key] += value * score / total_score
+        return dict(blended)
+
+    def _document_matrix(self):
+        if self.hash_index is not None:
+            return self.hash_index.matrix
+        return self.tfidf_matrix
+
+    def _query_vector(self, question):
+        # Satırlar l2 normlu olduğundan sorgu vektörüyle çarpım kosinüs benzerliğini verir
+        if self.hash_index is not None:
+            return self.hash_index.transform(question)
+        self._ensure_vectorizer()
+        return self.vectorizer.transform([question]).tocsr()
+
+    def _get_post_index(self):
+        if self.post_index is None:
+            with self._post_index_lock:
+                if self.post_index is None:
+                    matrix = self._document_matrix()
+                    if matrix is None or matrix.shape[0] == 0:
+                        return None
+                    self.post_index = build_retrieval_index(matrix, self.retrieval_index)
+        return self.post_index
+
+    def _rebuild_post_index(self):
+        # Tam arama dizini ilk soruda ucuzca kurulur; IVF dizini ise eğitimde kurulup klonla birlikte kaydedilir
+        with self._post_index_lock:
+            self.post_index = None
+        matrix = self._document_matrix()
+        if matrix is not None and resolve_index_kind(self.retrieval_index, matrix.shape[0]) == 'ann':
+            self._get_post_index()
+
+    def _request_rng(self, question):
+        return personalization_rng(self.clone_id, self.revision, question)
+
+    def _get_personalization(self):
+        if self.personalization is None:
+            with self._personalization_lock:
+                if self.personalization is None:
+                    self.personalization = PersonalizationTables.build(self.word_preferences, self.writing_style)
+        return self.personalization
+
+    def _personalize_response(self, response, sentiment, rng=None):
+        try:
+            rng = rng or np.random.default_rng()
+            tables = self._get_personalization()
+            
             # Duygu tonunu ayarla
             if sentiment['compound'] > 0.05:
-                response = self._add_positive_style(response)
+                response = self._add_sentiment_style(response, tables.sentiment_emojis['positive'], rng)
             elif sentiment['compound'] < -0.05:
-                response = self._add_negative_style(response)
+                response = self._add_sentiment_style(response, tables.sentiment_emojis['negative'], rng)
             
             # Sık kullanılan kelimelerden ekle
-            common_words = sorted(self.word_preferences.items(), 
-                                key=lambda x: x[1], 
-                                reverse=True)[:5]
-            
-            for word, _ in common_words:
-                if word not in response.lower() and np.random.random() < 0.3:
+            lowered = response.lower()
+            for word in tables.top_words:
+                if word not in lowered and rng.random() < WORD_PROBABILITY:
                     response += f" {word}"
             
             # Yazım stilini uygula
-            response = self._apply_writing_style(response)
+            response = self._apply_writing_style(response, tables, rng)
             
             return response
             
@@ -258,60 +591,74 @@ class DigitalClone:
             print(f"Response personalization error: {str(e)}")
             return response
 
-    def _add_positive_style(self, text):
-        positive_emojis = ["😊", "👍", "🙌", "💪", "✨"]
-        if np.random.random() < 0.5:
-            text += f" {np.random.choice(positive_emojis)}"
+    def _add_sentiment_style(self, text, emojis, rng):
+        if rng.random() < SENTIMENT_EMOJI_PROBABILITY:
+            text += f" {emojis.sample(rng)}"
         return text
 
-    def _add_negative_style(self, text):
-        negative_emojis = ["😔", "😕", "💔", "😢", "😞"]
-        if np.random.random() < 0.5:
-            text += f" {np.random.choice(negative_emojis)}"
-        return text
-
-    def _apply_writing_style(self, text):
+    def _apply_writing_style(self, text, tables, rng):
         # Noktalama işareti kullanım sıklığına göre ekle
-        for punct, freq in self.writing_style['punctuation_freq'].items():
-            if freq > 0 and np.random.random() < 0.3:
-                text += punct
+        if tables.punctuation is not None and rng.random() < PUNCTUATION_PROBABILITY:
+            text += tables.punctuation.sample(rng)
         
         # Emoji kullanım sıklığına göre ekle
-        for emoji, freq in self.writing_style['emoji_freq'].items():
-            if freq > 0 and np.random.random() < 0.2:
-                text += f" {emoji}"
+        if tables.emoji is not None and rng.random() < EMOJI_PROBABILITY:
+            text += f" {tables.emoji.sample(rng)}"
         
         return text
 
-    def _save_clone_data(self):
-        # Klon verilerini JSON formatında kaydet
-        clone_data = {
-            'word_preferences': dict(self.word_preferences),
-            'sentiment_distribution': dict(self.sentiment_distribution),
-            'topic_interests': dict(self.topic_interests),
-            'writing_style': self.writing_style,
-            'personality_vector': self.personality_vector.tolist() if self.personality_vector is not None else None
+    def load_state(self, state):
+        # export_state ile kaydedilen verileri geri yükle
+        self.clone_id = state['clone_id']
+        self.word_preferences = defaultdict(int, state['word_preferences'])
+        self.sentiment_distribution = defaultdict(float, state['sentiment_distribution'])
+        self.topic_interests = defaultdict(float, state['topic_interests'])
+        self.writing_style = state['writing_style']
+
+        if state['personality_vector']:
+            self.personality_vector = np.array(state['personality_vector'])
+
+        self.profile_data = {
+            'posts': state['posts'],
+            'aggregate_analysis': state['aggregate_analysis'],
+            'profile_info': state['profile_info']
         }
-        
-        with open('clones/clone_data.json', 'w', encoding='utf-8') as f:
-            json.dump(clone_data, f, ensure_ascii=False, indent=4)
 
-    def load_clone_data(self):
-        # Kaydedilmiş klon verilerini yükle
-        try:
-            with open('clones/clone_data.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            self.word_preferences = defaultdict(int, data['word_preferences'])
-            self.sentiment_distribution = defaultdict(float, data['sentiment_distribution'])
-            self.topic_interests = defaultdict(float, data['topic_interests'])
-            self.writing_style = data['writing_style']
-            
-            if data['personality_vector']:
-                self.personality_vector = np.array(data['personality_vector'])
-                
-            return True
-            
-        except Exception as e:
-            print(f"Clone data loading error: {str(e)}")
-            return False 
\ No newline at end of file
+        tfidf = state.get('tfidf')
+        if tfidf:
+            vocabulary = tfidf['vocabulary']
+            terms = sorted(vocabulary, key=vocabulary.get)
+            self.restore_vectorizer(terms, tfidf['idf'])
+            matrix = tfidf['matrix']
+            self.tfidf_matrix = sparse.csr_matrix(
+                (matrix['data'], matrix['indices'], matrix['indptr']),
+                shape=tuple(matrix['shape'])
+            )
+
+        return self
+
+    def restore_vectorizer(self, terms, idf, lazy=False):
+        # terms dizisindeki sıra sütun indekslerine karşılık gelir
+        with self._vectorizer_lock:
+            self._pending_vectorizer = (terms, idf)
+        if not lazy:
+            self._ensure_vectorizer()
+
+    def vectorizer_arrays(self):
+        with self._vectorizer_lock:
+            if self._pending_vectorizer is not None:
+                terms, idf = self._pending_vectorizer
+                return np.asarray(terms), np.asarray(idf, dtype=np.float64)
+
+        vocabulary = self.vectorizer.vocabulary_
+        terms = np.array(sorted(vocabulary, key=vocabulary.get)) if vocabulary else np.zeros(0, dtype='<U1')
+        return terms, np.asarray(self.vectorizer.idf_, dtype=np.float64)
+
+    def _ensure_vectorizer(self):
+        with self._vectorizer_lock:
+            if self._pending_vectorizer is None:
+                return
+            terms, idf = self._pending_vectorizer
+            self.vectorizer.vocabulary_ = {str(term): idx for idx, term in enumerate(terms)}
+            self.vectorizer.idf_ = np.asarray(idf, dtype=np.float64)
+            self._pending_vectorizer = None
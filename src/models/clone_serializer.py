@@ -0,0 +1,422 @@
+from collections import defaultdict, Counter
+from collections.abc import Sequence
+from contextlib import contextmanager
+from scipy import sparse
+import numpy as np
+import threading
+import argparse
+import json
+import uuid
+import io
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from models.clone_model import DigitalClone
+from models.retrieval import HashingIndex, IVFIndex
+from utils.text_processor import PostAggregate, SketchPostAggregate
+from utils.sketches import HeavyHitters
+from utils.file_utils import atomic_write_bytes
+
+FORMAT_VERSION = 2
+META_FILE = 'meta.json'
+LEGACY_STATE_FILE = 'clone.json'
+LOCK_FILE = '.lock'
+# Okuma sırasında diziler art arda iki kayıtla silinmişse meta.json yeniden okunur
+LOAD_RETRIES = 3
+SENTIMENT_KEYS = ('neg', 'neu', 'pos', 'compound')
+# 'sketch' modundaki toplamların dizi önekleri: (önek, SketchPostAggregate alanı)
+SKETCH_COUNTERS = (('word_sketch', 'word_counts'), ('bigram_sketch', 'bigram_counts'),
+                   ('hashtag_sketch', 'hashtag_counts'), ('mention_sketch', 'mention_counts'))
+
+
+class PostIndex(Sequence):
+    # Gönderi duygularını tek bir (n, 4) dizisinde tutar, erişildiğinde sözlük döner
+    def __init__(self, sentiments, timestamps=None):
+        self.sentiments = sentiments
+        self.timestamps = timestamps
+
+    def __len__(self):
+        return len(self.sentiments)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        row = self.sentiments[idx]
+        entry = {'sentiment': {key: float(row[i]) for i, key in enumerate(SENTIMENT_KEYS)}}
+        if self.timestamps is not None and self.timestamps[idx]:
+            entry['timestamp'] = str(self.timestamps[idx])
+        return entry
+
+
+def _unicode_array(values):
+    values = [str(v) for v in values]
+    if not values:
+        return np.zeros(0, dtype='<U1')
+    return np.array(values)
+
+
+def _table_arrays(table):
+    keys = list(table.keys())
+    return _unicode_array(keys), np.array([table[k] for k in keys], dtype=np.int64)
+
+
+def _post_arrays(posts):
+    sentiments = np.zeros((len(posts), len(SENTIMENT_KEYS)), dtype=np.float32)
+    timestamps = []
+    for i, post in enumerate(posts):
+        sentiment = post['sentiment']
+        for j, key in enumerate(SENTIMENT_KEYS):
+            sentiments[i, j] = sentiment.get(key, 0.0)
+        timestamps.append(post.get('timestamp') or '')
+    return sentiments, _unicode_array(timestamps)
+
+
+def compact_posts(clone):
+    # İşlenmiş gönderi listesi, diskteki biçimle aynı (n, 4) duygu ve zaman damgası dizilerine indirgenir
+    posts = clone.profile_data.get('posts') if clone.profile_data else None
+    if posts is not None and not isinstance(posts, PostIndex):
+        # profile_data eğitimde verilen processed_data sözlüğüdür; çağıranın sözlüğü değiştirilmez
+        clone.profile_data = dict(clone.profile_data, posts=PostIndex(*_post_arrays(posts)))
+
+
+def _clone_arrays(clone):
+    arrays = {}
+
+    word_terms, word_counts = _table_arrays(clone.word_preferences)
+    arrays['word_terms'] = word_terms
+    arrays['word_counts'] = word_counts
+
+    writing_style = clone.writing_style or {}
+    punct_chars, punct_counts = _table_arrays(writing_style.get('punctuation_freq', {}))
+    arrays['punct_chars'] = punct_chars
+    arrays['punct_counts'] = punct_counts
+    emoji_chars, emoji_counts = _table_arrays(writing_style.get('emoji_freq', {}))
+    arrays['emoji_chars'] = emoji_chars
+    arrays['emoji_counts'] = emoji_counts
+
+    if clone.personality_vector is not None:
+        arrays['personality_vector'] = np.asarray(clone.personality_vector, dtype=np.float64)
+
+    posts = clone.profile_data['posts'] if clone.profile_data else []
+    if isinstance(posts, PostIndex):
+        arrays['post_sentiments'] = np.asarray(posts.sentiments, dtype=np.float32)
+        arrays['post_timestamps'] = np.asarray(posts.timestamps)
+    else:
+        arrays['post_sentiments'], arrays['post_timestamps'] = _post_arrays(posts)
+
+    if clone.tfidf_matrix is not None:
+        matrix = clone.tfidf_matrix.tocsr()
+        arrays['tfidf_data'] = matrix.data.astype(np.float32)
+        arrays['tfidf_indices'] = matrix.indices.astype(np.int32)
+        arrays['tfidf_indptr'] = matrix.indptr.astype(np.int64)
+        if clone.term_counts is not None:
+            # Ham terim sayıları TF-IDF ile aynı seyrek yapıyı paylaşır, yalnızca değerler saklanır
+            arrays['tfidf_counts'] = clone.term_counts.tocsr().data.astype(np.int32)
+
+        vocabulary_terms, idf = clone.vectorizer_arrays()
+        arrays['vocabulary_terms'] = vocabulary_terms
+        arrays['idf'] = idf
+
+    if clone.hash_index is not None:
+        arrays.update(clone.hash_index.to_arrays())
+
+    # Yaklaşık arama dizini kurulumu pahalı olduğundan saklanır; tam arama dizini yüklemede yeniden kurulur
+    if isinstance(clone.post_index, IVFIndex):
+        arrays.update(clone.post_index.to_arrays())
+
+    # Artımlı güncelleme için toplamlar; 'sketch' modundaki taslaklar kendi dizileriyle saklanır
+    aggregate = clone.post_aggregate
+    if isinstance(aggregate, SketchPostAggregate):
+        for prefix, name in SKETCH_COUNTERS:
+            arrays.update(getattr(aggregate, name).to_arrays(prefix, pairs=name == 'bigram_counts'))
+    elif aggregate is not None:
+        bigrams = list(aggregate.bigram_counts.keys())
+        arrays['bigram_left'] = _unicode_array([left for left, _ in bigrams])
+        arrays['bigram_right'] = _unicode_array([right for _, right in bigrams])
+        arrays['bigram_counts'] = np.array([aggregate.bigram_counts[bigram] for bigram in bigrams], dtype=np.int64)
+        arrays['hashtag_terms'], arrays['hashtag_counts'] = _table_arrays(aggregate.hashtag_counts)
+        arrays['mention_terms'], arrays['mention_counts'] = _table_arrays(aggregate.mention_counts)
+    arrays['post_hashes'] = np.array(sorted(clone.post_hashes), dtype=np.uint64)
+
+    return arrays
+
+
+def _aggregation_meta(aggregate):
+    if isinstance(aggregate, SketchPostAggregate):
+        counter = aggregate.word_counts
+        return {'mode': 'sketch', 'epsilon': counter.epsilon, 'delta': counter.delta}
+    return {'mode': 'exact'}
+
+
+def _aggregate_state(aggregate):
+    if aggregate is None:
+        return None
+    return {
+        'first_word': aggregate.first_word,
+        'last_word': aggregate.last_word,
+        'word_total': aggregate.word_total,
+        'word_char_total': aggregate.word_char_total,
+        'sentence_total': aggregate.sentence_total,
+        'positive': aggregate.positive,
+        'negative': aggregate.negative,
+        'neutral': aggregate.neutral,
+        'compound_sum': aggregate.compound_sum
+    }
+
+
+def _restore_aggregate(clone, state, arrays, aggregation):
+    # Klon kaydedildiği moddaki toplamlarla açılır; taslaklar kesin sayaçlara dönüştürülemez
+    if aggregation['mode'] == 'sketch':
+        epsilon, delta = aggregation['epsilon'], aggregation['delta']
+        aggregate = SketchPostAggregate(epsilon, delta)
+        for prefix, name in SKETCH_COUNTERS:
+            setattr(aggregate, name, HeavyHitters.from_arrays(arrays, prefix, epsilon, delta,
+                                                               pairs=name == 'bigram_counts'))
+    else:
+        aggregate = PostAggregate()
+        aggregate.word_counts = Counter(clone.word_preferences)
+        aggregate.bigram_counts = Counter(dict(zip(zip(arrays['bigram_left'].tolist(), arrays['bigram_right'].tolist()),
+                                                   arrays['bigram_counts'].tolist())))
+        aggregate.hashtag_counts = Counter(dict(zip(arrays['hashtag_terms'].tolist(), arrays['hashtag_counts'].tolist())))
+        aggregate.mention_counts = Counter(dict(zip(arrays['mention_terms'].tolist(), arrays['mention_counts'].tolist())))
+    for key, value in state.items():
+        setattr(aggregate, key, value)
+    return aggregate
+
+
+def _clone_meta(clone, revision, arrays):
+    writing_style = dict(clone.writing_style or {})
+    writing_style.pop('punctuation_freq', None)
+    writing_style.pop('emoji_freq', None)
+
+    profile_data = clone.profile_data or {}
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'revision': revision,
+        'clone_id': clone.clone_id,
+        'model_name': clone.model_name,
+        'source_url': clone.source_url,
+        'retrieval_backend': clone.retrieval_backend,
+        'hash_features': clone.hash_index.n_features if clone.hash_index is not None else None,
+        'retrieval_index': clone.retrieval_index,
+        'sentiment_distribution': dict(clone.sentiment_distribution),
+        'topic_interests': dict(clone.topic_interests),
+        'writing_style': writing_style,
+        'profile_info': profile_data.get('profile_info', {}),
+        'aggregate_analysis': profile_data.get('aggregate_analysis', {}),
+        'tfidf_shape': list(clone.tfidf_matrix.shape) if clone.tfidf_matrix is not None else None,
+        'sentiment_totals': dict(clone.sentiment_totals),
+        'word_length_total': clone.style_totals['word_length_total'] if clone.style_totals else None,
+        'aggregate_state': _aggregate_state(clone.post_aggregate),
+        'aggregation': _aggregation_meta(clone.post_aggregate),
+        'arrays': sorted(arrays.keys())
+    }
+    return meta
+
+
+def _array_path(directory, name, revision):
+    return os.path.join(directory, f'{name}.{revision}.npy')
+
+
+_save_locks = {}
+_save_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _save_lock(directory):
+    # Aynı klonun kayıtları sıraya sokulur: süreç içinde klon dizini başına bir kilit,
+    # süreçler arasında (destekleniyorsa) dizindeki kilit dosyası
+    key = os.path.abspath(directory)
+    with _save_locks_guard:
+        lock = _save_locks.setdefault(key, threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(directory, LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _published_revision(directory):
+    try:
+        with open(os.path.join(directory, META_FILE), 'rb') as f:
+            return json.loads(f.read().decode('utf-8')).get('revision')
+    except (OSError, ValueError):
+        return None
+
+
+def _array_revision(filename):
+    # '<ad>.<revizyon>.npy'
+    parts = filename.rsplit('.', 2)
+    return parts[1] if len(parts) == 3 else None
+
+
+def save_clone(clone, directory):
+    # Diziler revizyon ekli dosyalara yazılır, meta.json en son ve atomik olarak
+    # değiştirilir; böylece okuyucular hiçbir zaman yarım yazılmış bir klon görmez
+    os.makedirs(directory, exist_ok=True)
+    revision = uuid.uuid4().hex[:12]
+    arrays = _clone_arrays(clone)
+
+    with _save_lock(directory):
+        # Bu kayıttan önce yayımlanmış revizyon korunur; onu okumaya başlamış okuyucular tamamlayabilir
+        previous = _published_revision(directory)
+
+        total_bytes = 0
+        for name, array in arrays.items():
+            buffer = io.BytesIO()
+            np.save(buffer, array, allow_pickle=False)
+            payload = buffer.getvalue()
+            atomic_write_bytes(_array_path(directory, name, revision), payload)
+            total_bytes += len(payload)
+
+        meta_payload = json.dumps(_clone_meta(clone, revision, arrays), ensure_ascii=False).encode('utf-8')
+        atomic_write_bytes(os.path.join(directory, META_FILE), meta_payload)
+        total_bytes += len(meta_payload)
+        clone.revision = revision
+
+        # Daha eski revizyonları temizle (açık mmap'ler POSIX'te geçerliliğini korur)
+        for filename in os.listdir(directory):
+            if filename.endswith('.npy') and _array_revision(filename) not in (revision, previous):
+                try:
+                    os.remove(os.path.join(directory, filename))
+                except OSError:
+                    pass
+        legacy_path = os.path.join(directory, LEGACY_STATE_FILE)
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+
+    return total_bytes
+
+
+def _read_published(directory, mmap_mode):
+    for attempt in range(LOAD_RETRIES):
+        with open(os.path.join(directory, META_FILE), 'rb') as f:
+            meta_payload = f.read()
+        meta = json.loads(meta_payload.decode('utf-8'))
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen klon formatı: {meta.get('format_version')}")
+
+        arrays = {}
+        total_bytes = len(meta_payload)
+        try:
+            for name in meta['arrays']:
+                path = _array_path(directory, name, meta['revision'])
+                arrays[name] = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+                total_bytes += os.path.getsize(path)
+        except FileNotFoundError:
+            if attempt == LOAD_RETRIES - 1:
+                raise
+            continue
+        return meta, arrays, total_bytes
+
+
+def load_clone(directory, registry=None, mmap=True):
+    meta_path = os.path.join(directory, META_FILE)
+    if not os.path.exists(meta_path):
+        return _load_json_clone(os.path.join(directory, LEGACY_STATE_FILE), registry)
+
+    meta, arrays, total_bytes = _read_published(directory, 'r' if mmap else None)
+
+    clone = DigitalClone(registry=registry, clone_id=meta['clone_id'],
+                         retrieval_backend=meta.get('retrieval_backend', 'tfidf'),
+                         retrieval_index=meta.get('retrieval_index'))
+    clone.revision = meta['revision']
+    clone.source_url = meta.get('source_url')
+    clone.word_preferences = defaultdict(int, zip(arrays['word_terms'].tolist(), arrays['word_counts'].tolist()))
+    clone.sentiment_distribution = defaultdict(float, meta['sentiment_distribution'])
+    clone.topic_interests = defaultdict(float, meta['topic_interests'])
+
+    writing_style = dict(meta['writing_style'])
+    if writing_style:
+        writing_style['punctuation_freq'] = dict(zip(arrays['punct_chars'].tolist(), arrays['punct_counts'].tolist()))
+        writing_style['emoji_freq'] = dict(zip(arrays['emoji_chars'].tolist(), arrays['emoji_counts'].tolist()))
+    clone.writing_style = writing_style
+
+    if 'personality_vector' in arrays:
+        clone.personality_vector = np.asarray(arrays['personality_vector'])
+
+    clone.profile_data = {
+        'posts': PostIndex(arrays['post_sentiments'], arrays['post_timestamps']),
+        'aggregate_analysis': meta['aggregate_analysis'],
+        'profile_info': meta['profile_info']
+    }
+
+    if meta['tfidf_shape'] is not None:
+        clone.tfidf_matrix = sparse.csr_matrix(
+            (arrays['tfidf_data'], arrays['tfidf_indices'], arrays['tfidf_indptr']),
+            shape=tuple(meta['tfidf_shape']),
+            copy=False
+        )
+        # Sözlük ilk sorguda kurulur, açılış maliyeti dizilerin eşlenmesiyle sınırlı kalır
+        clone.restore_vectorizer(arrays['vocabulary_terms'], arrays['idf'], lazy=True)
+        if 'tfidf_counts' in arrays:
+            clone.term_counts = sparse.csr_matrix(
+                (arrays['tfidf_counts'], arrays['tfidf_indices'], arrays['tfidf_indptr']),
+                shape=tuple(meta['tfidf_shape']),
+                copy=False
+            )
+
+    if meta.get('hash_features'):
+        clone.hash_index = HashingIndex.from_arrays(arrays, meta['hash_features'])
+    if 'ann_components' in arrays and clone._document_matrix() is not None:
+        clone.post_index = IVFIndex.from_arrays(clone._document_matrix(), arrays)
+
+    # Artımlı güncelleme durumu; bu alanlar olmadan kaydedilmiş klonlar için
+    # DigitalClone.update yaklaşık toplamları kendisi kurar
+    if 'post_hashes' in arrays:
+        clone.post_hashes = set(arrays['post_hashes'].tolist())
+    aggregation = meta.get('aggregation') or {'mode': 'exact'}
+    restorable = 'bigram_sketch_table' in arrays if aggregation['mode'] == 'sketch' else 'bigram_counts' in arrays
+    if meta.get('aggregate_state') is not None and restorable:
+        clone.post_aggregate = _restore_aggregate(clone, meta['aggregate_state'], arrays, aggregation)
+        clone.sentiment_totals = defaultdict(float, meta.get('sentiment_totals') or {})
+        clone.style_totals = {
+            'word_length_total': meta.get('word_length_total') or 0,
+            'punctuation_freq': defaultdict(int, writing_style.get('punctuation_freq', {})),
+            'emoji_freq': defaultdict(int, writing_style.get('emoji_freq', {}))
+        }
+
+    return clone, total_bytes
+
+
+def _load_json_clone(path, registry=None, clone_id=None):
+    with open(path, 'rb') as f:
+        payload = f.read()
+    state = json.loads(payload.decode('utf-8'))
+
+    # Tek dosyalık eski clone_data.json biçimi kimlik ve gönderi içermez
+    state.setdefault('clone_id', clone_id or uuid.uuid4().hex)
+    state.setdefault('profile_info', {})
+    state.setdefault('aggregate_analysis', {})
+    state.setdefault('posts', [])
+
+    clone = DigitalClone(registry=registry, clone_id=state['clone_id'])
+    clone.load_state(state)
+    return clone, len(payload)
+
+
+def convert_json_clone(json_path, root='clones', clone_id=None):
+    clone, _ = _load_json_clone(json_path, clone_id=clone_id)
+    save_clone(clone, os.path.join(root, clone.clone_id))
+    return clone.clone_id
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='JSON klon dosyalarını ikili formata dönüştürür')
+    parser.add_argument('paths', nargs='+', help='clone_data.json veya clones/<id>/clone.json dosyaları')
+    parser.add_argument('--root', default='clones', help='Klon deposu dizini')
+    args = parser.parse_args()
+
+    for json_path in args.paths:
+        converted_id = convert_json_clone(json_path, args.root)
+        print(f'{json_path} -> {os.path.join(args.root, converted_id)}')
@@ -0,0 +1,133 @@
+from collections import OrderedDict
+import threading
+import os
+import re
+
+from models.clone_serializer import save_clone, load_clone, compact_posts, META_FILE, LEGACY_STATE_FILE
+from models.retrieval import SharedHashingIndex
+
+CLONE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+class CloneStore:
+    def __init__(self, root='clones', max_cached_clones=32, max_cached_bytes=256 * 1024 * 1024, registry=None):
+        self.root = root
+        self.max_cached_clones = max_cached_clones
+        self.max_cached_bytes = max_cached_bytes
+        self.registry = registry
+
+        # Sık kullanılan klonlar için LRU önbellek: clone_id -> (klon, bayt)
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        # Aynı klonun eşzamanlı güncellemeleri birbirinin gönderilerini ezmesin diye sıraya girer
+        self._update_locks = {}
+
+        # Önbellekteki 'hashing' klonlarının satırları ortak dizinde de aranabilir
+        self.shared_index = SharedHashingIndex()
+
+        os.makedirs(self.root, exist_ok=True)
+
+    def _clone_dir(self, clone_id):
+        if not clone_id or not CLONE_ID_PATTERN.match(clone_id):
+            raise ValueError('Geçersiz klon kimliği')
+        return os.path.join(self.root, clone_id)
+
+    def exists(self, clone_id):
+        try:
+            directory = self._clone_dir(clone_id)
+        except ValueError:
+            return False
+        return (os.path.exists(os.path.join(directory, META_FILE)) or
+                os.path.exists(os.path.join(directory, LEGACY_STATE_FILE)))
+
+    def save(self, clone):
+        nbytes = save_clone(clone, self._clone_dir(clone.clone_id))
+        # Önceki revizyonun yanıtlarına artık ulaşılamaz, yer kaplamamaları için hemen silinir
+        clone.response_cache.invalidate(clone.clone_id)
+        # Önbellek boyutu diskteki baytlarla ölçülür; eğitimden kalan tam gönderi listesi bellekte tutulmaz
+        compact_posts(clone)
+        self._put(clone.clone_id, clone, nbytes)
+        return clone.clone_id
+
+    def get(self, clone_id):
+        with self._lock:
+            entry = self._cache.get(clone_id)
+            if entry is not None:
+                self._cache.move_to_end(clone_id)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        if not self.exists(clone_id):
+            return None
+
+        clone, nbytes = load_clone(self._clone_dir(clone_id), registry=self.registry)
+        self._put(clone_id, clone, nbytes)
+        return clone
+
+    def load_copy(self, clone_id):
+        # Güncellenecek klon için önbellekten bağımsız, yazılabilir bir kopya; okuyucular
+        # kayıt tamamlanana kadar önbellekteki eski sürümü kullanmaya devam eder
+        if not self.exists(clone_id):
+            return None
+        clone, _ = load_clone(self._clone_dir(clone_id), registry=self.registry, mmap=False)
+        return clone
+
+    def update_lock(self, clone_id):
+        # load_copy -> update -> save dizisi boyunca tutulacak klon başına kilit
+        with self._lock:
+            lock = self._update_locks.get(clone_id)
+            if lock is None:
+                lock = self._update_locks[clone_id] = threading.Lock()
+            return lock
+
+    def evict(self, clone_id):
+        with self._lock:
+            entry = self._cache.pop(clone_id, None)
+            if entry is not None:
+                self._cached_bytes -= entry[1]
+        self.shared_index.remove(clone_id)
+
+    def _put(self, clone_id, clone, nbytes):
+        with self._lock:
+            previous = self._cache.pop(clone_id, None)
+            if previous is not None:
+                self._cached_bytes -= previous[1]
+
+            self._cache[clone_id] = (clone, nbytes)
+            self._cached_bytes += nbytes
+            if clone.hash_index is not None:
+                self.shared_index.add(clone_id, clone.hash_index)
+            else:
+                self.shared_index.remove(clone_id)
+
+            # En uzun süre kullanılmayan klonlardan başlayarak sınırlar içine dön
+            while len(self._cache) > 1 and (
+                    len(self._cache) > self.max_cached_clones or
+                    self._cached_bytes > self.max_cached_bytes):
+                evicted_id, (_, evicted_bytes) = self._cache.popitem(last=False)
+                self._cached_bytes -= evicted_bytes
+                self.shared_index.remove(evicted_id)
+                self._evictions += 1
+
+    def search(self, question, top_k=5):
+        # Önbellekteki tüm 'hashing' klonlarında tek sorgu: [(clone_id, gönderi sırası, skor), ...]
+        return self.shared_index.search(question, top_k)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'shared_index_clones': len(self.shared_index),
+                'cached_clones': len(self._cache),
+                'cached_bytes': self._cached_bytes,
+                'max_cached_clones': self.max_cached_clones,
+                'max_cached_bytes': self.max_cached_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
@@ -0,0 +1,238 @@
+from concurrent.futures import Future
+import threading
+import copy
+import queue
+import time
+
+import torch
+from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+import config
+
+
+class GenerationQueueFull(Exception):
+    pass
+
+
+class GenerationRequest:
+    def __init__(self, prompt):
+        self.prompt = prompt
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class StopOnEvent(StoppingCriteria):
+    # İstemci bağlantıyı kapattığında üretim bir sonraki tokende durur
+    def __init__(self, stop_event):
+        self.stop_event = stop_event
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return self.stop_event.is_set()
+
+
+class GenerationBatcher:
+    # Eşzamanlı üretim isteklerini kısa bir zaman penceresinde toplayıp tek bir model.generate çağrısıyla
+    # yanıtlar. Girdiler sola dolgulanır, böylece her dizinin yeni tokenleri aynı konumdan başlar.
+    def __init__(self, registry, max_batch_size=None, max_wait_ms=None, max_pending=None, generate_kwargs=None,
+                 max_streams=None):
+        self.registry = registry
+        self.max_batch_size = max(1, max_batch_size or config.GENERATION_BATCH_SIZE)
+        self.max_wait = (config.GENERATION_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        self.max_pending = max_pending or config.GENERATION_MAX_PENDING
+        # Akışlı üretimler partiye katılmadığı için aynı anda çalışabilecek sayıları ayrıca sınırlanır
+        self.max_streams = max(1, max_streams or config.GENERATION_MAX_STREAMS)
+        self._stream_slots = threading.BoundedSemaphore(self.max_streams)
+        self._active_streams = 0
+        # Uzunluk sınırı yalnızca üretilen tokenlere uygulanır; uzun istemler yanıtı kısaltmaz
+        self.generate_kwargs = generate_kwargs or {
+            'max_new_tokens': config.GENERATION_MAX_NEW_TOKENS,
+            'num_return_sequences': 1,
+            'temperature': 0.7,
+            'top_k': 50,
+            'top_p': 0.95,
+            'do_sample': True
+        }
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._batch_tokenizer = None
+        self._batch_tokenizer_source = None
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._requests = 0
+        self._failed = 0
+        self._batches = 0
+        self._batch_sizes = {}
+        self._queue_seconds = 0.0
+        self._generate_seconds = 0.0
+        self._streams = 0
+        self._first_token_seconds = 0.0
+
+    def generate(self, prompt, timeout=None):
+        # Çağıran iş parçacığı yanıt hazır olana kadar bekler
+        request = GenerationRequest(prompt)
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            raise GenerationQueueFull('Üretim kuyruğu dolu, lütfen daha sonra tekrar deneyin')
+        return request.future.result(timeout)
+
+    def stream(self, prompt, stop_event=None):
+        # Akışlı üretim partiye katılmaz: tokenler üretildikçe ayrı bir iş parçacığından okunur
+        if not self._stream_slots.acquire(blocking=False):
+            raise GenerationQueueFull('Eşzamanlı akış sınırına ulaşıldı, lütfen daha sonra tekrar deneyin')
+        self._stream_started()
+
+        stop_event = stop_event or threading.Event()
+        errors = []
+        try:
+            tokenizer = self.registry.tokenizer
+            model = self.registry.model
+            streamer = TextIteratorStreamer(tokenizer, skip_special_tokens=True)
+            inputs = tokenizer(prompt, return_tensors="pt")
+        except Exception:
+            self._stream_finished()
+            raise
+
+        def run():
+            try:
+                with torch.no_grad():
+                    model.generate(
+                        inputs.input_ids,
+                        pad_token_id=tokenizer.eos_token_id,
+                        streamer=streamer,
+                        stopping_criteria=StoppingCriteriaList([StopOnEvent(stop_event)]),
+                        **self.generate_kwargs
+                    )
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+            finally:
+                # Yer, üretim iş parçacığı gerçekten bittiğinde boşalır
+                self._stream_finished()
+
+        started = time.perf_counter()
+        first_token_at = None
+        threading.Thread(target=run, name='generation-stream', daemon=True).start()
+        try:
+            for text in streamer:
+                if not text:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    self._record_stream(first_token_at - started)
+                yield text
+        finally:
+            # Okuyucu erken kapanırsa (GeneratorExit) üretim de durdurulur
+            stop_event.set()
+        if errors:
+            raise errors[0]
+
+    def _stream_started(self):
+        with self._metrics_lock:
+            self._active_streams += 1
+
+    def _stream_finished(self):
+        with self._metrics_lock:
+            self._active_streams -= 1
+        self._stream_slots.release()
+
+    def _record_stream(self, first_token_seconds):
+        with self._metrics_lock:
+            self._streams += 1
+            self._first_token_seconds += first_token_seconds
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name='generation-batcher', daemon=True)
+                    self._worker.start()
+
+    def _collect_batch(self):
+        # İlk istek gelene kadar bekle, ardından pencere dolana ya da parti büyüklüğüne ulaşılana kadar topla
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            started = time.perf_counter()
+            try:
+                responses = self._generate_batch([request.prompt for request in batch])
+            except Exception as e:
+                print(f"Batch generation error: {str(e)}")
+                for request in batch:
+                    request.future.set_exception(e)
+                self._record(batch, started, failed=True)
+                continue
+
+            for request, response in zip(batch, responses):
+                request.future.set_result(response)
+            self._record(batch, started)
+
+    def _padding_tokenizer(self):
+        # Kayıt defterindeki paylaşılan tokenizer değiştirilmez; partiler sola dolgulu ayrı bir kopya kullanır
+        tokenizer = self.registry.tokenizer
+        if self._batch_tokenizer_source is not tokenizer:
+            batch_tokenizer = copy.deepcopy(tokenizer)
+            batch_tokenizer.padding_side = 'left'
+            if batch_tokenizer.pad_token is None:
+                batch_tokenizer.pad_token = batch_tokenizer.eos_token
+            self._batch_tokenizer = batch_tokenizer
+            self._batch_tokenizer_source = tokenizer
+        return self._batch_tokenizer
+
+    def _generate_batch(self, prompts):
+        tokenizer = self._padding_tokenizer()
+        model = self.registry.model
+
+        inputs = tokenizer(prompts, return_tensors="pt", padding=True)
+        with torch.no_grad():
+            outputs = model.generate(
+                inputs.input_ids,
+                attention_mask=inputs.attention_mask,
+                pad_token_id=tokenizer.eos_token_id,
+                **self.generate_kwargs
+            )
+        return tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+    def _record(self, batch, started, failed=False):
+        finished = time.perf_counter()
+        with self._metrics_lock:
+            self._requests += len(batch)
+            self._batches += 1
+            self._batch_sizes[len(batch)] = self._batch_sizes.get(len(batch), 0) + 1
+            self._queue_seconds += sum(started - request.enqueued_at for request in batch)
+            self._generate_seconds += finished - started
+            if failed:
+                self._failed += len(batch)
+
+    def metrics(self):
+        with self._metrics_lock:
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+                'pending': self._queue.qsize(),
+                'requests': self._requests,
+                'failed': self._failed,
+                'batches': self._batches,
+                'batch_sizes': dict(sorted(self._batch_sizes.items())),
+                'mean_batch_size': self._requests / self._batches if self._batches else 0.0,
+                'mean_queue_ms': self._queue_seconds / self._requests * 1000 if self._requests else 0.0,
+                'generate_seconds': self._generate_seconds,
+                'requests_per_second': self._requests / self._generate_seconds if self._generate_seconds else 0.0,
+                'streams': self._streams,
+                'active_streams': self._active_streams,
+                'max_streams': self.max_streams,
+                'mean_first_token_ms': self._first_token_seconds / self._streams * 1000 if self._streams else 0.0
+            }
@@ -0,0 +1,104 @@
+from transformers import AutoModelForCausalLM
+import threading
+import torch
+import os
+
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForCausalLM
+except ImportError:
+    onnxruntime = None
+    ORTModelForCausalLM = None
+
+import config
+
+BACKENDS = ('torch', 'quantized', 'onnx')
+
+_threads_configured = False
+_threads_lock = threading.Lock()
+
+
+def configure_threads(num_threads=None, interop_threads=None):
+    # Süreç başına bir kez uygulanır; 0 torch varsayılanını korur
+    global _threads_configured
+    num_threads = config.INFERENCE_THREADS if num_threads is None else num_threads
+    interop_threads = config.INFERENCE_INTEROP_THREADS if interop_threads is None else interop_threads
+
+    with _threads_lock:
+        if _threads_configured:
+            return
+        if num_threads > 0:
+            torch.set_num_threads(num_threads)
+        if interop_threads > 0:
+            try:
+                torch.set_num_interop_threads(interop_threads)
+            except RuntimeError as e:
+                # Paralel iş başladıktan sonra değiştirilemez
+                print(f"Interop thread setting error: {str(e)}")
+        _threads_configured = True
+
+
+def thread_settings():
+    return {'intra_op': torch.get_num_threads(), 'inter_op': torch.get_num_interop_threads()}
+
+
+def load_model(model_name, backend=None):
+    backend = backend or config.INFERENCE_BACKEND
+    configure_threads()
+
+    if backend == 'torch':
+        model = AutoModelForCausalLM.from_pretrained(model_name)
+        model.eval()
+        return model
+    if backend == 'quantized':
+        # Linear katmanların ağırlıkları int8 saklanır, aktivasyonlar çalışma anında nicemlenir
+        model = AutoModelForCausalLM.from_pretrained(model_name)
+        model.eval()
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if backend == 'onnx':
+        return _load_onnx_model(model_name)
+    raise ValueError(f'Bilinmeyen çıkarım altyapısı: {backend}')
+
+
+def _onnx_model_dir(model_name):
+    return os.path.join(config.ONNX_DIR, model_name.replace('/', '__'))
+
+
+def _load_onnx_model(model_name):
+    if ORTModelForCausalLM is None:
+        raise RuntimeError('onnx altyapısı için optimum[onnxruntime] paketi gerekli')
+
+    session_options = onnxruntime.SessionOptions()
+    if config.INFERENCE_THREADS > 0:
+        session_options.intra_op_num_threads = config.INFERENCE_THREADS
+    if config.INFERENCE_INTEROP_THREADS > 0:
+        session_options.inter_op_num_threads = config.INFERENCE_INTEROP_THREADS
+
+    # Dışa aktarma yalnızca ilk yüklemede yapılır, sonraki açılışlar kaydedilmiş modeli kullanır
+    model_dir = _onnx_model_dir(model_name)
+    if os.path.isdir(model_dir):
+        return ORTModelForCausalLM.from_pretrained(model_dir, session_options=session_options)
+
+    model = ORTModelForCausalLM.from_pretrained(model_name, export=True, session_options=session_options)
+    model.save_pretrained(model_dir)
+    return model
+
+
+def model_size_bytes(model):
+    # Nicemlenmiş Linear katmanların ağırlıkları parametre sayılmadığı için ayrıca eklenir
+    if not isinstance(model, torch.nn.Module):
+        model_dir = getattr(model, 'model_save_dir', None)
+        if not model_dir or not os.path.isdir(model_dir):
+            return 0
+        return sum(os.path.getsize(os.path.join(model_dir, name))
+                   for name in os.listdir(model_dir) if '.onnx' in name)
+
+    total = sum(p.numel() * p.element_size() for p in model.parameters())
+    for module in model.modules():
+        if hasattr(module, '_packed_params') and callable(getattr(module, 'weight', None)):
+            weight = module.weight()
+            total += weight.numel() * weight.element_size()
+            bias = module.bias()
+            if bias is not None:
+                total += bias.numel() * bias.element_size()
+    return total
@@ -0,0 +1,143 @@
+from transformers import pipeline, AutoTokenizer
+import threading
+import time
+import os
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import config
+
+from models.generation_batcher import GenerationBatcher
+from models.inference_backends import BACKENDS, load_model, model_size_bytes, thread_settings
+
+
+def _process_rss_bytes():
+    # Linux'ta anlık RSS değerini /proc üzerinden oku
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    # Diğer platformlarda tepe RSS değerine geri dön
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return 0
+
+
+class ModelRegistry:
+    COMPONENTS = ('tokenizer', 'model', 'sentiment_pipeline')
+
+    def __init__(self, model_name=None, backend=None):
+        self.model_name = model_name or config.MODEL_NAME
+        # 'torch' (fp32), 'quantized' (int8 dinamik nicemleme) ya da 'onnx' (ONNX Runtime)
+        self.backend = backend or config.INFERENCE_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f'Bilinmeyen çıkarım altyapısı: {self.backend}')
+        self._lock = threading.RLock()
+        self._components = {}
+        self._load_seconds = {}
+        self._rss_delta_bytes = {}
+        self._generation_batcher = None
+        self._model_bytes = 0
+
+    @property
+    def tokenizer(self):
+        return self._get('tokenizer')
+
+    @property
+    def model(self):
+        return self._get('model')
+
+    @property
+    def sentiment_pipeline(self):
+        return self._get('sentiment_pipeline')
+
+    @property
+    def generation_batcher(self):
+        # Tüm klonların üretim istekleri tek bir mikro-parti kuyruğunda birleştirilir
+        if self._generation_batcher is None:
+            with self._lock:
+                if self._generation_batcher is None:
+                    self._generation_batcher = GenerationBatcher(self)
+        return self._generation_batcher
+
+    def generate(self, prompt):
+        return self.generation_batcher.generate(prompt)
+
+    def generate_stream(self, prompt, stop_event=None):
+        return self.generation_batcher.stream(prompt, stop_event)
+
+    def is_loaded(self, component):
+        return component in self._components
+
+    def warm_up(self, components=('tokenizer', 'model')):
+        for component in components:
+            self._get(component)
+        return self
+
+    def _get(self, component):
+        # Yüklenmiş bileşen için kilit almadan dön
+        value = self._components.get(component)
+        if value is not None:
+            return value
+
+        with self._lock:
+            value = self._components.get(component)
+            if value is None:
+                value = self._load(component)
+            return value
+
+    def _load(self, component):
+        rss_before = _process_rss_bytes()
+        start = time.perf_counter()
+
+        if component == 'tokenizer':
+            value = AutoTokenizer.from_pretrained(self.model_name)
+        elif component == 'model':
+            value = load_model(self.model_name, self.backend)
+            self._model_bytes = model_size_bytes(value)
+        elif component == 'sentiment_pipeline':
+            # Ayrı bir duygu modeli verilmişse kendi tokenizer'ı ile yüklenir
+            sentiment_model = config.SENTIMENT_MODEL or self.model_name
+            value = pipeline("sentiment-analysis",
+                             model=sentiment_model,
+                             tokenizer=self.tokenizer if sentiment_model == self.model_name else sentiment_model)
+        else:
+            raise ValueError(f'Bilinmeyen model bileşeni: {component}')
+
+        self._load_seconds[component] = time.perf_counter() - start
+        self._rss_delta_bytes[component] = max(_process_rss_bytes() - rss_before, 0)
+        self._components[component] = value
+        return value
+
+    def metrics(self):
+        return {
+            'model_name': self.model_name,
+            'backend': self.backend,
+            'threads': thread_settings(),
+            'loaded': {name: self.is_loaded(name) for name in self.COMPONENTS},
+            'load_seconds': dict(self._load_seconds),
+            'rss_delta_bytes': dict(self._rss_delta_bytes),
+            'parameter_bytes': self._model_bytes,
+            'process_rss_bytes': _process_rss_bytes(),
+            'generation': self._generation_batcher.metrics() if self._generation_batcher is not None else None
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    # Süreç başına tek bir kayıt defteri paylaşılır
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
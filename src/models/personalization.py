@@ -0,0 +1,98 @@
+from heapq import nlargest
+import hashlib
+import numpy as np
+
+import config
+from utils.response_cache import normalize_question
+
+# Yanıta eklenecek öğelerin olasılıkları
+WORD_PROBABILITY = 0.3
+SENTIMENT_EMOJI_PROBABILITY = 0.5
+PUNCTUATION_PROBABILITY = 0.3
+EMOJI_PROBABILITY = 0.2
+TOP_WORDS = 5
+
+SENTIMENT_EMOJIS = {
+    'positive': ("😊", "👍", "🙌", "💪", "✨"),
+    'negative': ("😔", "😕", "💔", "😢", "😞")
+}
+
+
+class AliasTable:
+    # Vose alias yöntemi: kurulum O(n), her örnekleme bir tamsayı ve bir ondalık sayı çekişidir
+    def __init__(self, items, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        count = len(weights)
+        self.items = tuple(items)
+        self.prob = np.ones(count)
+        self.alias = np.arange(count)
+
+        scaled = weights * count / weights.sum()
+        small = [i for i in range(count) if scaled[i] < 1.0]
+        large = [i for i in range(count) if scaled[i] >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # Kayan nokta artıkları: kalan sütunlar tam dolu sayılır
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    @classmethod
+    def from_counts(cls, counts):
+        items = [(item, count) for item, count in counts.items() if count > 0]
+        if not items:
+            return None
+        return cls([item for item, _ in items], [count for _, count in items])
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample(self, rng):
+        column = int(rng.integers(len(self.items)))
+        if rng.random() < self.prob[column]:
+            return self.items[column]
+        return self.items[self.alias[column]]
+
+
+class PersonalizationTables:
+    # Eğitimden sonra bir kez kurulan örnekleme tabloları; yanıt başına her karar O(1)
+    def __init__(self, top_words, punctuation, emoji, sentiment_emojis):
+        self.top_words = top_words
+        self.punctuation = punctuation
+        self.emoji = emoji
+        self.sentiment_emojis = sentiment_emojis
+
+    @classmethod
+    def build(cls, word_preferences, writing_style, top_words=TOP_WORDS):
+        writing_style = writing_style or {}
+        emoji_freq = writing_style.get('emoji_freq') or {}
+
+        # Duygu emojileri kullanıcının kendi emoji sıklıklarıyla ağırlıklandırılır (+1 düzgünleştirme)
+        sentiment_emojis = {
+            sentiment: AliasTable(emojis, [emoji_freq.get(emoji, 0) + 1 for emoji in emojis])
+            for sentiment, emojis in SENTIMENT_EMOJIS.items()
+        }
+        return cls(
+            top_words=tuple(word for word, _ in nlargest(top_words, word_preferences.items(), key=lambda x: x[1])),
+            punctuation=AliasTable.from_counts(writing_style.get('punctuation_freq') or {}),
+            emoji=AliasTable.from_counts(emoji_freq),
+            sentiment_emojis=sentiment_emojis
+        )
+
+
+def personalization_rng(clone_id, revision, question):
+    # ARPA_PERSONALIZATION_SEED verilirse aynı klon revizyonu ve soru için aynı kişiselleştirme üretilir
+    if config.PERSONALIZATION_SEED is None:
+        return np.random.default_rng()
+    digest = hashlib.blake2b(
+        f"{config.PERSONALIZATION_SEED}\x00{clone_id}\x00{revision}\x00{normalize_question(question)}".encode('utf-8'),
+        digest_size=8
+    ).digest()
+    return np.random.default_rng(int.from_bytes(digest, 'little'))
@@ -0,0 +1,421 @@
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.decomposition import TruncatedSVD
+from collections import OrderedDict
+from scipy import sparse
+import numpy as np
+import threading
+
+from utils.nltk_resources import get_nltk_resources
+import config
+
+
+def smooth_idf(document_count, document_frequency):
+    # TfidfTransformer(smooth_idf=True) ile aynı formül
+    return np.log((1 + document_count) / (1 + np.asarray(document_frequency, dtype=np.float64))) + 1
+
+
+def normalize_rows(indptr, weights):
+    # CSR satırlarını yerinde l2 normuna böler (boş satırlar olduğu gibi kalır)
+    row_count = len(indptr) - 1
+    row_ids = np.repeat(np.arange(row_count), np.diff(indptr))
+    row_norms = np.sqrt(np.bincount(row_ids, weights=weights ** 2, minlength=row_count))
+    row_norms[row_norms == 0] = 1
+    weights /= row_norms[row_ids]
+    return weights
+
+
+_hashing_vectorizers = {}
+_hashing_vectorizers_lock = threading.Lock()
+
+
+def get_hashing_vectorizer(n_features):
+    # Durumsuz olduğu için süreç genelinde paylaşılır; TF-IDF ile aynı n-gram ayarları,
+    # durak kelimeler ise metin işlemedeki Türkçe listedir
+    with _hashing_vectorizers_lock:
+        vectorizer = _hashing_vectorizers.get(n_features)
+        if vectorizer is None:
+            vectorizer = HashingVectorizer(
+                n_features=n_features,
+                stop_words=sorted(get_nltk_resources().stop_words),
+                ngram_range=(1, 2),
+                alternate_sign=False,
+                norm=None
+            )
+            _hashing_vectorizers[n_features] = vectorizer
+        return vectorizer
+
+
+class HashingIndex:
+    # Sözlük tutmayan TF-IDF dizini: terimler sabit boyutlu bir uzaya hash'lenir,
+    # klon başına yalnızca ham sayı satırları, ağırlıklı satırlar ve belge frekansları saklanır
+    def __init__(self, n_features=None):
+        self.n_features = n_features or config.RETRIEVAL_HASH_FEATURES
+        self.counts = None
+        self.matrix = None
+        self.df_columns = np.zeros(0, dtype=np.int32)
+        self.df_counts = np.zeros(0, dtype=np.int64)
+
+    @property
+    def document_count(self):
+        return 0 if self.counts is None else self.counts.shape[0]
+
+    def _count(self, texts):
+        counts = get_hashing_vectorizer(self.n_features).transform(texts).tocsr()
+        counts.sort_indices()
+        return sparse.csr_matrix((counts.data.astype(np.int32), counts.indices.astype(np.int32), counts.indptr),
+                                 shape=counts.shape)
+
+    def fit(self, texts):
+        self.counts = None
+        self.df_columns = np.zeros(0, dtype=np.int32)
+        self.df_counts = np.zeros(0, dtype=np.int64)
+        self.add(texts)
+
+    def add(self, texts):
+        new_counts = self._count(texts)
+        self.counts = new_counts if self.counts is None else sparse.vstack([self.counts, new_counts], format='csr')
+
+        # Belge frekansları yalnızca dolu sütunlar için tutulur
+        columns, frequencies = np.unique(new_counts.indices, return_counts=True)
+        all_columns = np.concatenate([self.df_columns, columns])
+        all_frequencies = np.concatenate([self.df_counts, frequencies])
+        self.df_columns, inverse = np.unique(all_columns, return_inverse=True)
+        self.df_columns = self.df_columns.astype(np.int32)
+        self.df_counts = np.bincount(inverse, weights=all_frequencies).astype(np.int64)
+
+        self._reweight()
+
+    def _idf(self, columns):
+        # Klonda hiç geçmeyen sütunların ağırlığı sıfırdır (TF-IDF'teki bilinmeyen terimler gibi)
+        idf = np.zeros(len(columns), dtype=np.float64)
+        if not len(self.df_columns):
+            return idf
+        positions = np.searchsorted(self.df_columns, columns)
+        positions[positions >= len(self.df_columns)] = 0
+        found = self.df_columns[positions] == columns
+        idf[found] = smooth_idf(self.document_count, self.df_counts[positions[found]])
+        return idf
+
+    def _reweight(self):
+        counts = self.counts
+        weights = normalize_rows(counts.indptr, counts.data.astype(np.float64) * self._idf(counts.indices))
+        self.matrix = sparse.csr_matrix((weights, counts.indices, counts.indptr), shape=counts.shape)
+
+    def transform(self, text):
+        query = self._count([text])
+        weights = normalize_rows(query.indptr, query.data.astype(np.float64) * self._idf(query.indices))
+        return sparse.csr_matrix((weights, query.indices, query.indptr), shape=query.shape)
+
+    def scores(self, text):
+        if self.matrix is None:
+            return np.zeros(0, dtype=np.float64)
+        return np.asarray((self.matrix @ self.transform(text).T).todense()).ravel()
+
+    def to_arrays(self):
+        return {
+            'hash_data': self.matrix.data.astype(np.float32),
+            'hash_indices': self.counts.indices.astype(np.int32),
+            'hash_indptr': self.counts.indptr.astype(np.int64),
+            'hash_counts': self.counts.data.astype(np.int32),
+            'hash_df_columns': self.df_columns,
+            'hash_df_counts': self.df_counts
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, n_features):
+        index = cls(n_features)
+        indices = arrays['hash_indices']
+        indptr = arrays['hash_indptr']
+        shape = (len(indptr) - 1, n_features)
+        index.counts = sparse.csr_matrix((arrays['hash_counts'], indices, indptr), shape=shape, copy=False)
+        index.matrix = sparse.csr_matrix((arrays['hash_data'], indices, indptr), shape=shape, copy=False)
+        index.df_columns = arrays['hash_df_columns']
+        index.df_counts = arrays['hash_df_counts']
+        return index
+
+
+class SharedHashingIndex:
+    # Birden çok klonun satırlarını tek bir seyrek matriste toplar; sorgu tek çarpımla tüm klonlarda aranır.
+    # Klonların idf değerleri farklı olduğundan sorgu idf'siz (yalnızca terim sayılarıyla) ağırlıklandırılır.
+    def __init__(self, n_features=None):
+        self.n_features = n_features or config.RETRIEVAL_HASH_FEATURES
+        self._blocks = OrderedDict()
+        self._matrix = None
+        self._row_clone_ids = None
+        self._row_offsets = None
+        self._lock = threading.Lock()
+
+    def add(self, clone_id, index):
+        if index.matrix is None or index.n_features != self.n_features:
+            return False
+        with self._lock:
+            self._blocks[clone_id] = index.matrix
+            self._matrix = None
+        return True
+
+    def remove(self, clone_id):
+        with self._lock:
+            if self._blocks.pop(clone_id, None) is not None:
+                self._matrix = None
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def _build(self):
+        clone_ids = list(self._blocks.keys())
+        blocks = list(self._blocks.values())
+        row_counts = np.array([block.shape[0] for block in blocks], dtype=np.int64)
+        self._matrix = sparse.vstack(blocks, format='csr')
+        self._row_clone_ids = np.repeat(np.arange(len(clone_ids)), row_counts)
+        self._row_offsets = np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+        self._clone_ids = clone_ids
+
+    def search(self, text, top_k=5):
+        # [(clone_id, gönderi sırası, skor), ...] en yüksek skordan başlayarak
+        query = get_hashing_vectorizer(self.n_features).transform([text]).tocsr()
+        query.data = normalize_rows(query.indptr, query.data.astype(np.float64))
+
+        with self._lock:
+            if not self._blocks:
+                return []
+            if self._matrix is None:
+                self._build()
+            matrix = self._matrix
+            row_clone_ids = self._row_clone_ids
+            row_offsets = self._row_offsets
+            clone_ids = self._clone_ids
+
+        # Boş dizin, satırsız klonlar ya da dizinde hiç terimi olmayan sorgu için argpartition çağrılmaz
+        if top_k <= 0 or not query.nnz or not matrix.shape[0]:
+            return []
+        scores = np.asarray((matrix @ query.T).todense()).ravel()
+        rows, scores = top_k_rows(np.arange(len(scores)), scores, top_k)
+        return [(clone_ids[row_clone_ids[row]], int(row - row_offsets[row]), float(score))
+                for row, score in zip(rows, scores)]
+
+
+def top_k_rows(rows, scores, top_k):
+    # Skoru pozitif olan en iyi k satırı büyükten küçüğe döner
+    positive = scores > 0
+    rows = rows[positive]
+    scores = scores[positive]
+    if len(scores) > top_k:
+        keep = np.argpartition(-scores, top_k - 1)[:top_k]
+        rows = rows[keep]
+        scores = scores[keep]
+    order = np.argsort(-scores, kind='stable')
+    return rows[order], scores[order]
+
+
+def _empty_result():
+    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+
+def _compact_columns(matrix, columns):
+    # Yalnızca dolu sütunları içeren (n, len(columns)) matris
+    return sparse.csr_matrix((matrix.data, np.searchsorted(columns, matrix.indices), matrix.indptr),
+                             shape=(matrix.shape[0], len(columns)))
+
+
+def _select_columns(matrix, columns):
+    # columns dışında kalan girişleri atarak (n, len(columns)) matris kurar
+    positions = np.searchsorted(columns, matrix.indices)
+    positions[positions >= len(columns)] = 0
+    found = columns[positions] == matrix.indices if len(columns) else np.zeros(len(matrix.indices), dtype=bool)
+    row_ids = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    return sparse.csr_matrix((matrix.data[found], (row_ids[found], positions[found])),
+                             shape=(matrix.shape[0], len(columns)))
+
+
+def _query_columns(query, columns):
+    # Sorgu sütunlarını dizindeki sıralarına çevirir; dizinde olmayan sütunlar atılır
+    if not len(columns) or not query.nnz:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+    positions = np.searchsorted(columns, query.indices)
+    positions[positions >= len(columns)] = 0
+    found = columns[positions] == query.indices
+    return positions[found], np.asarray(query.data[found], dtype=np.float64)
+
+
+class ExactSparseIndex:
+    # Tam sonuç veren ters dizin: yalnızca sorgu terimlerini içeren gönderilerin skorları hesaplanır
+    kind = 'exact'
+
+    def __init__(self, matrix):
+        matrix = matrix.tocsr()
+        self.columns = np.unique(matrix.indices)
+        self.postings = _compact_columns(matrix, self.columns).tocsc()
+
+    def search(self, query, top_k):
+        positions, weights = _query_columns(query, self.columns)
+        if not len(positions):
+            return _empty_result()
+
+        postings = self.postings[:, positions]
+        contributions = postings.data * np.repeat(weights, np.diff(postings.indptr))
+        candidates, inverse = np.unique(postings.indices, return_inverse=True)
+        scores = np.bincount(inverse, weights=contributions, minlength=len(candidates))
+        return top_k_rows(candidates, scores, top_k)
+
+
+class IVFIndex:
+    # Yaklaşık arama: gönderiler en sık terimler üzerinde LSA (kesik SVD) ile yoğun vektörlere indirilir ve
+    # küresel k-means ile listelere bölünür; sorguda en yakın n_probe liste seyrek skorla tam olarak taranır
+    kind = 'ann'
+
+    def __init__(self, matrix, columns, components, centroids, list_offsets, list_rows):
+        self.matrix = matrix
+        self.columns = columns
+        self.components = components
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_rows = list_rows
+        self._list_matrix = None
+
+    @staticmethod
+    def _normalize(vectors):
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    @classmethod
+    def build(cls, matrix, dim=None, max_columns=None, n_lists=None, iterations=10, seed=0):
+        matrix = matrix.tocsr()
+        dim = dim or config.RETRIEVAL_ANN_DIM
+        max_columns = max_columns or config.RETRIEVAL_ANN_COLUMNS
+
+        # Yalnızca en çok gönderide geçen terimler kullanılır; tek gönderilik terimler kümelemeye katkı vermez
+        columns, frequencies = np.unique(matrix.indices, return_counts=True)
+        keep = np.argsort(-frequencies, kind='stable')[:max_columns]
+        columns = np.sort(columns[keep[frequencies[keep] >= 2]])
+        selected = _select_columns(matrix, columns)
+
+        document_count = matrix.shape[0]
+        dim = min(dim, len(columns) - 1, document_count - 1)
+        if dim < 1:
+            components = np.zeros((0, len(columns)), dtype=np.float32)
+            embeddings = np.zeros((document_count, 0), dtype=np.float32)
+        else:
+            svd = TruncatedSVD(n_components=dim, random_state=seed)
+            embeddings = svd.fit_transform(selected).astype(np.float32)
+            components = svd.components_.astype(np.float32)
+        embeddings = cls._normalize(embeddings)
+
+        n_lists = max(1, min(n_lists or int(np.sqrt(document_count)), document_count))
+        centroids, assignments = cls._spherical_kmeans(embeddings, n_lists, iterations, seed)
+
+        list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        list_offsets[1:] = np.cumsum(np.bincount(assignments, minlength=n_lists))
+        list_rows = np.argsort(assignments, kind='stable').astype(np.int64)
+        return cls(matrix, columns.astype(np.int32), components, centroids, list_offsets, list_rows)
+
+    @staticmethod
+    def _assign(embeddings, centroids, block_size=4096):
+        assignments = np.empty(len(embeddings), dtype=np.int64)
+        for start in range(0, len(embeddings), block_size):
+            block = embeddings[start:start + block_size]
+            assignments[start:start + block_size] = np.argmax(block @ centroids.T, axis=1)
+        return assignments
+
+    @classmethod
+    def _spherical_kmeans(cls, embeddings, n_lists, iterations, seed):
+        rng = np.random.default_rng(seed)
+        document_count = len(embeddings)
+        centroids = embeddings[rng.choice(document_count, n_lists, replace=False)].copy()
+        assignments = cls._assign(embeddings, centroids)
+
+        for _ in range(iterations):
+            membership = sparse.csr_matrix((np.ones(document_count, dtype=np.float32),
+                                            (assignments, np.arange(document_count))),
+                                           shape=(n_lists, document_count))
+            sums = np.asarray(membership @ embeddings)
+            empty = np.flatnonzero(np.diff(membership.indptr) == 0)
+            if len(empty):
+                # Boş kalan listeler rastgele gönderilerle yeniden başlatılır
+                sums[empty] = embeddings[rng.choice(document_count, len(empty), replace=False)]
+            centroids = cls._normalize(sums).astype(np.float32)
+
+            new_assignments = cls._assign(embeddings, centroids)
+            if np.array_equal(new_assignments, assignments):
+                break
+            assignments = new_assignments
+        return centroids, assignments
+
+    def _get_list_matrix(self):
+        # Satırları liste sırasına dizilmiş, yalnızca dolu sütunları içeren kopya:
+        # taranan her liste bitişik bir dilim olur ve sorgu küçük bir yoğun vektörle çarpılır
+        if self._list_matrix is None:
+            matrix = self.matrix[self.list_rows]
+            occupied = np.unique(matrix.indices)
+            self._list_matrix = (_compact_columns(matrix, occupied), occupied)
+        return self._list_matrix
+
+    def embed_query(self, query):
+        positions, weights = _query_columns(query, self.columns)
+        if not len(positions) or not len(self.components):
+            return None
+        embedding = self.components[:, positions] @ weights.astype(np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else None
+
+    def search(self, query, top_k, n_probe=None):
+        if not query.nnz:
+            return _empty_result()
+        embedding = self.embed_query(query)
+        n_probe = min(n_probe or config.RETRIEVAL_ANN_PROBES, len(self.centroids))
+        if embedding is None:
+            # Sorgu yalnızca seyrek terimlerden oluşuyorsa en büyük listeler taranır
+            probes = np.argsort(-np.diff(self.list_offsets), kind='stable')[:n_probe]
+        else:
+            probes = np.argpartition(-(self.centroids @ embedding), n_probe - 1)[:n_probe]
+
+        list_matrix, occupied = self._get_list_matrix()
+        query_positions, query_weights = _query_columns(query, occupied)
+        dense_query = np.zeros(len(occupied), dtype=np.float64)
+        dense_query[query_positions] = query_weights
+
+        positions = []
+        scores = []
+        for probe in probes:
+            start, end = self.list_offsets[probe], self.list_offsets[probe + 1]
+            if start == end:
+                continue
+            positions.append(np.arange(start, end))
+            scores.append(list_matrix[start:end] @ dense_query)
+        if not positions:
+            return _empty_result()
+
+        positions, scores = top_k_rows(np.concatenate(positions), np.concatenate(scores), top_k)
+        return self.list_rows[positions], scores
+
+    def to_arrays(self):
+        return {
+            'ann_columns': self.columns,
+            'ann_components': self.components,
+            'ann_centroids': self.centroids.astype(np.float32),
+            'ann_list_offsets': self.list_offsets,
+            'ann_list_rows': self.list_rows
+        }
+
+    @classmethod
+    def from_arrays(cls, matrix, arrays):
+        return cls(matrix, arrays['ann_columns'], arrays['ann_components'], arrays['ann_centroids'],
+                   arrays['ann_list_offsets'], arrays['ann_list_rows'])
+
+
+RETRIEVAL_INDEX_KINDS = ('auto', 'exact', 'ann')
+
+
+def resolve_index_kind(kind, document_count):
+    # 'auto': küçük klonlarda tam arama, RETRIEVAL_ANN_MIN_POSTS ve üzerinde yaklaşık arama
+    if kind not in RETRIEVAL_INDEX_KINDS:
+        raise ValueError(f'Bilinmeyen arama dizini: {kind}')
+    if kind == 'auto':
+        return 'ann' if document_count >= config.RETRIEVAL_ANN_MIN_POSTS else 'exact'
+    return kind
+
+
+def build_retrieval_index(matrix, kind='auto'):
+    if resolve_index_kind(kind, matrix.shape[0]) == 'ann':
+        return IVFIndex.build(matrix)
+    return ExactSparseIndex(matrix)
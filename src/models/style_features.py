@@ -0,0 +1,117 @@
+from collections import Counter
+from itertools import repeat
+import numpy as np
+import re
+
+EMOJI_PATTERN = re.compile(r'[\U0001F300-\U0001F9FF]')
+PUNCTUATION_MARKS = ('.', ',', '!', '?')
+
+# Gönderi başına yazım stili özellikleri; matrisin sütun sırası bu şemayla sabittir
+STYLE_FEATURES = (
+    'char_count',
+    'token_count',
+    'avg_word_length',
+    'sentence_count',
+    'period_count',
+    'comma_count',
+    'exclamation_count',
+    'question_count',
+    'emoji_count',
+    'hashtag_count',
+    'mention_count'
+)
+PUNCTUATION_FEATURES = dict(zip(PUNCTUATION_MARKS, ('period_count', 'comma_count', 'exclamation_count', 'question_count')))
+
+# Kişilik vektörünün şeması; en sık kelime sayısı eksikse sıfırla tamamlanır
+TOP_WORD_FEATURES = 10
+PERSONALITY_FEATURES = (
+    'avg_post_length',
+    'avg_word_length',
+    'avg_sentence_length',
+    'vocabulary_richness',
+    'sentiment_positive',
+    'sentiment_negative',
+    'sentiment_neutral',
+    'sentiment_compound',
+    'style_avg_sentence_length',
+    'style_avg_word_length',
+    'hashtag_usage',
+    'mention_usage'
+) + tuple(f'top_word_{i + 1}_freq' for i in range(TOP_WORD_FEATURES))
+
+
+class StyleFeatureMatrix:
+    # Gönderi başına bir satır, STYLE_FEATURES sırasıyla bir sütun; noktalama ve emoji tabloları toplamdır
+    names = STYLE_FEATURES
+
+    def __init__(self, matrix, punctuation_freq, emoji_freq):
+        self.matrix = matrix
+        self.punctuation_freq = punctuation_freq
+        self.emoji_freq = emoji_freq
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def column(self, name):
+        return self.matrix[:, STYLE_FEATURES.index(name)]
+
+    def aggregate(self):
+        # Gönderi ortalamaları: profil düzeyindeki stil vektörü
+        if not len(self):
+            return np.zeros(len(STYLE_FEATURES))
+        return self.matrix.mean(axis=0)
+
+    def to_dict(self):
+        return dict(zip(STYLE_FEATURES, self.aggregate().tolist()))
+
+
+def _emoji_counts(texts):
+    # Tüm metinler tek bir dizede tek seferde taranır, eşleşmeler konumlarına göre gönderilere dağıtılır
+    joined = '\n'.join(texts)
+    positions = []
+    emojis = []
+    for match in EMOJI_PATTERN.finditer(joined):
+        positions.append(match.start())
+        emojis.append(match.group())
+
+    ends = np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) + 1)
+    post_ids = np.searchsorted(ends, np.asarray(positions, dtype=np.int64), side='right')
+    return np.bincount(post_ids, minlength=len(texts)), Counter(emojis)
+
+
+def extract_style_features(posts):
+    posts = list(posts)
+    post_count = len(posts)
+    matrix = np.zeros((post_count, len(STYLE_FEATURES)), dtype=np.float64)
+    if not post_count:
+        return StyleFeatureMatrix(matrix, Counter(), Counter())
+
+    texts = [post['original_text'] for post in posts]
+    token_lists = [post['tokens'] for post in posts]
+
+    def set_column(name, values):
+        matrix[:, STYLE_FEATURES.index(name)] = values
+
+    # Gönderi başına token karakter toplamı birleştirilmiş dizenin uzunluğudur; token başına Python işi yapılmaz
+    token_counts = np.fromiter(map(len, token_lists), dtype=np.int64, count=post_count)
+    length_sums = np.fromiter(map(len, map(''.join, token_lists)), dtype=np.float64, count=post_count)
+    has_tokens = token_counts > 0
+    set_column('token_count', token_counts)
+    set_column('avg_word_length', np.divide(length_sums, token_counts, out=np.zeros(post_count), where=has_tokens))
+
+    set_column('char_count', np.fromiter(map(len, texts), dtype=np.int64, count=post_count))
+    for name, key in (('sentence_count', 'sentences'), ('hashtag_count', 'hashtags'), ('mention_count', 'mentions')):
+        set_column(name, np.fromiter((len(post[key]) for post in posts), dtype=np.int64, count=post_count))
+
+    punctuation_freq = Counter()
+    for mark, name in PUNCTUATION_FEATURES.items():
+        counts = np.fromiter(map(str.count, texts, repeat(mark)), dtype=np.int64, count=post_count)
+        set_column(name, counts)
+        total = int(counts.sum())
+        if total:
+            punctuation_freq[mark] = total
+
+    emoji_counts, emoji_freq = _emoji_counts(texts)
+    set_column('emoji_count', emoji_counts)
+
+    return StyleFeatureMatrix(matrix, punctuation_freq, emoji_freq)
@@ -0,0 +1,124 @@
+from scrapers.backends import SeleniumBackend
+from models.clone_model import DigitalClone
+from utils.text_processor import TextProcessor
+import config
+
+# Akış modunda kaç gönderide bir ilerleme bildirilip iptal kontrol edileceği
+STREAM_REPORT_EVERY = 50
+# Beklenen gönderi sayısı bilinmiyorsa ilerleme bu kadar gönderide aralığın yarısına gelir
+STREAM_PROGRESS_HALF = 200
+
+
+def _report(job, stage, progress):
+    if job is not None:
+        job.update(stage, progress)
+
+
+def _stream_progress(posts_seen, expected_posts):
+    # Toplama ve işleme 0.05 ile 0.65 arasında ilerler; eğitim 0.7'de başlar
+    if expected_posts:
+        fraction = min(posts_seen / expected_posts, 1.0)
+    else:
+        fraction = posts_seen / (posts_seen + STREAM_PROGRESS_HALF)
+    return 0.05 + 0.6 * fraction
+
+
+def build_clone(url, clone_store, registry=None, job=None, scraper=None, processor=None, streaming=None):
+    scraper = scraper or SeleniumBackend()
+    processor = processor or TextProcessor()
+    streaming = config.STREAM_PROCESSING if streaming is None else streaming
+
+    if streaming:
+        clone = _train_streaming(url, scraper, processor, registry, job)
+    else:
+        clone = _train_batch(url, scraper, processor, registry, job)
+    clone.source_url = url
+
+    # Klonu depoya kaydet
+    _report(job, 'save', 0.9)
+    clone_id = clone_store.save(clone)
+
+    return {'clone_id': clone_id}
+
+
+def refresh_clone(clone_id, clone_store, job=None, scraper=None, processor=None):
+    # Aynı klon için ikinci bir güncelleme, ilki kaydedilene kadar bekler; aksi halde
+    # ikisi de aynı revizyondan başlayıp birbirinin eklediği gönderileri ezer
+    with clone_store.update_lock(clone_id):
+        return _refresh_locked(clone_id, clone_store, job, scraper, processor)
+
+
+def _refresh_locked(clone_id, clone_store, job, scraper, processor):
+    # Yalnızca son görülen gönderiden yeni olanlar toplanır ve mevcut klona eklenir
+    clone = clone_store.load_copy(clone_id)
+    if clone is None:
+        raise ValueError('Klon bulunamadı')
+    if not clone.source_url:
+        raise ValueError('Klonun kaynak profili bilinmiyor')
+
+    scraper = scraper or SeleniumBackend()
+    processor = processor or TextProcessor()
+
+    _report(job, 'scrape', 0.05)
+    profile_data = scraper.scrape_profile(clone.source_url, since=clone.last_post_time())
+
+    # Zaman damgası olmayan platformlarda daha önce görülen gönderiler burada elenir
+    _report(job, 'process', 0.5)
+    new_posts = [post for post in profile_data['posts'] if clone.is_new_post(post)]
+
+    _report(job, 'train', 0.7)
+    added = clone.update(processor.process_stream(new_posts), profile_data)
+
+    if added:
+        _report(job, 'save', 0.9)
+        clone_store.save(clone)
+
+    return {'clone_id': clone_id, 'new_posts': added}
+
+
+def _train_batch(url, scraper, processor, registry, job):
+    # Sosyal medya verilerini çek
+    _report(job, 'scrape', 0.05)
+    profile_data = scraper.scrape_profile(url)
+
+    # Metin işleme
+    _report(job, 'process', 0.5)
+    processed_data, aggregate = processor.process_with_aggregate(profile_data)
+    if not processed_data:
+        raise ValueError('Profilden gönderi toplanamadı')
+
+    # Dijital klon oluştur; toplu analiz toplamları metin işlemeden devralınır
+    _report(job, 'train', 0.7)
+    clone = DigitalClone(registry=registry)
+    clone.train(processed_data, aggregate)
+    return clone
+
+
+def _train_streaming(url, scraper, processor, registry, job):
+    # Gönderiler toplandıkça işlenip klona eklenir; işlenmiş gönderi listesi bellekte tutulmaz
+    _report(job, 'scrape', 0.05)
+    posts = scraper.stream_profile(url)
+    if job is not None:
+        # İptal edilen işte veri toplayıcı bir sonraki gönderide durur ve tarayıcıyı bırakır
+        posts.cancel_event = job.cancel_event
+    stream = processor.process_stream(posts)
+
+    clone = DigitalClone(registry=registry)
+    clone.begin_training(stream.aggregate)
+    try:
+        for processed_post in stream:
+            clone.add_training_post(processed_post)
+            if stream.post_count % STREAM_REPORT_EVERY == 0:
+                _report(job, 'scrape', _stream_progress(posts.posts_seen, posts.expected_posts))
+    finally:
+        posts.close()
+    _report(job, 'process', 0.65)
+
+    processed_data = stream.result(posts.profile_data)
+    if not processed_data:
+        raise ValueError('Profilden gönderi toplanamadı')
+
+    # TF-IDF ve kişilik vektörü tüm gönderiler geldikten sonra hesaplanır
+    _report(job, 'train', 0.7)
+    clone.finish_training(processed_data)
+    return clone
@@ -0,0 +1,327 @@
+from datetime import datetime, timedelta, timezone
+import threading
+import random
+import queue
+import json
+import glob
+import os
+import re
+
+from scrapers.social_media_scraper import ScrapeCancelled, SocialMediaScraper, detect_platform, new_profile_data
+from utils.file_utils import atomic_write_bytes
+import config
+
+
+def filter_since(profile_data, since):
+    # Zaman damgası since'ten yeni olan gönderileri bırakır (zaman damgası olmayanlar korunur)
+    if since is None:
+        return profile_data
+    posts = []
+    posting_hours = {}
+    posting_days = {}
+    for post in profile_data['posts']:
+        post_datetime = None
+        if post.get('timestamp'):
+            try:
+                post_datetime = datetime.fromisoformat(post['timestamp'].replace('Z', '+00:00'))
+                if post_datetime <= since:
+                    continue
+            except (ValueError, TypeError):
+                post_datetime = None
+        posts.append(post)
+        if post_datetime is not None:
+            hour = post_datetime.hour
+            day = post_datetime.strftime('%A')
+            posting_hours[hour] = posting_hours.get(hour, 0) + 1
+            posting_days[day] = posting_days.get(day, 0) + 1
+
+    # Zaman dağılımı yalnızca kalan gönderilerden yeniden hesaplanır
+    profile_data['posts'] = posts
+    profile_data['temporal_patterns'] = {'posting_hours': posting_hours, 'posting_days': posting_days}
+    return profile_data
+
+
+def recording_slug(url):
+    # URL'yi dosya adına dönüştür: https://twitter.com/ali -> twitter_com_ali
+    path = url.lower().split('://', 1)[-1]
+    return re.sub(r'[^a-z0-9]+', '_', path).strip('_')
+
+
+_STREAM_END = object()
+
+
+class ScrapeStream:
+    # Gönderileri toplandıkça veren yineleyici; bittiğinde profile_data doldurulur.
+    # scrape(on_post) fonksiyonu ayrı bir iş parçacığında çalışır ve profile_data döner.
+    def __init__(self, scrape, max_buffered=None, expected_posts=None):
+        self._scrape = scrape
+        self.max_buffered = max_buffered or config.STREAM_QUEUE_SIZE
+        # Toplanması beklenen gönderi sayısı (bilinmiyorsa None); ilerleme bildirimi için
+        self.expected_posts = expected_posts
+        self.posts_seen = 0
+        self._error = None
+        self._closed = threading.Event()
+        # İş iptal edildiğinde kurulan olay (ör. Job.cancel_event); veri toplayıcı bir sonraki gönderide durur
+        self.cancel_event = None
+        self.profile_data = None
+
+    @property
+    def stopped(self):
+        return self._closed.is_set() or (self.cancel_event is not None and self.cancel_event.is_set())
+
+    def close(self):
+        self._closed.set()
+
+    def _offer(self, buffer, item):
+        # Kuyruk doluysa veri toplayıcı tüketiciyi bekler; tüketici durduysa ya da iş iptal edildiyse
+        # ScrapeCancelled ile toplama döngüsünden çıkılır ve tarayıcı havuza geri verilir
+        while not self.stopped:
+            try:
+                buffer.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise ScrapeCancelled()
+
+    def _run(self, buffer):
+        try:
+            self.profile_data = self._scrape(lambda post: self._offer(buffer, post))
+        except ScrapeCancelled:
+            pass
+        except Exception as e:
+            self._error = e
+        finally:
+            # İptal edilse bile tüketici hâlâ okuyorsa akışın bittiği bildirilir
+            while not self._closed.is_set():
+                try:
+                    buffer.put(_STREAM_END, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def __iter__(self):
+        # Kuyruk sınırlıdır: veri toplayıcı tüketiciden en fazla max_buffered gönderi önde gider
+        buffer = queue.Queue(maxsize=self.max_buffered)
+        thread = threading.Thread(target=self._run, args=(buffer,), daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                post = buffer.get()
+                if post is _STREAM_END:
+                    break
+                self.posts_seen += 1
+                yield post
+        finally:
+            self.close()
+
+        thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+class ScraperBackend:
+    name = None
+
+    def scrape_profile(self, url, since=None):
+        raise NotImplementedError
+
+    def stream_profile(self, url, since=None):
+        # Varsayılan: profil bir kerede toplanır, gönderiler ardından akıtılır
+        def scrape(on_post):
+            profile_data = self.scrape_profile(url, since=since)
+            stream.expected_posts = len(profile_data['posts'])
+            for post in profile_data['posts']:
+                on_post(post)
+            return profile_data
+
+        stream = ScrapeStream(scrape)
+        return stream
+
+
+class SeleniumBackend(ScraperBackend):
+    name = 'selenium'
+
+    def __init__(self, record_dir=None, **scraper_options):
+        self.record_dir = record_dir
+        self.scraper_options = scraper_options
+
+    def scrape_profile(self, url, since=None):
+        # SocialMediaScraper örnekleri iş parçacıkları arasında paylaşılmaz
+        profile_data = SocialMediaScraper(since=since, **self.scraper_options).scrape_profile(url)
+        if self.record_dir:
+            ReplayBackend(self.record_dir).record(url, profile_data)
+        return profile_data
+
+    def stream_profile(self, url, since=None):
+        # Ham gönderiler yalnızca kayıt alınacaksa profile_data['posts'] içinde tutulur
+        def scrape(on_post):
+            scraper = SocialMediaScraper(on_post=on_post, since=since, keep_posts=bool(self.record_dir),
+                                         **self.scraper_options)
+            profile_data = scraper.scrape_profile(url)
+            if self.record_dir:
+                ReplayBackend(self.record_dir).record(url, profile_data)
+            return profile_data
+
+        max_posts = self.scraper_options.get('max_posts') or config.SCRAPER_MAX_POSTS or None
+        return ScrapeStream(scrape, expected_posts=max_posts)
+
+
+class ReplayBackend(ScraperBackend):
+    # Kayıtlar: <slug>.json (profile_data), <slug>.html ya da <slug>/*.html (sayfa kaynakları)
+    name = 'replay'
+
+    def __init__(self, root):
+        self.root = root
+        self._parser = None
+
+    def _snapshot_parser(self):
+        if self._parser is None:
+            self._parser = SocialMediaScraper()
+        return self._parser
+
+    def record(self, url, profile_data):
+        path = os.path.join(self.root, recording_slug(url) + '.json')
+        atomic_write_bytes(path, json.dumps(profile_data, ensure_ascii=False).encode('utf-8'))
+        return path
+
+    def scrape_profile(self, url, since=None):
+        slug = recording_slug(url)
+
+        json_path = os.path.join(self.root, slug + '.json')
+        if os.path.exists(json_path):
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return filter_since(json.load(f), since)
+
+        page_paths = sorted(glob.glob(os.path.join(self.root, slug, '*.html')))
+        html_path = os.path.join(self.root, slug + '.html')
+        if os.path.exists(html_path):
+            page_paths.insert(0, html_path)
+        if not page_paths:
+            raise FileNotFoundError(f'Kayıt bulunamadı: {url}')
+
+        pages = []
+        for page_path in page_paths:
+            with open(page_path, 'r', encoding='utf-8') as f:
+                pages.append(f.read())
+        return filter_since(self._snapshot_parser().parse_snapshots(url, pages), since)
+
+
+SYNTHETIC_WORDS = [
+    'bugün', 'yarın', 'güzel', 'harika', 'kötü', 'proje', 'toplantı', 'kahve', 'yazılım',
+    'veri', 'model', 'istanbul', 'ankara', 'futbol', 'maç', 'müzik', 'konser', 'kitap',
+    'okudum', 'öneririm', 'teşekkürler', 'herkese', 'yeni', 'başladı', 'bitti', 'hafta',
+    'sonu', 'tatil', 'deniz', 'yağmur', 'güneş', 'akşam', 'sabah', 'ekip', 'başarı',
+    'zor', 'kolay', 'öğrendim', 'paylaşım', 'etkinlik', 'konferans', 'sunum', 'python',
+    'yapay', 'zeka', 'gelecek', 'çok', 'biraz', 'gerçekten', 'sonunda', 'birlikte'
+]
+SYNTHETIC_HASHTAGS = ['#python', '#yapayzeka', '#istanbul', '#futbol', '#kitap', '#müzik',
+                      '#veri', '#teknoloji', '#haftasonu', '#kahve', '#etkinlik', '#girişim']
+SYNTHETIC_MENTIONS = ['@ahmet', '@ayse', '@mehmet', '@zeynep', '@can', '@elif', '@emre', '@deniz']
+SYNTHETIC_EMOJIS = ['😊', '👍', '🙌', '💪', '✨', '😔', '😂', '🔥', '☕', '🎉']
+SYNTHETIC_PUNCTUATION = ['.', '!', '?', '...', '!!']
+
+
+def _zipf_choice(rng, items, exponent=1.1):
+    # Gerçekçi dağılım için sık kullanılanlar başta olacak şekilde ağırlıklı seçim
+    weights = [1.0 / (rank + 1) ** exponent for rank in range(len(items))]
+    return rng.choices(items, weights=weights, k=1)[0]
+
+
+def generate_synthetic_profile(url, num_posts=100, seed=None, end_time=None):
+    platform = detect_platform(url)
+    rng = random.Random(seed if seed is not None else recording_slug(url))
+    end_time = end_time or datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    profile_data = new_profile_data(platform)
+    profile_data['platform'] = platform
+    profile_data['profile_info'] = {'name': recording_slug(url).rsplit('_', 1)[-1], 'bio': 'Sentetik profil'}
+
+    engagement = profile_data['engagement_metrics']
+    content_analysis = profile_data['content_analysis']
+    temporal_patterns = profile_data['temporal_patterns']
+
+    timestamp = end_time
+    for i in range(num_posts):
+        sentences = []
+        for _ in range(rng.randint(1, 3)):
+            words = [_zipf_choice(rng, SYNTHETIC_WORDS) for _ in range(rng.randint(3, 14))]
+            sentences.append(' '.join(words).capitalize() + rng.choice(SYNTHETIC_PUNCTUATION))
+        hashtags = rng.sample(SYNTHETIC_HASHTAGS, rng.choice([0, 0, 1, 1, 2, 3]))
+        mentions = rng.sample(SYNTHETIC_MENTIONS, rng.choice([0, 0, 0, 1, 2]))
+        extras = hashtags + mentions
+        if rng.random() < 0.3:
+            extras.append(rng.choice(SYNTHETIC_EMOJIS))
+        urls = [f'https://example.com/{i}'] if rng.random() < 0.1 else []
+        content = ' '.join(sentences + extras + urls)
+
+        # Gönderiler geriye doğru, düzensiz aralıklarla dağıtılır
+        timestamp -= timedelta(minutes=rng.randint(20, 60 * 36))
+        has_media = rng.random() < 0.25
+        likes = int(rng.paretovariate(1.3) * 3)
+
+        post = {
+            'content': content,
+            'hashtags': hashtags,
+            'mentions': mentions,
+            'timestamp': timestamp.isoformat().replace('+00:00', 'Z')
+        }
+        content_analysis['hashtags'].extend(hashtags)
+        content_analysis['mentions'].extend(mentions)
+
+        if platform == 'twitter':
+            post.update({
+                'permalink': f'/synthetic/status/{i}',
+                'likes': likes,
+                'retweets': likes // rng.randint(3, 10),
+                'replies': likes // rng.randint(5, 20),
+                'urls': urls,
+                'has_media': has_media
+            })
+            engagement['total_tweets'] += 1
+            engagement['total_likes'] += post['likes']
+            engagement['total_retweets'] += post['retweets']
+            engagement['total_replies'] += post['replies']
+            content_analysis['urls'].extend(urls)
+            content_analysis['media_count'] += int(has_media)
+        elif platform == 'instagram':
+            post.update({'likes': likes, 'media_type': rng.choice(['image', 'image', 'video', 'carousel'])})
+            engagement['total_posts'] += 1
+            engagement['total_likes'] += likes
+            content_analysis['media_types'][post['media_type']] += 1
+        else:
+            post.update({'reactions': likes, 'has_media': has_media, 'has_article': rng.random() < 0.1})
+            engagement['total_posts'] += 1
+            engagement['total_reactions'] += likes
+            content_analysis['media_count'] += int(has_media)
+            content_analysis['article_count'] += int(post['has_article'])
+
+        hour = timestamp.hour
+        day = timestamp.strftime('%A')
+        temporal_patterns['posting_hours'][hour] = temporal_patterns['posting_hours'].get(hour, 0) + 1
+        temporal_patterns['posting_days'][day] = temporal_patterns['posting_days'].get(day, 0) + 1
+
+        profile_data['posts'].append(post)
+
+    return profile_data
+
+
+class SyntheticBackend(ScraperBackend):
+    name = 'synthetic'
+
+    def __init__(self, num_posts=100, seed=None):
+        self.num_posts = num_posts
+        self.seed = seed
+
+    def scrape_profile(self, url, since=None):
+        return filter_since(generate_synthetic_profile(url, self.num_posts, self.seed), since)
+
+
+def create_backend(name, **options):
+    if name == 'selenium':
+        return SeleniumBackend(**options)
+    if name == 'replay':
+        return ReplayBackend(**options)
+    if name == 'synthetic':
+        return SyntheticBackend(**options)
+    raise ValueError(f'Bilinmeyen veri toplama altyapısı: {name}')
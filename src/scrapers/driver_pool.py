@@ -0,0 +1,190 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager
+from collections import deque
+import threading
+import time
+
+import config
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def _resolve_driver_path():
+    # ChromeDriverManager çözümlemesi süreç başına bir kez yapılır
+    global _driver_path
+    if _driver_path is None:
+        with _driver_path_lock:
+            if _driver_path is None:
+                _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+
+def create_chrome_driver():
+    service = Service(_resolve_driver_path())
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument('--headless')  # Tarayıcıyı arka planda çalıştır
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    def __init__(self, size=2, max_uses=50, lease_timeout=120, driver_factory=None):
+        self.size = size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        self.driver_factory = driver_factory or create_chrome_driver
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._leases = 0
+        self._in_use = 0
+        self._created = 0
+        self._recycled = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def warm_up(self, count=None):
+        # İstenen sayıda tarayıcıyı önceden başlatıp boşta bekleyenlere ekle
+        count = min(count or self.size, self.size)
+        with self._lock:
+            missing = count - len(self._idle)
+        for _ in range(max(missing, 0)):
+            pooled = self._create()
+            with self._lock:
+                self._idle.append(pooled)
+        return self
+
+    @contextmanager
+    def lease(self, timeout=None):
+        timeout = self.lease_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError('Boşta tarayıcı bulunamadı')
+        waited = time.perf_counter() - start
+
+        pooled = None
+        try:
+            pooled = self._checkout()
+            with self._lock:
+                self._leases += 1
+                self._in_use += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+
+            yield pooled.driver
+        finally:
+            if pooled is not None:
+                with self._lock:
+                    self._in_use -= 1
+                self._checkin(pooled)
+            self._slots.release()
+
+    def _create(self):
+        driver = self.driver_factory()
+        with self._lock:
+            self._created += 1
+        return _PooledDriver(driver)
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                pooled = self._idle.popleft() if self._idle else None
+            if pooled is None:
+                return self._create()
+            if self._is_healthy(pooled.driver):
+                return pooled
+            self._discard(pooled)
+
+    def _checkin(self, pooled):
+        pooled.uses += 1
+        if self._closed or pooled.uses >= self.max_uses or not self._reset(pooled.driver):
+            self._discard(pooled)
+            return
+        with self._lock:
+            self._idle.append(pooled)
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        # Bir sonraki kiralamaya oturum, çerez ve depolama bilgisi taşınmasın
+        try:
+            if hasattr(driver, 'execute_cdp_cmd'):
+                # delete_all_cookies yalnızca açık sayfanın alan adını temizler; CDP tüm alan adlarını ve önbelleği siler
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            else:
+                driver.delete_all_cookies()
+            try:
+                driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+            except Exception:
+                pass
+            driver.get('about:blank')
+            return True
+        except Exception as e:
+            print(f"Browser reset error: {str(e)}")
+            return False
+
+    def _discard(self, pooled):
+        with self._lock:
+            self._recycled += 1
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for pooled in idle:
+            try:
+                pooled.driver.quit()
+            except Exception:
+                pass
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'leases': self._leases,
+                'created': self._created,
+                'recycled': self._recycled,
+                'avg_lease_wait_seconds': self._total_wait / self._leases if self._leases else 0.0,
+                'max_lease_wait_seconds': self._max_wait
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    # Süreç başına tek bir tarayıcı havuzu paylaşılır
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = DriverPool(size=config.BROWSER_POOL_SIZE,
+                                   max_uses=config.BROWSER_MAX_USES)
+    return _pool
@@ -0,0 +1,129 @@
+from lxml import html as lxml_html
+
+# Sayfa kaynağından tek seferde gönderi kayıtları çıkaran, tarayıcıdan bağımsız ayrıştırıcılar.
+# Dönen kayıtlar canlı (WebDriver) okuma ile aynı biçimdedir.
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _has_classes(*names):
+    return ' and '.join(_has_class(name) for name in names)
+
+
+def _parse(html):
+    if not html or not html.strip():
+        return None
+    return lxml_html.fromstring(html)
+
+
+def _element_text(element):
+    # <br> etiketlerini tarayıcıdaki innerText gibi satır sonuna çevir
+    for br in element.iter('br'):
+        br.tail = '\n' + (br.tail or '')
+    return element.text_content().strip()
+
+
+def _first(element, xpath):
+    matches = element.xpath(xpath)
+    return matches[0] if matches else None
+
+
+def parse_twitter_profile(html):
+    root = _parse(html)
+    profile_info = {}
+    if root is None:
+        return profile_info
+
+    name = _first(root, './/*[@data-testid="UserName"]')
+    if name is not None:
+        profile_info['name'] = _element_text(name)
+    bio = _first(root, './/*[@data-testid="UserDescription"]')
+    if bio is not None:
+        profile_info['bio'] = _element_text(bio)
+    return profile_info
+
+
+def parse_twitter_tweets(html):
+    root = _parse(html)
+    if root is None:
+        return []
+
+    records = []
+    for node in root.xpath('.//*[@data-testid="tweet"]'):
+        text_element = _first(node, './/*[@data-testid="tweetText"]')
+        if text_element is None:
+            continue
+
+        metrics = {}
+        for metric in node.xpath(".//*[substring(@data-testid, string-length(@data-testid) - 5) = '-count']"):
+            metrics[metric.get('data-testid')] = _element_text(metric)
+
+        link = _first(node, './/a[contains(@href, "/status/")]')
+        time_element = _first(node, './/time')
+        records.append({
+            'permalink': link.get('href') if link is not None else None,
+            'content': _element_text(text_element),
+            'metrics': metrics,
+            'media_count': len(node.xpath('.//*[@data-testid="tweetPhoto" or @data-testid="tweetVideo"]')),
+            'timestamp': time_element.get('datetime') if time_element is not None else None
+        })
+    return records
+
+
+def parse_instagram_post(html):
+    # Açık gönderi penceresinin anlık görüntüsünü ayrıştırır
+    root = _parse(html)
+    if root is None:
+        return None
+
+    content = _first(root, f'.//*[{_has_class("_a9zs")}]')
+    if root.xpath(f'.//*[{_has_classes("_aatk", "_aatl")}]'):
+        media_type = 'carousel'
+    elif root.xpath(f'.//*[{_has_class("_aagu")}]'):
+        media_type = 'video'
+    else:
+        media_type = 'image'
+    likes = _first(root, f'.//*[{_has_classes("_aacl", "_aaco", "_aacw", "_aacx", "_aada", "_aade")}]')
+
+    return {
+        'content': _element_text(content) if content is not None else None,
+        'media_type': media_type,
+        'likes': _element_text(likes) if likes is not None else None
+    }
+
+
+def parse_linkedin_profile(html):
+    root = _parse(html)
+    profile_info = {}
+    if root is None:
+        return profile_info
+
+    name = _first(root, f'.//*[{_has_class("text-heading-xlarge")}]')
+    if name is not None:
+        profile_info['name'] = _element_text(name)
+    headline = _first(root, f'.//*[{_has_class("text-body-medium")}]')
+    if headline is not None:
+        profile_info['headline'] = _element_text(headline)
+    return profile_info
+
+
+def parse_linkedin_posts(html):
+    root = _parse(html)
+    if root is None:
+        return []
+
+    media_xpath = f'.//*[{_has_class("feed-shared-image")} or {_has_class("feed-shared-linkedin-video")}]'
+    records = []
+    for node in root.xpath(f'.//*[{_has_class("feed-shared-update-v2")}]'):
+        content = _first(node, f'.//*[{_has_class("feed-shared-text")}]')
+        reactions = _first(node, f'.//*[{_has_class("social-details-social-counts__reactions-count")}]')
+        records.append({
+            'urn': node.get('data-urn'),
+            'content': _element_text(content) if content is not None else None,
+            'media_count': len(node.xpath(media_xpath)),
+            'has_article': bool(node.xpath(f'.//*[{_has_class("feed-shared-article")}]')),
+            'reactions': _element_text(reactions) if reactions is not None else None
+        })
+    return records
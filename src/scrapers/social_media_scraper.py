@@ -1,59 +1,67 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 from datetime import datetime
-import time
 import re
 
-class SocialMediaScraper:
-    def __init__(self):
-        service = Service(ChromeDriverManager().install())
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_argument('--headless')  # Tarayıcıyı arka planda çalıştır
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 10)
+from scrapers.driver_pool import get_driver_pool
+from scrapers.wait_engine import create_waiter
+from scrapers.html_parsers import (parse_twitter_profile, parse_twitter_tweets, parse_instagram_post,
+                                   parse_linkedin_profile, parse_linkedin_posts)
+import config
 
-    def scrape_profile(self, url):
-        try:
-            self.driver.get(url)
-            time.sleep(3)
-
-            profile_data = {
-                'posts': [],
-                'profile_info': {},
-                'engagement_metrics': {},
-                'content_analysis': {},
-                'temporal_patterns': {},
-                'platform': ''
-            }
+TWEET_SELECTOR = '[data-testid="tweet"]'
+INSTAGRAM_MODAL_SELECTOR = 'div[role="dialog"]'
+LINKEDIN_POST_SELECTOR = '.feed-shared-update-v2'
 
-            if 'twitter.com' in url:
-                profile_data = self._scrape_twitter()
-                profile_data['platform'] = 'twitter'
-            elif 'instagram.com' in url:
-                profile_data = self._scrape_instagram()
-                profile_data['platform'] = 'instagram'
-            elif 'linkedin.com' in url:
-                profile_data = self._scrape_linkedin()
-                profile_data['platform'] = 'linkedin'
-            else:
-                raise ValueError('Desteklenmeyen sosyal medya platformu')
+# Daha önce okunmamış tweet düğümlerini işaretleyip gerekli alanları toplu olarak döner
+COLLECT_TWEETS_JS = """
+const records = [];
+document.querySelectorAll(arguments[0]).forEach(node => {
+    if (node.dataset.arpaSeen) {
+        return;
+    }
+    node.dataset.arpaSeen = '1';
 
-            return profile_data
+    const textElement = node.querySelector('[data-testid="tweetText"]');
+    if (!textElement) {
+        return;
+    }
 
-        finally:
-            self.driver.quit()
+    const link = node.querySelector('a[href*="/status/"]');
+    const timeElement = node.querySelector('time');
+    const metrics = {};
+    node.querySelectorAll('[data-testid$="-count"]').forEach(metric => {
+        metrics[metric.getAttribute('data-testid')] = metric.innerText;
+    });
 
-    def _scrape_twitter(self):
-        profile_data = {
+    records.push({
+        permalink: link ? link.getAttribute('href') : null,
+        content: textElement.innerText,
+        metrics: metrics,
+        media_count: node.querySelectorAll('[data-testid="tweetPhoto"], [data-testid="tweetVideo"]').length,
+        timestamp: timeElement ? timeElement.getAttribute('datetime') : null
+    });
+});
+return records;
+"""
+
+class ScrapeCancelled(Exception):
+    # on_post tüketicinin durduğunu bildirir; kayıt başına hata yakalayıcıları bunu yutmaz
+    pass
+
+def detect_platform(url):
+    if 'twitter.com' in url:
+        return 'twitter'
+    if 'instagram.com' in url:
+        return 'instagram'
+    if 'linkedin.com' in url:
+        return 'linkedin'
+    raise ValueError('Desteklenmeyen sosyal medya platformu')
+
+def new_profile_data(platform):
+    if platform == 'twitter':
+        return {
             'posts': [],
             'profile_info': {},
             'engagement_metrics': {
@@ -73,6 +81,162 @@ class SocialMediaScraper:
                 'posting_days': {}
             }
         }
+    if platform == 'instagram':
+        return {
+            'posts': [],
+            'profile_info': {},
+            'engagement_metrics': {
+                'total_posts': 0,
+                'total_likes': 0,
+                'total_comments': 0
+            },
+            'content_analysis': {
+                'hashtags': [],
+                'mentions': [],
+                'media_types': {
+                    'image': 0,
+                    'video': 0,
+                    'carousel': 0
+                }
+            },
+            'temporal_patterns': {
+                'posting_hours': {},
+                'posting_days': {}
+            }
+        }
+    if platform == 'linkedin':
+        return {
+            'posts': [],
+            'profile_info': {},
+            'engagement_metrics': {
+                'total_posts': 0,
+                'total_reactions': 0,
+                'total_comments': 0
+            },
+            'content_analysis': {
+                'hashtags': [],
+                'mentions': [],
+                'media_count': 0,
+                'article_count': 0
+            },
+            'temporal_patterns': {
+                'posting_hours': {},
+                'posting_days': {}
+            }
+        }
+    raise ValueError('Desteklenmeyen sosyal medya platformu')
+
+class SocialMediaScraper:
+    def __init__(self, driver_pool=None, wait_mode=None, max_posts=None, parse_mode=None, on_post=None, since=None,
+                 keep_posts=None):
+        # Tarayıcılar havuzdan kiralanır, her profil için yeni Chrome başlatılmaz
+        self.driver_pool = driver_pool or get_driver_pool()
+        self.wait_mode = wait_mode or config.SCRAPER_WAIT_MODE
+        self.max_posts = max_posts or config.SCRAPER_MAX_POSTS or None
+        # 'snapshot': sayfa kaynağı lxml ile ayrıştırılır, 'live': alanlar WebDriver ile okunur
+        self.parse_mode = parse_mode or config.SCRAPER_PARSE_MODE
+        # Her yeni gönderi toplandığı anda bu fonksiyona da iletilir (akış modu)
+        self.on_post = on_post
+        # Akış modunda gönderiler varsayılan olarak profile_data['posts'] içinde biriktirilmez
+        self.keep_posts = on_post is None if keep_posts is None else keep_posts
+        self.post_count = 0
+        # Yenileme için: zaman damgası bu andan eski (ya da eşit) gönderiler atlanır
+        self.since = since
+        self.driver = None
+        self.wait = None
+        self.waiter = None
+
+    def scrape_profile(self, url):
+        with self.driver_pool.lease() as driver:
+            self.driver = driver
+            self.wait = WebDriverWait(self.driver, 10)
+            self.waiter = create_waiter(self.driver, self.wait_mode,
+                                        scroll_timeout=config.SCRAPER_SCROLL_TIMEOUT)
+            self.post_count = 0
+            try:
+                return self._scrape_current(url)
+            finally:
+                self.driver = None
+                self.wait = None
+                self.waiter = None
+
+    def _append_post(self, profile_data, post_data):
+        self.post_count += 1
+        if self.keep_posts:
+            profile_data['posts'].append(post_data)
+        if self.on_post is not None:
+            self.on_post(post_data)
+
+    def _is_old(self, post_datetime):
+        return self.since is not None and post_datetime is not None and post_datetime <= self.since
+
+    def _reached_target(self):
+        return self.max_posts is not None and self.post_count >= self.max_posts
+
+    def _scrape_current(self, url):
+        platform = detect_platform(url)
+        self.driver.get(url)
+        self.waiter.wait_for_page()
+
+        if platform == 'twitter':
+            profile_data = self._scrape_twitter()
+        elif platform == 'instagram':
+            profile_data = self._scrape_instagram()
+        else:
+            profile_data = self._scrape_linkedin()
+        profile_data['platform'] = platform
+
+        return profile_data
+
+    def parse_snapshots(self, url, pages):
+        # Kaydedilmiş sayfa kaynaklarından tarayıcı olmadan profil verisi üretir.
+        # Twitter/LinkedIn için her sayfa bir kaydırma anlık görüntüsü,
+        # Instagram için her sayfa açık bir gönderi penceresidir.
+        platform = detect_platform(url)
+        profile_data = new_profile_data(platform)
+        profile_data['platform'] = platform
+        if not pages:
+            return profile_data
+
+        seen = set()
+        if platform == 'twitter':
+            profile_data['profile_info'] = parse_twitter_profile(pages[0])
+            for page in pages:
+                for record in parse_twitter_tweets(page):
+                    tweet_key = record.get('permalink') or (record.get('content'), record.get('timestamp'))
+                    if tweet_key in seen:
+                        continue
+                    seen.add(tweet_key)
+                    try:
+                        self._add_tweet(record, profile_data)
+                    except ScrapeCancelled:
+                        raise
+                    except Exception as e:
+                        continue
+        elif platform == 'linkedin':
+            profile_data['profile_info'] = parse_linkedin_profile(pages[0])
+            for page in pages:
+                for record in parse_linkedin_posts(page):
+                    post_key = record.get('urn') or record.get('content')
+                    if post_key in seen:
+                        continue
+                    seen.add(post_key)
+                    try:
+                        self._add_linkedin_post(record, profile_data)
+                    except ScrapeCancelled:
+                        raise
+                    except Exception as e:
+                        continue
+        else:
+            for page in pages:
+                record = parse_instagram_post(page)
+                if record is not None:
+                    self._add_instagram_post(record, profile_data)
+
+        return profile_data
+
+    def _scrape_twitter(self):
+        profile_data = new_profile_data('twitter')
 
         try:
             # Profil bilgilerini topla
@@ -83,109 +247,115 @@ class SocialMediaScraper:
             profile_data['profile_info']['bio'] = bio
 
             # Tweet'leri topla
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            tweet_count, last_height = self.waiter.page_state(TWEET_SELECTOR)
+            
+            seen_tweets = set()
             
             for _ in range(10):  # Daha fazla tweet için scroll sayısını artırdık
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+                collected_before = self.post_count
+                tweet_count, last_height, grew = self.waiter.scroll_and_wait(TWEET_SELECTOR, tweet_count, last_height)
                 
-                tweet_elements = self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]')
+                if self.parse_mode == 'snapshot':
+                    # Sayfa kaynağı bir kez alınır, alanlar çevrimdışı ayrıştırılır
+                    records = parse_twitter_tweets(self.driver.page_source)
+                else:
+                    # Yalnızca yeni render edilen tweet'ler tek bir execute_script çağrısıyla okunur
+                    records = self.driver.execute_script(COLLECT_TWEETS_JS, TWEET_SELECTOR)
                 
-                for tweet in tweet_elements:
+                for record in records:
+                    if self._reached_target():
+                        break
+                    
+                    # Sanal listede aynı tweet farklı bir düğümle yeniden çizilebilir
+                    tweet_key = record.get('permalink') or (record.get('content'), record.get('timestamp'))
+                    if tweet_key in seen_tweets:
+                        continue
+                    seen_tweets.add(tweet_key)
+                    
                     try:
-                        tweet_data = {}
-                        
-                        # Tweet metni
-                        text_element = tweet.find_element(By.CSS_SELECTOR, '[data-testid="tweetText"]')
-                        tweet_data['content'] = text_element.text
-                        
-                        # Etkileşim metrikleri
-                        metrics = tweet.find_elements(By.CSS_SELECTOR, '[data-testid$="-count"]')
-                        for metric in metrics:
-                            metric_id = metric.get_attribute('data-testid')
-                            if 'like' in metric_id:
-                                tweet_data['likes'] = int(metric.text or 0)
-                                profile_data['engagement_metrics']['total_likes'] += tweet_data['likes']
-                            elif 'retweet' in metric_id:
-                                tweet_data['retweets'] = int(metric.text or 0)
-                                profile_data['engagement_metrics']['total_retweets'] += tweet_data['retweets']
-                            elif 'reply' in metric_id:
-                                tweet_data['replies'] = int(metric.text or 0)
-                                profile_data['engagement_metrics']['total_replies'] += tweet_data['replies']
-                        
-                        # Hashtag ve mention analizi
-                        hashtags = re.findall(r'#\w+', tweet_data['content'])
-                        mentions = re.findall(r'@\w+', tweet_data['content'])
-                        urls = re.findall(r'https?://\S+', tweet_data['content'])
-                        
-                        tweet_data['hashtags'] = hashtags
-                        tweet_data['mentions'] = mentions
-                        tweet_data['urls'] = urls
-                        
-                        profile_data['content_analysis']['hashtags'].extend(hashtags)
-                        profile_data['content_analysis']['mentions'].extend(mentions)
-                        profile_data['content_analysis']['urls'].extend(urls)
-                        
-                        # Medya içeriği kontrolü
-                        media_elements = tweet.find_elements(By.CSS_SELECTOR, '[data-testid="tweetPhoto"], [data-testid="tweetVideo"]')
-                        tweet_data['has_media'] = len(media_elements) > 0
-                        profile_data['content_analysis']['media_count'] += len(media_elements)
-                        
-                        # Zaman analizi
-                        try:
-                            time_element = tweet.find_element(By.CSS_SELECTOR, 'time')
-                            tweet_time = time_element.get_attribute('datetime')
-                            tweet_datetime = datetime.fromisoformat(tweet_time.replace('Z', '+00:00'))
-                            
-                            hour = tweet_datetime.hour
-                            day = tweet_datetime.strftime('%A')
-                            
-                            profile_data['temporal_patterns']['posting_hours'][hour] = profile_data['temporal_patterns']['posting_hours'].get(hour, 0) + 1
-                            profile_data['temporal_patterns']['posting_days'][day] = profile_data['temporal_patterns']['posting_days'].get(day, 0) + 1
-                            
-                            tweet_data['timestamp'] = tweet_time
-                        except:
-                            pass
-                        
-                        profile_data['posts'].append(tweet_data)
-                        profile_data['engagement_metrics']['total_tweets'] += 1
-                        
+                        self._add_tweet(record, profile_data)
+                    except ScrapeCancelled:
+                        raise
                     except Exception as e:
                         continue
                 
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
+                # Yeni içerik gelmediyse ya da hedef sayıya ulaşıldıysa dur
+                if not grew or self._reached_target():
                     break
-                last_height = new_height
+                
+                # Yenilemede bu kaydırmada hiç yeni tweet yoksa zaman çizelgesinin eski kısmına gelinmiştir
+                if self.since is not None and records and self.post_count == collected_before:
+                    break
+                
+        except ScrapeCancelled:
+                
+            raise
                 
         except Exception as e:
             print(f"Twitter scraping error: {str(e)}")
             
         return profile_data
 
+    def _add_tweet(self, record, profile_data):
+        tweet_data = {'content': record['content']}
+        if record.get('permalink'):
+            tweet_data['permalink'] = record['permalink']
+        
+        # Etkileşim metrikleri
+        for metric_id, value in record.get('metrics', {}).items():
+            if 'like' in metric_id:
+                tweet_data['likes'] = int(value or 0)
+            elif 'retweet' in metric_id:
+                tweet_data['retweets'] = int(value or 0)
+            elif 'reply' in metric_id:
+                tweet_data['replies'] = int(value or 0)
+        
+        # Hashtag ve mention analizi
+        tweet_data['hashtags'] = re.findall(r'#\w+', tweet_data['content'])
+        tweet_data['mentions'] = re.findall(r'@\w+', tweet_data['content'])
+        tweet_data['urls'] = re.findall(r'https?://\S+', tweet_data['content'])
+        
+        # Medya içeriği kontrolü
+        media_count = record.get('media_count', 0)
+        tweet_data['has_media'] = media_count > 0
+        
+        # Zaman analizi
+        tweet_datetime = None
+        tweet_time = record.get('timestamp')
+        if tweet_time:
+            try:
+                tweet_datetime = datetime.fromisoformat(tweet_time.replace('Z', '+00:00'))
+                tweet_data['timestamp'] = tweet_time
+            except ValueError:
+                pass
+        
+        if self._is_old(tweet_datetime):
+            return
+        
+        # Toplamlar yalnızca tweet başarıyla ayrıştırıldıktan sonra güncellenir
+        engagement = profile_data['engagement_metrics']
+        engagement['total_likes'] += tweet_data.get('likes', 0)
+        engagement['total_retweets'] += tweet_data.get('retweets', 0)
+        engagement['total_replies'] += tweet_data.get('replies', 0)
+        engagement['total_tweets'] += 1
+        
+        content_analysis = profile_data['content_analysis']
+        content_analysis['hashtags'].extend(tweet_data['hashtags'])
+        content_analysis['mentions'].extend(tweet_data['mentions'])
+        content_analysis['urls'].extend(tweet_data['urls'])
+        content_analysis['media_count'] += media_count
+        
+        if tweet_datetime is not None:
+            hour = tweet_datetime.hour
+            day = tweet_datetime.strftime('%A')
+            
+            profile_data['temporal_patterns']['posting_hours'][hour] = profile_data['temporal_patterns']['posting_hours'].get(hour, 0) + 1
+            profile_data['temporal_patterns']['posting_days'][day] = profile_data['temporal_patterns']['posting_days'].get(day, 0) + 1
+        
+        self._append_post(profile_data, tweet_data)
+
     def _scrape_instagram(self):
-        profile_data = {
-            'posts': [],
-            'profile_info': {},
-            'engagement_metrics': {
-                'total_posts': 0,
-                'total_likes': 0,
-                'total_comments': 0
-            },
-            'content_analysis': {
-                'hashtags': [],
-                'mentions': [],
-                'media_types': {
-                    'image': 0,
-                    'video': 0,
-                    'carousel': 0
-                }
-            },
-            'temporal_patterns': {
-                'posting_hours': {},
-                'posting_days': {}
-            }
-        }
+        profile_data = new_profile_data('instagram')
 
         try:
             # Profil bilgilerini topla
@@ -201,56 +371,19 @@ class SocialMediaScraper:
             # Gönderileri topla
             posts = self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, '._aagv')))
             
-            for post in posts[:30]:  # İlk 30 gönderi
+            for post in posts[:self.max_posts or 30]:  # Varsayılan olarak ilk 30 gönderi
                 try:
                     post.click()
-                    time.sleep(1)
+                    self.waiter.wait_for_presence(INSTAGRAM_MODAL_SELECTOR)
                     
-                    post_data = {}
-                    
-                    # Gönderi içeriği
-                    try:
-                        content = self.driver.find_element(By.CSS_SELECTOR, '._a9zs').text
-                        post_data['content'] = content
-                        
-                        # Hashtag ve mention analizi
-                        hashtags = re.findall(r'#\w+', content)
-                        mentions = re.findall(r'@\w+', content)
-                        
-                        post_data['hashtags'] = hashtags
-                        post_data['mentions'] = mentions
-                        
-                        profile_data['content_analysis']['hashtags'].extend(hashtags)
-                        profile_data['content_analysis']['mentions'].extend(mentions)
-                    except:
-                        post_data['content'] = ''
-                    
-                    # Medya türü analizi
-                    try:
-                        if self.driver.find_elements(By.CSS_SELECTOR, '._aatk._aatl'):
-                            post_data['media_type'] = 'carousel'
-                            profile_data['content_analysis']['media_types']['carousel'] += 1
-                        elif self.driver.find_elements(By.CSS_SELECTOR, '._aagu'):
-                            post_data['media_type'] = 'video'
-                            profile_data['content_analysis']['media_types']['video'] += 1
-                        else:
-                            post_data['media_type'] = 'image'
-                            profile_data['content_analysis']['media_types']['image'] += 1
-                    except:
-                        pass
-                    
-                    # Etkileşim metrikleri
-                    try:
-                        likes = self.driver.find_element(By.CSS_SELECTOR, '._aacl._aaco._aacw._aacx._aada._aade').text
-                        likes = int(re.sub(r'[^\d]', '', likes))
-                        post_data['likes'] = likes
-                        profile_data['engagement_metrics']['total_likes'] += likes
-                    except:
-                        post_data['likes'] = 0
-                    
-                    profile_data['posts'].append(post_data)
-                    profile_data['engagement_metrics']['total_posts'] += 1
+                    if self.parse_mode == 'snapshot':
+                        record = parse_instagram_post(self.driver.page_source)
+                    else:
+                        record = self._read_instagram_modal()
+                    self._add_instagram_post(record, profile_data)
                     
+                except ScrapeCancelled:
+                    raise
                 except Exception as e:
                     continue
                 
@@ -258,35 +391,76 @@ class SocialMediaScraper:
                 try:
                     close_button = self.driver.find_element(By.CSS_SELECTOR, '._abl-')
                     close_button.click()
-                    time.sleep(0.5)
+                    self.waiter.wait_for_staleness(close_button)
                 except:
                     pass
                 
+        except ScrapeCancelled:
+                
+            raise
+                
         except Exception as e:
             print(f"Instagram scraping error: {str(e)}")
             
         return profile_data
 
+    def _read_instagram_modal(self):
+        record = {'content': None, 'media_type': 'image', 'likes': None}
+        
+        try:
+            record['content'] = self.driver.find_element(By.CSS_SELECTOR, '._a9zs').text
+        except:
+            pass
+        
+        if self.driver.find_elements(By.CSS_SELECTOR, '._aatk._aatl'):
+            record['media_type'] = 'carousel'
+        elif self.driver.find_elements(By.CSS_SELECTOR, '._aagu'):
+            record['media_type'] = 'video'
+        
+        try:
+            record['likes'] = self.driver.find_element(By.CSS_SELECTOR, '._aacl._aaco._aacw._aacx._aada._aade').text
+        except:
+            pass
+        
+        return record
+
+    def _add_instagram_post(self, record, profile_data):
+        post_data = {}
+        
+        # Gönderi içeriği
+        content = record.get('content')
+        if content is not None:
+            post_data['content'] = content
+            
+            # Hashtag ve mention analizi
+            hashtags = re.findall(r'#\w+', content)
+            mentions = re.findall(r'@\w+', content)
+            
+            post_data['hashtags'] = hashtags
+            post_data['mentions'] = mentions
+            
+            profile_data['content_analysis']['hashtags'].extend(hashtags)
+            profile_data['content_analysis']['mentions'].extend(mentions)
+        else:
+            post_data['content'] = ''
+        
+        # Medya türü analizi
+        post_data['media_type'] = record['media_type']
+        profile_data['content_analysis']['media_types'][record['media_type']] += 1
+        
+        # Etkileşim metrikleri
+        try:
+            likes = int(re.sub(r'[^\d]', '', record.get('likes') or ''))
+            post_data['likes'] = likes
+            profile_data['engagement_metrics']['total_likes'] += likes
+        except ValueError:
+            post_data['likes'] = 0
+        
+        self._append_post(profile_data, post_data)
+        profile_data['engagement_metrics']['total_posts'] += 1
+
     def _scrape_linkedin(self):
-        profile_data = {
-            'posts': [],
-            'profile_info': {},
-            'engagement_metrics': {
-                'total_posts': 0,
-                'total_reactions': 0,
-                'total_comments': 0
-            },
-            'content_analysis': {
-                'hashtags': [],
-                'mentions': [],
-                'media_count': 0,
-                'article_count': 0
-            },
-            'temporal_patterns': {
-                'posting_hours': {},
-                'posting_days': {}
-            }
-        }
+        profile_data = new_profile_data('linkedin')
 
         try:
             # Profil bilgilerini topla
@@ -300,68 +474,108 @@ class SocialMediaScraper:
                 pass
 
             # Gönderileri topla
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            post_count, last_height = self.waiter.page_state(LINKEDIN_POST_SELECTOR)
+            
+            seen_posts = set()
             
             for _ in range(5):  # 5 sayfa scroll
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+                post_count, last_height, grew = self.waiter.scroll_and_wait(LINKEDIN_POST_SELECTOR, post_count, last_height)
                 
-                posts = self.driver.find_elements(By.CSS_SELECTOR, '.feed-shared-update-v2')
+                if self.parse_mode == 'snapshot':
+                    records = parse_linkedin_posts(self.driver.page_source)
+                else:
+                    records = self._read_linkedin_posts()
                 
-                for post in posts:
+                for record in records:
+                    if self._reached_target():
+                        break
+                    
+                    # Her kaydırmada aynı gönderiler yeniden okunur, yalnızca yenileri ekle
+                    post_key = record.get('urn') or record.get('content')
+                    if post_key in seen_posts:
+                        continue
+                    seen_posts.add(post_key)
+                    
                     try:
-                        post_data = {}
-                        
-                        # Gönderi içeriği
-                        try:
-                            content = post.find_element(By.CSS_SELECTOR, '.feed-shared-text').text
-                            post_data['content'] = content
-                            
-                            # Hashtag ve mention analizi
-                            hashtags = re.findall(r'#\w+', content)
-                            mentions = re.findall(r'@\w+', content)
-                            
-                            post_data['hashtags'] = hashtags
-                            post_data['mentions'] = mentions
-                            
-                            profile_data['content_analysis']['hashtags'].extend(hashtags)
-                            profile_data['content_analysis']['mentions'].extend(mentions)
-                        except:
-                            post_data['content'] = ''
-                        
-                        # Medya içeriği kontrolü
-                        media_elements = post.find_elements(By.CSS_SELECTOR, '.feed-shared-image, .feed-shared-linkedin-video')
-                        post_data['has_media'] = len(media_elements) > 0
-                        profile_data['content_analysis']['media_count'] += len(media_elements)
-                        
-                        # Makale kontrolü
-                        if post.find_elements(By.CSS_SELECTOR, '.feed-shared-article'):
-                            post_data['has_article'] = True
-                            profile_data['content_analysis']['article_count'] += 1
-                        else:
-                            post_data['has_article'] = False
-                        
-                        # Etkileşim metrikleri
-                        try:
-                            reactions = post.find_element(By.CSS_SELECTOR, '.social-details-social-counts__reactions-count').text
-                            reactions = int(re.sub(r'[^\d]', '', reactions))
-                            post_data['reactions'] = reactions
-                            profile_data['engagement_metrics']['total_reactions'] += reactions
-                        except:
-                            post_data['reactions'] = 0
-                        
-                        profile_data['posts'].append(post_data)
-                        profile_data['engagement_metrics']['total_posts'] += 1
-                        
+                        self._add_linkedin_post(record, profile_data)
+                    except ScrapeCancelled:
+                        raise
                     except Exception as e:
                         continue
                 
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
+                # Yeni içerik gelmediyse ya da hedef sayıya ulaşıldıysa dur
+                if not grew or self._reached_target():
                     break
-                last_height = new_height
+                
+        except ScrapeCancelled:
+                
+            raise
                 
         except Exception as e:
             print(f"LinkedIn scraping error: {str(e)}")
             
-        return profile_data 
\ No newline at end of file
+        return profile_data
+
+    def _read_linkedin_posts(self):
+        records = []
+        for post in self.driver.find_elements(By.CSS_SELECTOR, LINKEDIN_POST_SELECTOR):
+            try:
+                record = {
+                    'urn': post.get_attribute('data-urn'),
+                    'content': None,
+                    'media_count': len(post.find_elements(By.CSS_SELECTOR, '.feed-shared-image, .feed-shared-linkedin-video')),
+                    'has_article': bool(post.find_elements(By.CSS_SELECTOR, '.feed-shared-article')),
+                    'reactions': None
+                }
+                try:
+                    record['content'] = post.find_element(By.CSS_SELECTOR, '.feed-shared-text').text
+                except:
+                    pass
+                try:
+                    record['reactions'] = post.find_element(By.CSS_SELECTOR, '.social-details-social-counts__reactions-count').text
+                except:
+                    pass
+                records.append(record)
+            except Exception as e:
+                continue
+        return records
+
+    def _add_linkedin_post(self, record, profile_data):
+        post_data = {}
+        
+        # Gönderi içeriği
+        content = record.get('content')
+        if content is not None:
+            post_data['content'] = content
+            
+            # Hashtag ve mention analizi
+            hashtags = re.findall(r'#\w+', content)
+            mentions = re.findall(r'@\w+', content)
+            
+            post_data['hashtags'] = hashtags
+            post_data['mentions'] = mentions
+            
+            profile_data['content_analysis']['hashtags'].extend(hashtags)
+            profile_data['content_analysis']['mentions'].extend(mentions)
+        else:
+            post_data['content'] = ''
+        
+        # Medya içeriği kontrolü
+        post_data['has_media'] = record['media_count'] > 0
+        profile_data['content_analysis']['media_count'] += record['media_count']
+        
+        # Makale kontrolü
+        post_data['has_article'] = record['has_article']
+        if record['has_article']:
+            profile_data['content_analysis']['article_count'] += 1
+        
+        # Etkileşim metrikleri
+        try:
+            reactions = int(re.sub(r'[^\d]', '', record.get('reactions') or ''))
+            post_data['reactions'] = reactions
+            profile_data['engagement_metrics']['total_reactions'] += reactions
+        except ValueError:
+            post_data['reactions'] = 0
+        
+        self._append_post(profile_data, post_data)
+        profile_data['engagement_metrics']['total_posts'] += 1
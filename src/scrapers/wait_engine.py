@@ -0,0 +1,119 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import time
+
+DOCUMENT_READY_JS = "return document.readyState"
+SCROLL_HEIGHT_JS = "return document.body.scrollHeight"
+RESOURCE_COUNT_JS = "return window.performance.getEntriesByType('resource').length"
+
+
+class AdaptiveWaiter:
+    # Sabit time.sleep yerine sayfadaki gerçek değişiklikleri bekler
+    def __init__(self, driver, page_timeout=10, scroll_timeout=5, modal_timeout=5,
+                 idle_time=0.5, poll_frequency=0.1):
+        self.driver = driver
+        self.page_timeout = page_timeout
+        self.scroll_timeout = scroll_timeout
+        self.modal_timeout = modal_timeout
+        self.idle_time = idle_time
+        self.poll_frequency = poll_frequency
+
+    def _until(self, condition, timeout):
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            return False
+
+    def wait_for_page(self):
+        ready = self._until(lambda d: d.execute_script(DOCUMENT_READY_JS) == 'complete', self.page_timeout)
+        return ready and self.wait_for_network_idle(self.page_timeout)
+
+    def wait_for_network_idle(self, timeout=None):
+        # Yüklenen kaynak sayısı idle_time boyunca değişmediğinde ağ boşta kabul edilir
+        state = {'count': -1, 'since': time.monotonic()}
+
+        def idle(driver):
+            count = driver.execute_script(RESOURCE_COUNT_JS)
+            now = time.monotonic()
+            if count != state['count']:
+                state['count'] = count
+                state['since'] = now
+                return False
+            return now - state['since'] >= self.idle_time
+
+        return self._until(idle, timeout or self.scroll_timeout)
+
+    def page_state(self, selector):
+        count = len(self.driver.find_elements(By.CSS_SELECTOR, selector))
+        return count, self.driver.execute_script(SCROLL_HEIGHT_JS)
+
+    def scroll_and_wait(self, selector, previous_count, previous_height):
+        # Kaydırmadan sonra yeni öğe gelene ya da sayfa uzayana kadar bekle
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+        def grew(driver):
+            count, height = self.page_state(selector)
+            if count > previous_count or height > previous_height:
+                return count, height
+            return False
+
+        result = self._until(grew, self.scroll_timeout)
+        if not result:
+            # Son bir kez ağın durulmasını bekleyip tekrar kontrol et
+            self.wait_for_network_idle()
+            result = grew(self.driver)
+        if not result:
+            return previous_count, previous_height, False
+        return result[0], result[1], True
+
+    def wait_for_presence(self, selector, timeout=None):
+        return self._until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)),
+                           timeout or self.modal_timeout)
+
+    def wait_for_staleness(self, element, timeout=None):
+        return self._until(EC.staleness_of(element), timeout or self.modal_timeout)
+
+
+class FixedDelayWaiter:
+    # Eski sabit beklemeleri taklit eder; karşılaştırmalı ölçümler için tutulur
+    def __init__(self, driver, page_delay=3, scroll_delay=2, modal_open_delay=1, modal_close_delay=0.5):
+        self.driver = driver
+        self.page_delay = page_delay
+        self.scroll_delay = scroll_delay
+        self.modal_open_delay = modal_open_delay
+        self.modal_close_delay = modal_close_delay
+
+    def wait_for_page(self):
+        time.sleep(self.page_delay)
+        return True
+
+    def wait_for_network_idle(self, timeout=None):
+        return True
+
+    def page_state(self, selector):
+        count = len(self.driver.find_elements(By.CSS_SELECTOR, selector))
+        return count, self.driver.execute_script(SCROLL_HEIGHT_JS)
+
+    def scroll_and_wait(self, selector, previous_count, previous_height):
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(self.scroll_delay)
+        count, height = self.page_state(selector)
+        return count, height, height != previous_height
+
+    def wait_for_presence(self, selector, timeout=None):
+        time.sleep(self.modal_open_delay)
+        return True
+
+    def wait_for_staleness(self, element, timeout=None):
+        time.sleep(self.modal_close_delay)
+        return True
+
+
+def create_waiter(driver, mode='adaptive', **kwargs):
+    if mode == 'fixed':
+        return FixedDelayWaiter(driver)
+    if mode == 'adaptive':
+        return AdaptiveWaiter(driver, **kwargs)
+    raise ValueError(f'Bilinmeyen bekleme modu: {mode}')
@@ -4,6 +4,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const chatMessages = document.getElementById('chat-messages');
     const cloneInteraction = document.getElementById('clone-interaction');
     const creationStatus = document.getElementById('creation-status');
+    let cloneId = null;
 
     // Klon oluşturma formu gönderildiğinde
     profileForm.addEventListener('submit', async (e) => {
@@ -24,13 +25,15 @@ document.addEventListener('DOMContentLoaded', () => {
             
             const data = await response.json();
             
-            if (response.ok) {
-                creationStatus.textContent = data.message;
-                creationStatus.className = 'status-message success';
-                cloneInteraction.classList.remove('hidden');
-            } else {
+            if (!response.ok) {
                 throw new Error(data.error || 'Bir hata oluştu');
             }
+
+            const job = await waitForJob(data.status_url);
+            cloneId = job.result.clone_id;
+            creationStatus.textContent = 'Dijital klon başarıyla oluşturuldu';
+            creationStatus.className = 'status-message success';
+            cloneInteraction.classList.remove('hidden');
         } catch (error) {
             creationStatus.textContent = error.message;
             creationStatus.className = 'status-message error';
@@ -48,27 +51,103 @@ document.addEventListener('DOMContentLoaded', () => {
         addMessage(question, 'user-message');
         questionInput.value = '';
         
+        // Yanıt tokenler geldikçe aynı mesaj kutusuna yazılır
+        const messageDiv = addMessage('', 'clone-message');
+        
         try {
-            const response = await fetch('/ask_clone', {
+            const response = await fetch('/ask_clone/stream', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/x-www-form-urlencoded',
                 },
-                body: `question=${encodeURIComponent(question)}`
+                body: `question=${encodeURIComponent(question)}&clone_id=${encodeURIComponent(cloneId)}`
             });
             
-            const data = await response.json();
-            
-            if (response.ok) {
-                addMessage(data.response, 'clone-message');
-            } else {
+            if (!response.ok) {
+                const data = await response.json();
                 throw new Error(data.error || 'Bir hata oluştu');
             }
+            
+            await readEvents(response, (event, data) => {
+                if (event === 'token') {
+                    messageDiv.textContent += data.text;
+                } else if (event === 'final') {
+                    // Kişiselleştirilmiş tam yanıt akan metnin yerine geçer
+                    messageDiv.textContent = data.text;
+                }
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            });
         } catch (error) {
-            addMessage('Üzgünüm, bir hata oluştu: ' + error.message, 'clone-message error');
+            messageDiv.textContent = 'Üzgünüm, bir hata oluştu: ' + error.message;
+            messageDiv.className = 'message clone-message error';
         }
     });
 
+    // Server-Sent Events akışını okuyup her olayı onEvent(olay, veri) ile bildirir
+    async function readEvents(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const block = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                
+                let event = 'message';
+                let data = '';
+                for (const line of block.split('\n')) {
+                    if (line.startsWith('event: ')) {
+                        event = line.slice(7);
+                    } else if (line.startsWith('data: ')) {
+                        data += line.slice(6);
+                    }
+                }
+                onEvent(event, JSON.parse(data));
+            }
+        }
+    }
+
+    // Arka plan işinin durumunu tamamlanana kadar sorgula
+    const stageLabels = {
+        queued: 'Sırada bekliyor',
+        scrape: 'Profil verileri toplanıyor',
+        process: 'Metinler işleniyor',
+        train: 'Klon eğitiliyor',
+        save: 'Klon kaydediliyor'
+    };
+
+    async function waitForJob(statusUrl) {
+        while (true) {
+            const response = await fetch(statusUrl);
+            const job = await response.json();
+
+            if (!response.ok) {
+                throw new Error(job.error || 'Bir hata oluştu');
+            }
+            if (job.status === 'succeeded') {
+                return job;
+            }
+            if (job.status === 'failed') {
+                throw new Error(job.error || 'Klon oluşturulamadı');
+            }
+            if (job.status === 'cancelled') {
+                throw new Error('Klon oluşturma iptal edildi');
+            }
+
+            const label = stageLabels[job.stage] || 'Klon oluşturuluyor';
+            creationStatus.textContent = `${label}... %${Math.round(job.progress * 100)}`;
+            await new Promise(resolve => setTimeout(resolve, 1000));
+        }
+    }
+
     // Mesaj ekleme fonksiyonu
     function addMessage(text, className) {
         const messageDiv = document.createElement('div');
@@ -77,5 +156,6 @@ document.addEventListener('DOMContentLoaded', () => {
         
         chatMessages.appendChild(messageDiv);
         chatMessages.scrollTop = chatMessages.scrollHeight;
+        return messageDiv;
     }
 }); 
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modüller src altından 'models.x', 'utils.x' biçiminde içe aktarılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
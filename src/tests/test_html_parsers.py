@@ -0,0 +1,13 @@
+import pytest
+
+from benchmarks.html_parser_parity import fixture_platform, load_fixtures, snapshot_profile, snapshot_records
+
+FIXTURES = load_fixtures()
+
+
+@pytest.mark.parametrize('name, html, expected', FIXTURES, ids=[name for name, _, _ in FIXTURES])
+def test_snapshot_parsers_match_expected(name, html, expected):
+    # Kayıtlı sayfalarda lxml ayrıştırıcıları, canlı (WebDriver) okumanın ürettiği kayıtları vermelidir
+    platform = fixture_platform(name)
+    assert snapshot_records(platform, html) == expected['records']
+    assert snapshot_profile(platform, html) == expected.get('profile_info')
@@ -0,0 +1,29 @@
+import pytest
+
+from utils.sentiment import label_polarities
+
+
+def test_named_labels():
+    id2label = {0: 'NEGATIVE', 1: 'NEUTRAL', 2: 'POSITIVE'}
+    assert label_polarities(id2label) == {'NEGATIVE': 'neg', 'NEUTRAL': 'neu', 'POSITIVE': 'pos'}
+
+
+def test_star_ratings():
+    id2label = {i: f"{i + 1} star{'s' if i else ''}" for i in range(5)}
+    assert list(label_polarities(id2label).values()) == ['neg', 'neg', 'neu', 'pos', 'pos']
+
+
+@pytest.mark.parametrize('count, expected', [(2, ['neg', 'pos']), (3, ['neg', 'neu', 'pos'])])
+def test_generic_labels(count, expected):
+    id2label = {str(i): f'LABEL_{i}' for i in range(count)}
+    assert list(label_polarities(id2label).values()) == expected
+
+
+@pytest.mark.parametrize('id2label', [
+    {0: 'LABEL_0', 1: 'LABEL_1', 2: 'LABEL_2', 3: 'LABEL_3'},
+    {0: 'joy', 1: 'anger'},
+    {0: 'negative', 1: 'mixed', 2: 'positive'}
+])
+def test_unknown_labels_raise(id2label):
+    with pytest.raises(ValueError):
+        label_polarities(id2label)
@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+from benchmarks.sketch_benchmark import synthetic_posts
+from utils.sketches import HLL_PRECISION, HyperLogLog, hash_items
+from utils.text_processor import PostAggregate, SketchPostAggregate
+
+POSTS = 5000
+VOCABULARY = 200000
+# HyperLogLog standart hatası 1.04 / sqrt(2 ** p); sınır bunun üç katı
+HLL_TOLERANCE = 3 * 1.04 / math.sqrt(2 ** HLL_PRECISION)
+
+
+@pytest.fixture(scope='module')
+def aggregates():
+    # Aynı gönderiler hem kesin sayaçlarla hem de taslaklarla toplanır
+    posts = list(synthetic_posts(POSTS, VOCABULARY, seed=POSTS))
+    exact = PostAggregate()
+    sketch = SketchPostAggregate()
+    for post in posts:
+        exact.add_post(post)
+        sketch.add_post(post)
+
+    analyses = []
+    for aggregate in (exact, sketch):
+        analysis = {'sentiment_stats': {}, 'content_stats': {}}
+        aggregate.fill_analysis(analysis, aggregate.post_count)
+        analyses.append(analysis)
+    return exact, sketch, analyses[0], analyses[1]
+
+
+def test_top_hashtags_and_mentions_match_exact(aggregates):
+    _, _, exact, sketch = aggregates
+    assert sketch['top_hashtags'] == exact['top_hashtags']
+    assert sketch['top_mentions'] == exact['top_mentions']
+
+
+def test_count_min_error_is_bounded(aggregates):
+    exact, sketch, exact_analysis, _ = aggregates
+    words = [word for word, _ in exact_analysis['top_words']]
+    estimates = sketch.word_counts.estimate(words)
+
+    bound = sketch.word_counts.epsilon * exact.word_total
+    for word, estimate in zip(words, estimates):
+        count = exact.word_counts[word]
+        # Count-Min yalnızca fazla tahmin eder, fark en fazla epsilon * toplamdır
+        assert count <= estimate <= count + bound
+        assert (estimate - count) / count <= 0.05
+
+
+def test_top_word_counts_are_close(aggregates):
+    exact, _, _, sketch_analysis = aggregates
+    for word, count in sketch_analysis['top_words']:
+        assert abs(count - exact.word_counts[word]) / exact.word_counts[word] <= 0.05
+
+
+def test_vocabulary_estimate_is_close(aggregates):
+    _, _, exact, sketch = aggregates
+    richness = exact['content_stats']['vocabulary_richness']
+    estimate = sketch['content_stats']['vocabulary_richness']
+    assert abs(estimate - richness) / richness <= HLL_TOLERANCE
+
+
+@pytest.mark.parametrize('distinct', [100, 10000, 200000])
+def test_hyperloglog_relative_error(distinct):
+    hll = HyperLogLog()
+    hll.add_hashes(hash_items([f'w{i}' for i in range(distinct)]))
+    assert abs(hll.count() - distinct) / distinct <= HLL_TOLERANCE
@@ -0,0 +1,76 @@
+import pytest
+
+import config
+from benchmarks.text_cleaning_benchmark import EDGE_CASES, fused_tokenize, legacy_tokenize
+from utils.text_processor import TextProcessor
+
+SENTENCES = [
+    'Bugün harika bir gün, kahvemi içip yürüyüşe çıktım!',
+    'Yeni projemiz hakkında çok heyecanlıyım. Detaylar yakında #proje @ekip',
+    'Trafik yine berbat... Neden her sabah aynı şey?',
+    'Great talk at the conference today, thanks @ali for the slides #ai #ml',
+    'Kitap önerisi: Tutunamayanlar. Okumayan kalmasın https://ornek.com/kitap',
+    'Hafta sonu planı yok 😂 öneri bekliyorum',
+    'I really hate waiting in line, this is terrible service.',
+    'Toplantı 15:00\'te, lütfen geç kalmayın. Gündem: bütçe, ekip, takvim',
+]
+
+
+def fixed_profile(post_count=80):
+    # Sabit gönderi seti: örnek cümleler, veri toplayıcı listeleri olan ve olmayan gönderiler ve uç durumlar
+    posts = []
+    for i in range(post_count):
+        content = f"{SENTENCES[i % len(SENTENCES)]} {SENTENCES[(i * 3 + 1) % len(SENTENCES)]}"
+        post = {'content': content, 'likes': i * 7 % 50}
+        if i % 2:
+            post['hashtags'] = [word for word in content.split() if word.startswith('#')]
+            post['mentions'] = [word for word in content.split() if word.startswith('@')]
+        posts.append(post)
+    posts.extend({'content': text} for text in EDGE_CASES)
+    return {
+        'posts': posts,
+        'profile_info': {'name': 'Sabit', 'bio': 'Test profili'},
+        'engagement_metrics': {'total_likes': sum(post.get('likes', 0) for post in posts)},
+        'temporal_patterns': {'posting_hours': {9: 3}, 'posting_days': {'Monday': 3}}
+    }
+
+
+def _as_dicts(processed_data):
+    return dict(processed_data, posts=[post if isinstance(post, dict) else post.to_dict()
+                                       for post in processed_data['posts']])
+
+
+@pytest.fixture(scope='module')
+def serial_output():
+    return TextProcessor(workers=1, compact=False).process(fixed_profile())
+
+
+def test_parallel_matches_serial(serial_output, monkeypatch):
+    monkeypatch.setattr(config, 'TEXT_PARALLEL_MIN_POSTS', 1)
+    processor = TextProcessor(workers=2, chunk_size=7, compact=False)
+    assert processor.process(fixed_profile()) == serial_output
+
+
+def test_compact_matches_serial(serial_output):
+    processed_data = TextProcessor(workers=1, compact=True).process(fixed_profile())
+    assert _as_dicts(processed_data) == serial_output
+
+
+def test_parallel_compact_matches_serial(serial_output, monkeypatch):
+    monkeypatch.setattr(config, 'TEXT_PARALLEL_MIN_POSTS', 1)
+    processor = TextProcessor(workers=2, chunk_size=7, compact=True)
+    assert _as_dicts(processor.process(fixed_profile())) == serial_output
+
+
+def test_stream_matches_serial(serial_output):
+    profile_data = fixed_profile()
+    stream = TextProcessor(workers=1, compact=False).process_stream(profile_data['posts'])
+    posts = list(stream)
+    assert posts == serial_output['posts']
+    assert dict(stream.result(profile_data), posts=posts) == serial_output
+
+
+@pytest.mark.parametrize('content', sorted({post['content'] for post in fixed_profile()['posts']}))
+def test_fused_tokenizer_matches_legacy(content):
+    # Birleşik temizleme/tokenization, eski dört re.sub + iki tokenizer + iki findall yolu ile aynıdır
+    assert fused_tokenize(TextProcessor(workers=1), {'content': content}) == legacy_tokenize(content)
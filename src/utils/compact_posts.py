@@ -0,0 +1,131 @@
+from collections.abc import Mapping
+from collections import Counter
+from array import array
+import sys
+
+SENTIMENT_KEYS = ('neg', 'neu', 'pos', 'compound')
+
+# CompactPost'un kendisi tarafından üretilen anahtarlar; geri kalanlar orijinal gönderiden okunur
+CORE_KEYS = ('original_text', 'cleaned_text', 'tokens', 'filtered_tokens', 'sentences', 'sentiment',
+             'word_frequency', 'hashtags', 'mentions', 'bigrams')
+
+
+class Vocabulary:
+    # Bir profilin gönderileri arasında paylaşılan token sözlüğü; stop word bilgisi id başına bir bayt tutulur
+    def __init__(self, stop_words=frozenset()):
+        self.stop_words = stop_words
+        self.token_to_id = {}
+        self.tokens = []
+        self.is_stop = bytearray()
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def intern(self, token):
+        token_id = self.token_to_id.get(token)
+        if token_id is None:
+            token = sys.intern(token)
+            token_id = len(self.tokens)
+            self.token_to_id[token] = token_id
+            self.tokens.append(token)
+            self.is_stop.append(token in self.stop_words)
+        return token_id
+
+    def encode(self, tokens):
+        return array('I', [self.intern(token) for token in tokens])
+
+    def decode(self, token_ids):
+        tokens = self.tokens
+        return [tokens[token_id] for token_id in token_ids]
+
+    def content_tokens(self, token_ids):
+        tokens = self.tokens
+        is_stop = self.is_stop
+        return [tokens[token_id] for token_id in token_ids if not is_stop[token_id]]
+
+
+def _sentence_offsets(cleaned_text, sentences):
+    # Cümleler temizlenmiş metnin parçaları olduğundan yalnızca başlangıç/bitiş konumları saklanır
+    offsets = array('I')
+    cursor = 0
+    for sentence in sentences:
+        start = cleaned_text.find(sentence, cursor)
+        if start < 0:
+            return None
+        cursor = start + len(sentence)
+        offsets.append(start)
+        offsets.append(cursor)
+    return offsets
+
+
+class CompactPost(Mapping):
+    # İşlenmiş gönderinin sıkıştırılmış hali: tokenler id dizisi, cümleler konum dizisi olarak tutulur.
+    # Frekans, bigram ve stop word'süz tokenler istendiğinde yeniden hesaplanır; sözlük arayüzü korunur.
+    __slots__ = ('vocabulary', 'source', 'cleaned_text', 'token_ids', 'sentence_offsets', '_sentences',
+                 'sentiment_scores', 'hashtags', 'mentions')
+
+    def __init__(self, vocabulary, processed_post, source):
+        self.vocabulary = vocabulary
+        self.source = source
+        self.cleaned_text = processed_post['cleaned_text']
+        self.token_ids = vocabulary.encode(processed_post['tokens'])
+
+        sentences = processed_post['sentences']
+        self.sentence_offsets = _sentence_offsets(self.cleaned_text, sentences)
+        self._sentences = None if self.sentence_offsets is not None else sentences
+
+        sentiment = processed_post['sentiment']
+        self.sentiment_scores = array('d', [sentiment[key] for key in SENTIMENT_KEYS])
+        self.hashtags = processed_post['hashtags']
+        self.mentions = processed_post['mentions']
+
+    @property
+    def original_text(self):
+        return self.source.get('content', '')
+
+    @property
+    def tokens(self):
+        return self.vocabulary.decode(self.token_ids)
+
+    @property
+    def filtered_tokens(self):
+        return self.vocabulary.content_tokens(self.token_ids)
+
+    @property
+    def sentences(self):
+        if self._sentences is not None:
+            return list(self._sentences)
+        offsets = self.sentence_offsets
+        text = self.cleaned_text
+        return [text[offsets[i]:offsets[i + 1]] for i in range(0, len(offsets), 2)]
+
+    @property
+    def sentiment(self):
+        return dict(zip(SENTIMENT_KEYS, self.sentiment_scores))
+
+    @property
+    def word_frequency(self):
+        return dict(Counter(self.filtered_tokens))
+
+    @property
+    def bigrams(self):
+        filtered_tokens = self.filtered_tokens
+        return list(zip(filtered_tokens, filtered_tokens[1:]))
+
+    def __getitem__(self, key):
+        if key in CORE_KEYS:
+            return getattr(self, key)
+        return self.source[key]
+
+    def __iter__(self):
+        yield from CORE_KEYS
+        for key in self.source:
+            if key not in CORE_KEYS:
+                yield key
+
+    def __len__(self):
+        return len(CORE_KEYS) + sum(1 for key in self.source if key not in CORE_KEYS)
+
+    def to_dict(self):
+        # Eski sözlük biçimini bekleyen kod için tam kopya
+        return {key: self[key] for key in self}
@@ -0,0 +1,19 @@
+import tempfile
+import os
+
+
+def atomic_write_bytes(path, payload):
+    # Önce aynı dizinde geçici dosyaya yaz, sonra tek adımda yer değiştir
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
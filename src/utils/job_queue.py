@@ -0,0 +1,174 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import threading
+import time
+import uuid
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind, params):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = 'queued'
+        self.stage = 'queued'
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def cancel_event(self):
+        return self._cancel_event
+
+    @property
+    def finished(self):
+        return self.status in ('succeeded', 'failed', 'cancelled')
+
+    def request_cancel(self):
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def update(self, stage=None, progress=None):
+        # Aşama geçişleri aynı zamanda iptal kontrol noktasıdır
+        self.check_cancelled()
+        if stage is not None:
+            self.stage = stage
+        if progress is not None:
+            self.progress = max(0.0, min(1.0, progress))
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': round(self.progress, 3),
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class JobQueue:
+    def __init__(self, max_workers=2, max_pending=100, retention_seconds=3600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='clone-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+
+    def submit(self, fn, kind='job', **params):
+        job = Job(kind, params)
+        with self._lock:
+            self._prune()
+            pending = sum(1 for j in self._jobs.values() if not j.finished)
+            if pending >= self.max_pending:
+                raise JobQueueFull('İş kuyruğu dolu, lütfen daha sonra tekrar deneyin')
+            self._jobs[job.job_id] = job
+        job.future = self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def find_active(self, kind, **params):
+        # Aynı parametrelerle bekleyen ya da çalışan iş varsa onu döndür
+        with self._lock:
+            for job in self._jobs.values():
+                if (not job.finished and job.kind == kind and
+                        all(job.params.get(key) == value for key, value in params.items())):
+                    return job
+        return None
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+
+        job.request_cancel()
+        # Henüz başlamamış işler doğrudan kuyruktan çıkarılır
+        if job.future is not None and job.future.cancel():
+            self._finish(job, 'cancelled')
+        return True
+
+    def _run(self, job, fn):
+        if job.cancelled:
+            self._finish(job, 'cancelled')
+            return
+
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            job.result = fn(job=job, **job.params)
+            job.progress = 1.0
+            self._finish(job, 'succeeded')
+        except JobCancelled:
+            self._finish(job, 'cancelled')
+        except Exception as e:
+            print(f"Job {job.job_id} error: {str(e)}")
+            job.error = str(e)
+            self._finish(job, 'failed')
+
+    def _finish(self, job, status):
+        with self._lock:
+            if job.finished:
+                return
+            job.status = status
+            job.stage = 'done' if status == 'succeeded' else job.stage
+            job.finished_at = time.time()
+            if status == 'succeeded':
+                self._completed += 1
+            elif status == 'failed':
+                self._failed += 1
+            else:
+                self._cancelled += 1
+
+    def _prune(self):
+        # Saklama süresi dolan tamamlanmış işleri unut
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def metrics(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                'max_workers': self.max_workers,
+                'queued': statuses.count('queued'),
+                'running': statuses.count('running'),
+                'completed': self._completed,
+                'failed': self._failed,
+                'cancelled': self._cancelled
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
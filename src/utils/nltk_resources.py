@@ -0,0 +1,96 @@
+from nltk.corpus import stopwords
+from nltk.sentiment import SentimentIntensityAnalyzer
+from collections import namedtuple
+import threading
+import argparse
+import time
+import nltk
+import os
+
+import config
+
+# Paket adı -> kabul edilen yerel yollar (NLTK sürümüne göre punkt biçimi değişir)
+REQUIRED_RESOURCES = {
+    'punkt': ('tokenizers/punkt', 'tokenizers/punkt_tab'),
+    'stopwords': ('corpora/stopwords',),
+    'vader_lexicon': ('sentiment/vader_lexicon.zip', 'sentiment/vader_lexicon'),
+}
+
+NLTKResources = namedtuple('NLTKResources', ['stop_words', 'sia', 'load_seconds'])
+
+
+class NLTKResourceError(RuntimeError):
+    pass
+
+
+def _configure_data_path():
+    if os.path.isdir(config.NLTK_DATA_DIR) and config.NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, config.NLTK_DATA_DIR)
+
+
+def _is_available(paths):
+    for path in paths:
+        try:
+            nltk.data.find(path)
+            return True
+        except LookupError:
+            continue
+    return False
+
+
+def missing_resources():
+    _configure_data_path()
+    return [name for name, paths in REQUIRED_RESOURCES.items() if not _is_available(paths)]
+
+
+def download_resources(target_dir=config.NLTK_DATA_DIR):
+    # Yalnızca kurulum sırasında çalıştırılır; uygulama çalışırken ağa çıkılmaz
+    os.makedirs(target_dir, exist_ok=True)
+    for name in REQUIRED_RESOURCES:
+        nltk.download(name, download_dir=target_dir)
+
+
+def _load_resources():
+    missing = missing_resources()
+    if missing:
+        raise NLTKResourceError(
+            f"Eksik NLTK verileri: {', '.join(missing)}. "
+            f"Aranan dizinler: {', '.join(nltk.data.path)}. "
+            f"Kurmak için: cd src && python -m utils.nltk_resources --download"
+        )
+
+    start = time.perf_counter()
+    stop_words = frozenset(stopwords.words('turkish'))
+    sia = SentimentIntensityAnalyzer()
+    return NLTKResources(stop_words, sia, time.perf_counter() - start)
+
+
+_resources = None
+_resources_lock = threading.Lock()
+
+
+def get_nltk_resources():
+    # Stop words ve VADER sözlüğü süreç başına bir kez yüklenip paylaşılır
+    global _resources
+    if _resources is None:
+        with _resources_lock:
+            if _resources is None:
+                _resources = _load_resources()
+    return _resources
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='NLTK verilerini doğrular ya da yerel dizine indirir')
+    parser.add_argument('--download', action='store_true', help=f'Eksik verileri {config.NLTK_DATA_DIR} dizinine indir')
+    args = parser.parse_args()
+
+    if args.download:
+        download_resources()
+
+    missing = missing_resources()
+    if missing:
+        print(f"Eksik NLTK verileri: {', '.join(missing)}")
+        raise SystemExit(1)
+
+    resources = get_nltk_resources()
+    print(f"NLTK verileri hazır ({resources.load_seconds:.3f} s)")
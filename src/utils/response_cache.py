@@ -0,0 +1,187 @@
+from collections import OrderedDict
+import threading
+import sqlite3
+import json
+import time
+import re
+
+import config
+
+_TRAILING_PUNCTUATION = re.compile(r'[\s?!.…]+$')
+
+
+def normalize_question(question):
+    # Büyük/küçük harf, fazla boşluk ve sondaki noktalama farkları aynı soru sayılır
+    question = ' '.join(question.casefold().split())
+    return _TRAILING_PUNCTUATION.sub('', question)
+
+
+def cache_key(clone_id, revision, question, params=None):
+    # Aynı klonun farklı revizyonları ya da farklı üretim ayarları ayrı anahtarlar alır
+    return json.dumps([clone_id, revision, normalize_question(question), params or {}],
+                      ensure_ascii=False, sort_keys=True, default=str)
+
+
+class ResponseCache:
+    # Üretilen yanıtlar için LRU + TTL önbellek; hem girdi sayısı hem bayt bütçesiyle sınırlıdır.
+    # sqlite_path verilirse girdiler aynı makinedeki diğer süreçlerle bir SQLite dosyası üzerinden paylaşılır.
+    def __init__(self, max_entries=1024, max_bytes=16 * 1024 * 1024, ttl_seconds=3600, sqlite_path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+
+        # key -> (clone_id, yanıt, son geçerlilik zamanı, bayt)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+        self._db = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, timeout=5, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS responses ('
+                             'key TEXT PRIMARY KEY, clone_id TEXT, response TEXT, '
+                             'expires_at REAL, accessed_at REAL, nbytes INTEGER)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_clone_id ON responses (clone_id)')
+
+    def get(self, clone_id, revision, question, params=None):
+        key = cache_key(clone_id, revision, question, params)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[1]
+                self._remove(key)
+                self._expirations += 1
+
+            response = self._shared_get(key, now)
+            if response is None:
+                self._misses += 1
+                return None
+            self._shared_hits += 1
+            self._store(key, clone_id, response, now)
+            return response
+
+    def put(self, clone_id, revision, question, response, params=None):
+        key = cache_key(clone_id, revision, question, params)
+        now = time.time()
+        with self._lock:
+            nbytes = self._store(key, clone_id, response, now)
+            if self._db is not None and nbytes is not None:
+                self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                                 (key, clone_id, response, now + self.ttl_seconds, now, nbytes))
+                self._shared_prune(now)
+
+    def invalidate(self, clone_id):
+        # Klon yeniden eğitildiğinde ya da güncellendiğinde tüm yanıtları geçersiz olur
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry[0] == clone_id]
+            for key in keys:
+                self._remove(key)
+            self._invalidations += len(keys)
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses WHERE clone_id = ?', (clone_id,))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+
+    def _store(self, key, clone_id, response, now):
+        nbytes = len(key.encode('utf-8')) + len(response.encode('utf-8'))
+        if nbytes > self.max_bytes:
+            return None
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (clone_id, response, now + self.ttl_seconds, nbytes)
+        self._bytes += nbytes
+
+        # En uzun süre kullanılmayan yanıtlardan başlayarak sınırlar içine dön
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            evicted_key = next(iter(self._entries))
+            self._remove(evicted_key)
+            self._evictions += 1
+        return nbytes
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[3]
+
+    def _shared_get(self, key, now):
+        if self._db is None:
+            return None
+        row = self._db.execute('SELECT response, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._expirations += 1
+            return None
+        self._db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        return row[0]
+
+    def _shared_prune(self, now):
+        # Paylaşılan dosya da aynı bayt bütçesine uyar: önce süresi dolanlar, sonra en eski erişilenler silinir
+        self._db.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        total = self._db.execute('SELECT COALESCE(SUM(nbytes), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute('SELECT key, nbytes FROM responses ORDER BY accessed_at').fetchall()
+        stale = []
+        for key, nbytes in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= nbytes
+        self._db.executemany('DELETE FROM responses WHERE key = ?', stale)
+
+    def metrics(self):
+        with self._lock:
+            lookups = self._hits + self._shared_hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'shared': self.sqlite_path,
+                'hits': self._hits,
+                'shared_hits': self._shared_hits,
+                'misses': self._misses,
+                'hit_rate': (self._hits + self._shared_hits) / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'invalidations': self._invalidations
+            }
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    # Süreç başına tek bir yanıt önbelleği tüm klonlar tarafından paylaşılır
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    max_entries=config.RESPONSE_CACHE_SIZE,
+                    max_bytes=config.RESPONSE_CACHE_MB * 1024 * 1024,
+                    ttl_seconds=config.RESPONSE_CACHE_TTL,
+                    sqlite_path=config.RESPONSE_CACHE_DB or None
+                )
+    return _response_cache
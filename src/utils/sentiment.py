@@ -0,0 +1,300 @@
+from collections import OrderedDict
+import threading
+import hashlib
+import string
+import numpy as np
+
+import config
+from utils.nltk_resources import get_nltk_resources
+
+SENTIMENT_BACKENDS = ('vader', 'lexicon', 'transformer')
+NEUTRAL_SCORES = {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0}
+
+# Önceki 1-3 kelimedeki artırıcı/azaltıcı etkisinin uzaklığa göre sönümü (VADER ile aynı)
+_BOOSTER_DECAY = (1.0, 0.95, 0.9)
+
+
+def text_key(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+
+class LexiconScorer:
+    # VADER sözlüğü ve kurallarıyla sütunlu puanlama: tüm metinlerin tokenleri tek bir dizide toplanır,
+    # sözlük değeri, artırıcı, olumsuzlama ve 'but' kuralları kaydırılmış dizilerle tek seferde uygulanır.
+    # Deyim, 'least' ve büyük harf vurgusu kuralları uygulanmaz; sonuçlar VADER'e yakındır, birebir değildir.
+    def __init__(self, sia):
+        constants = sia.constants
+        self.n_scalar = constants.N_SCALAR
+        self.punctuation = frozenset(constants.PUNC_LIST)
+        self.punctuation_pattern = constants.REGEX_REMOVE_PUNCTUATION
+
+        # Kural taşıyan her kelimeye bir kimlik verilir; 0 kimliği sıradan kelimelerindir
+        words = sorted(set(sia.lexicon) | set(constants.BOOSTER_DICT) | set(constants.NEGATE) | {'but'})
+        self.index = {word: i + 1 for i, word in enumerate(words)}
+        self.negation_id = len(words) + 1
+        size = len(words) + 2
+
+        self.valence = np.zeros(size)
+        self.in_lexicon = np.zeros(size, dtype=bool)
+        self.booster = np.zeros(size)
+        self.negation = np.zeros(size, dtype=bool)
+        for word, i in self.index.items():
+            if word in sia.lexicon:
+                self.in_lexicon[i] = True
+                # Artırıcı kelimeler sözlükte olsa da kendi başına duygu taşımaz
+                if word not in constants.BOOSTER_DICT:
+                    self.valence[i] = sia.lexicon[word]
+            self.booster[i] = constants.BOOSTER_DICT.get(word, 0.0)
+            self.negation[i] = word in constants.NEGATE
+        self.negation[self.negation_id] = True
+        self.but_id = self.index['but']
+
+    def _strip_punctuation(self, token):
+        # VADER gibi: başta ya da sonda PUNC_LIST'ten tek bir öğe varsa ve kalan kısım noktalamasız bir kelimeyse atılır
+        lead = len(token) - len(token.lstrip(string.punctuation))
+        if lead:
+            word = token[lead:]
+            if token[:lead] in self.punctuation and len(word) > 1 and not self.punctuation_pattern.search(word):
+                return word
+        trail = len(token) - len(token.rstrip(string.punctuation))
+        if trail:
+            word = token[:-trail]
+            if token[-trail:] in self.punctuation and len(word) > 1 and not self.punctuation_pattern.search(word):
+                return word
+        return token
+
+    def _token_ids(self, text):
+        ids = []
+        for token in text.lower().split():
+            if len(token) <= 1:
+                continue
+            if token[0] in string.punctuation or token[-1] in string.punctuation:
+                token = self._strip_punctuation(token)
+            ids.append(self.index.get(token, self.negation_id if "n't" in token else 0))
+        return ids
+
+    def score(self, texts):
+        token_ids = [self._token_ids(text) for text in texts]
+        lengths = np.fromiter(map(len, token_ids), dtype=np.int64, count=len(texts))
+        ids = np.fromiter((i for row in token_ids for i in row), dtype=np.int64, count=int(lengths.sum()))
+        text_of = np.repeat(np.arange(len(texts)), lengths)
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+        position = np.arange(len(ids)) - np.repeat(starts, lengths)
+
+        valence = self.valence[ids].copy()
+        scored = np.flatnonzero(valence)
+        if len(scored):
+            # VADER tekrarlanan kelimenin bağlamını ilk geçtiği yerden okur; aynısı yapılır
+            keys = text_of[scored] * len(self.valence) + ids[scored]
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            anchor = scored[first][inverse.ravel()]
+            values = valence[scored]
+            for distance in range(1, 4):
+                # Önceki kelime sözlükte değilse artırıcı etkisi eklenir, olumsuzlamaysa değer ters çevrilir
+                has_previous = position[anchor] >= distance
+                previous = np.where(has_previous, ids[np.maximum(anchor - distance, 0)], 0)
+                applies = has_previous & ~self.in_lexicon[previous]
+                values = values + np.where(applies, self.booster[previous] * np.sign(values) *
+                                           _BOOSTER_DECAY[distance - 1], 0.0)
+                values = np.where(applies & self.negation[previous], values * self.n_scalar, values)
+            valence[scored] = values
+
+        # İlk 'but' öncesi yarıya iner, sonrası 1.5 katına çıkar
+        no_but = np.iinfo(np.int64).max
+        first_but = np.full(len(texts), no_but)
+        is_but = ids == self.but_id
+        np.minimum.at(first_but, text_of[is_but], position[is_but])
+        but_position = first_but[text_of]
+        valence = np.where((but_position != no_but) & (position < but_position), valence * 0.5, valence)
+        valence = np.where(position > but_position, valence * 1.5, valence)
+
+        count = len(texts)
+        sum_s = np.bincount(text_of, weights=valence, minlength=count)
+        pos_sum = np.bincount(text_of, weights=np.where(valence > 0, valence + 1, 0.0), minlength=count)
+        neg_sum = np.bincount(text_of, weights=np.where(valence < 0, valence - 1, 0.0), minlength=count)
+        neu_count = np.bincount(text_of, weights=(valence == 0).astype(np.float64), minlength=count)
+
+        # Ünlem (en fazla 4) ve soru işareti (2 ve üzeri) vurgusu
+        exclamations = np.minimum(np.fromiter((text.count('!') for text in texts), dtype=np.float64, count=count), 4)
+        questions = np.fromiter((text.count('?') for text in texts), dtype=np.float64, count=count)
+        emphasis = exclamations * 0.292 + np.where(questions > 3, 0.96, np.where(questions > 1, questions * 0.18, 0.0))
+
+        sum_s = sum_s + np.sign(sum_s) * emphasis
+        compound = sum_s / np.sqrt(sum_s * sum_s + 15)
+        more_positive = pos_sum > -neg_sum
+        more_negative = pos_sum < -neg_sum
+        pos_sum = np.where(more_positive, pos_sum + emphasis, pos_sum)
+        neg_sum = np.where(more_negative, neg_sum - emphasis, neg_sum)
+        total = pos_sum - neg_sum + neu_count
+        safe_total = np.where(total > 0, total, 1.0)
+
+        results = []
+        for i in range(count):
+            if not lengths[i]:
+                results.append(dict(NEUTRAL_SCORES))
+                continue
+            results.append({
+                'neg': round(abs(float(neg_sum[i] / safe_total[i])), 3),
+                'neu': round(abs(float(neu_count[i] / safe_total[i])), 3),
+                'pos': round(abs(float(pos_sum[i] / safe_total[i])), 3),
+                'compound': round(float(compound[i]), 4)
+            })
+        return results
+
+
+# Duygu modellerinin etiket adları (küçük harfle) -> olumlu/olumsuz/nötr yönü
+LABEL_POLARITIES = {
+    'positive': 'pos', 'pos': 'pos', 'olumlu': 'pos', 'pozitif': 'pos',
+    'negative': 'neg', 'neg': 'neg', 'olumsuz': 'neg', 'negatif': 'neg',
+    'neutral': 'neu', 'neu': 'neu', 'nötr': 'neu', 'notr': 'neu',
+    # Yıldız puanlı modeller (ör. nlptown/bert-base-multilingual-uncased-sentiment)
+    '1 star': 'neg', '2 stars': 'neg', '3 stars': 'neu', '4 stars': 'pos', '5 stars': 'pos'
+}
+
+# Adlandırılmamış LABEL_i etiketleri yalnızca bu sayılarda yaygın sıralamayla yorumlanır
+GENERIC_LABEL_POLARITIES = {
+    2: ('neg', 'pos'),
+    3: ('neg', 'neu', 'pos')
+}
+
+
+def label_polarities(id2label):
+    # Modelin config.id2label eşlemesinden etiket -> yön tablosu; tanınmayan etiketlerde hata verir
+    labels = [id2label[index] for index in sorted(id2label, key=int)]
+    if all(label.upper() == f'LABEL_{index}' for index, label in enumerate(labels)):
+        generic = GENERIC_LABEL_POLARITIES.get(len(labels))
+        if generic is None:
+            raise ValueError(f'{len(labels)} adlandırılmamış duygu etiketi yorumlanamıyor: {labels}')
+        return dict(zip(labels, generic))
+
+    unknown = [label for label in labels if label.lower() not in LABEL_POLARITIES]
+    if unknown:
+        raise ValueError(f'Bilinmeyen duygu etiketleri: {unknown}')
+    return {label: LABEL_POLARITIES[label.lower()] for label in labels}
+
+
+class SentimentEngine:
+    # Metin listelerini toplu puanlar; aynı metinler bir kez puanlanır, sonuçlar metin özetine göre saklanır
+    def __init__(self, backend=None, batch_size=None, max_length=None, cache_size=None, registry=None):
+        self.backend = backend or config.SENTIMENT_BACKEND
+        if self.backend not in SENTIMENT_BACKENDS:
+            raise ValueError(f'Bilinmeyen duygu analizi altyapısı: {self.backend}')
+        self.batch_size = batch_size or config.SENTIMENT_BATCH_SIZE
+        self.max_length = max_length or config.SENTIMENT_MAX_LENGTH
+        self.cache_size = config.SENTIMENT_CACHE_SIZE if cache_size is None else cache_size
+        self.registry = registry
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        self._sia = get_nltk_resources().sia
+        self._lexicon_scorer = LexiconScorer(self._sia) if self.backend == 'lexicon' else None
+        self._polarities = None
+        self._polarity_source = None
+
+    def score(self, texts):
+        texts = list(texts)
+        keys = [text_key(text) for text in texts]
+
+        results = [None] * len(texts)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[i] = cached
+                    self._hits += 1
+                else:
+                    # Aynı partide tekrarlanan metinler de bir kez puanlanır
+                    missing.setdefault(key, texts[i])
+            self._misses += len(missing)
+
+        if missing:
+            scored = dict(zip(missing, self._score_texts(list(missing.values()))))
+            with self._lock:
+                for key, value in scored.items():
+                    self._store(key, value)
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = scored[key]
+
+        # Gönderiler kendi sözlüklerini alır, önbellekteki sonuçlar değiştirilemez
+        return [dict(result) for result in results]
+
+    def score_one(self, text):
+        return self.score([text])[0]
+
+    def _store(self, key, value):
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = value
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _score_texts(self, texts):
+        if self.backend == 'lexicon':
+            return self._lexicon_scorer.score(texts)
+        if self.backend == 'transformer':
+            return self._score_transformer(texts)
+        return [self._sia.polarity_scores(text) for text in texts]
+
+    def _score_transformer(self, texts):
+        if self.registry is None:
+            from models.model_registry import get_model_registry
+            self.registry = get_model_registry()
+        sentiment_pipeline = self.registry.sentiment_pipeline
+        polarities = self._label_polarities(sentiment_pipeline)
+
+        results = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            # Boş metinler modele gönderilmez
+            inputs = [text for text in batch if text]
+            outputs = iter(sentiment_pipeline(inputs, batch_size=self.batch_size, truncation=True,
+                                              max_length=self.max_length, top_k=None) if inputs else [])
+            for text in batch:
+                if not text:
+                    results.append(dict(NEUTRAL_SCORES))
+                    continue
+                scores = dict(NEUTRAL_SCORES)
+                for item in next(outputs):
+                    scores[polarities[item['label']]] += item['score']
+                scores['compound'] = round(scores['pos'] - scores['neg'], 4)
+                results.append(scores)
+        return results
+
+    def _label_polarities(self, sentiment_pipeline):
+        # Etiket tablosu pipeline başına bir kez kurulur
+        if self._polarity_source is not sentiment_pipeline:
+            self._polarities = label_polarities(sentiment_pipeline.model.config.id2label)
+            self._polarity_source = sentiment_pipeline
+        return self._polarities
+
+    def metrics(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'backend': self.backend,
+                'batch_size': self.batch_size,
+                'cached': len(self._cache),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0
+            }
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_sentiment_engine():
+    # Süreç başına tek bir duygu analizi motoru; önbelleği tüm TextProcessor örnekleri paylaşır
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SentimentEngine()
+    return _engine
@@ -0,0 +1,273 @@
+from collections import Counter
+from heapq import heapify, heappop, heappush, nlargest
+from itertools import repeat
+import hashlib
+import math
+import numpy as np
+
+# Sayaçlar bu kadar farklı öğe biriktiğinde toplu olarak taslaklara işlenir
+FLUSH_SIZE = 4096
+HLL_PRECISION = 12
+
+
+def _item_bytes(item):
+    # Bigramlar (demet) tek bir anahtara dönüştürülür
+    if isinstance(item, tuple):
+        item = '\x1f'.join(item)
+    return item.encode('utf-8')
+
+
+def _string_array(values):
+    if not values:
+        return np.zeros(0, dtype='<U1')
+    return np.array(values, dtype=str)
+
+
+def hash_items(items):
+    # Süreçten bağımsız 64 bitlik özet; farklı süreçlerde kurulan taslaklar birleştirilebilir
+    return np.fromiter((int.from_bytes(hashlib.blake2b(_item_bytes(item), digest_size=8).digest(), 'little')
+                        for item in items), dtype=np.uint64, count=len(items))
+
+
+def _bit_length(values):
+    # 64 bitlik değerlerin bit uzunluğu; iki 32 bitlik yarı float64'te kayıpsız temsil edilir
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+class CountMinSketch:
+    # Her öğenin sayısı en fazla epsilon * toplam kadar fazla tahmin edilir (1 - delta olasılıkla)
+    def __init__(self, epsilon=0.001, delta=0.01):
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1 / delta)))
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+
+    def _columns(self, hashes):
+        # Çift özetleme: satır i için (h1 + i * h2) mod genişlik
+        first = (hashes & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        second = (hashes >> np.uint64(32)).astype(np.int64) | 1
+        rows = np.arange(self.depth, dtype=np.int64)[:, None]
+        return (first[None, :] + rows * second[None, :]) % self.width
+
+    def add_hashes(self, hashes, counts):
+        columns = self._columns(hashes)
+        for row in range(self.depth):
+            self.table[row] += np.bincount(columns[row], weights=counts, minlength=self.width).astype(np.int64)
+
+    def estimate_hashes(self, hashes):
+        if not len(hashes):
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def merge(self, other):
+        self.table += other.table
+
+
+class SpaceSaving:
+    # En fazla capacity öğe izlenir; izlenen her sayı gerçeğinden en fazla toplam / capacity kadar büyüktür
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+        # (sayı, öğe) min-yığını; eski girdiler çıkarılırken atlanır
+        self._heap = []
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, item, count=1):
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+        else:
+            # En küçük sayılı öğenin yeri devralınır, sayısı üst sınır olarak korunur
+            smallest, victim = self._pop_min()
+            del counts[victim]
+            counts[item] = smallest + count
+        heappush(self._heap, (counts[item], item))
+
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def _pop_min(self):
+        while True:
+            count, item = heappop(self._heap)
+            if self.counts.get(item) == count:
+                return count, item
+
+    def _rebuild_heap(self):
+        self._heap = [(count, item) for item, count in self.counts.items()]
+        heapify(self._heap)
+
+    def min_count(self):
+        # Dolu bir özetin dışında kalan her öğenin sayısı en fazla bu kadardır
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        # Birleştirilebilir Space-Saving: bir tarafta izlenmeyen öğe o tarafın en küçük sayısını alır
+        mine, theirs = self.min_count(), other.min_count()
+        merged = {}
+        for item in self.counts.keys() | other.counts.keys():
+            merged[item] = self.counts.get(item, mine) + other.counts.get(item, theirs)
+        self.counts = dict(nlargest(self.capacity, merged.items(), key=lambda x: x[1]))
+        self._rebuild_heap()
+
+    def most_common(self, n=None):
+        n = len(self.counts) if n is None else n
+        return nlargest(n, self.counts.items(), key=lambda x: x[1])
+
+
+class HyperLogLog:
+    # Farklı öğe sayısı tahmini; göreli hata yaklaşık 1.04 / sqrt(2 ** precision)
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        if not len(hashes):
+            return
+        shift = np.uint64(64 - self.precision)
+        index = (hashes >> shift).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - _bit_length(rest) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Küçük kümelerde doğrusal sayım daha doğrudur
+            return m * math.log(m / zeros)
+        return float(estimate)
+
+
+class HeavyHitters:
+    # Counter yerine kullanılan sabit bellekli sayaç: Space-Saving en sık öğeleri izler,
+    # Count-Min bunların sayılarını sıkılaştırır, isteğe bağlı HyperLogLog farklı öğe sayısını tahmin eder
+    def __init__(self, epsilon=0.001, delta=0.01, distinct=False):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.summary = SpaceSaving(int(math.ceil(1 / epsilon)))
+        self.sketch = CountMinSketch(epsilon, delta)
+        self.distinct = HyperLogLog() if distinct else None
+        self._total = 0
+        self._pending = Counter()
+
+    @property
+    def total(self):
+        # Tüm öğelerin toplam sayısı (henüz taslaklara işlenmemiş olanlar dahil, kesin)
+        return self._total + sum(self._pending.values())
+
+    def update(self, items):
+        # Counter.update gibi: öğe dizisi ya da birleştirilecek başka bir HeavyHitters
+        if isinstance(items, HeavyHitters):
+            self.merge(items)
+            return
+        self._pending.update(items)
+        if len(self._pending) >= FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        items = list(self._pending)
+        counts = np.fromiter(self._pending.values(), dtype=np.int64, count=len(items))
+        hashes = hash_items(items)
+
+        self.sketch.add_hashes(hashes, counts)
+        if self.distinct is not None:
+            self.distinct.add_hashes(hashes)
+
+        # Count-Min tahmini özetin en küçük sayısını geçemeyen yeni öğeler özete giremez, atlanır
+        threshold = self.summary.min_count()
+        tracked = self.summary.counts
+        estimates = self.sketch.estimate_hashes(hashes).tolist() if threshold else repeat(0)
+        for item, count, estimate in zip(items, counts.tolist(), estimates):
+            if not threshold or estimate > threshold or item in tracked:
+                self.summary.add(item, count)
+        self._total += int(counts.sum())
+        self._pending.clear()
+
+    def merge(self, other):
+        self._flush()
+        other._flush()
+        self.sketch.merge(other.sketch)
+        self.summary.merge(other.summary)
+        if self.distinct is not None and other.distinct is not None:
+            self.distinct.merge(other.distinct)
+        self._total += other._total
+
+    def estimate(self, items):
+        # Count-Min tahmini (gerçek sayıdan küçük olmaz)
+        self._flush()
+        return self.sketch.estimate_hashes(hash_items(list(items))).tolist()
+
+    def most_common(self, n=None):
+        self._flush()
+        candidates = list(self.summary.counts.items())
+        if not candidates:
+            return []
+        # İki tahmin de üst sınır olduğundan küçüğü alınır
+        estimates = self.sketch.estimate_hashes(hash_items([item for item, _ in candidates]))
+        refined = [(item, min(count, int(estimate))) for (item, count), estimate in zip(candidates, estimates)]
+        refined.sort(key=lambda x: x[1], reverse=True)
+        return refined if n is None else refined[:n]
+
+    def __len__(self):
+        # Farklı öğe sayısı: HyperLogLog varsa tahmini, yoksa izlenen öğe sayısı
+        self._flush()
+        if self.distinct is not None:
+            return int(round(self.distinct.count()))
+        return len(self.summary)
+
+    def to_arrays(self, prefix, pairs=False):
+        # Klon kaydı için pickle'sız diziler; pairs=True ise öğeler (sol, sağ) demetleridir
+        self._flush()
+        items = list(self.summary.counts)
+        arrays = {
+            f'{prefix}_table': self.sketch.table,
+            f'{prefix}_counts': np.array([self.summary.counts[item] for item in items], dtype=np.int64),
+            f'{prefix}_total': np.array([self._total], dtype=np.int64)
+        }
+        if pairs:
+            arrays[f'{prefix}_left'] = _string_array([left for left, _ in items])
+            arrays[f'{prefix}_right'] = _string_array([right for _, right in items])
+        else:
+            arrays[f'{prefix}_items'] = _string_array(items)
+        if self.distinct is not None:
+            arrays[f'{prefix}_registers'] = self.distinct.registers
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix, epsilon, delta, pairs=False):
+        counter = cls(epsilon, delta, distinct=f'{prefix}_registers' in arrays)
+        # Diziler salt okunur eşlenmiş olabilir; güncellenecekleri için kopyalanır
+        counter.sketch.table = np.array(arrays[f'{prefix}_table'], dtype=np.int64)
+        if pairs:
+            items = zip(arrays[f'{prefix}_left'].tolist(), arrays[f'{prefix}_right'].tolist())
+        else:
+            items = arrays[f'{prefix}_items'].tolist()
+        counter.summary.counts = dict(zip(items, arrays[f'{prefix}_counts'].tolist()))
+        counter.summary._rebuild_heap()
+        if counter.distinct is not None:
+            counter.distinct.registers = np.array(arrays[f'{prefix}_registers'], dtype=np.uint8)
+        counter._total = int(arrays[f'{prefix}_total'][0])
+        return counter
+
+    def __getstate__(self):
+        # İşçi süreçlerden dönerken bekleyen sayılar taslaklara işlenmiş olur
+        self._flush()
+        return self.__dict__
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
@@ -1,30 +1,286 @@
 import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.sentiment import SentimentIntensityAnalyzer
+from nltk.tokenize import word_tokenize, sent_tokenize, NLTKWordTokenizer
 from nltk.probability import FreqDist
 from nltk.collocations import BigramCollocationFinder
 from nltk.metrics import BigramAssocMeasures
+from concurrent.futures import ProcessPoolExecutor
 from collections import Counter
+from itertools import islice, repeat
+import threading
+import math
 import re
 import numpy as np
 
-class TextProcessor:
+import config
+from utils.nltk_resources import get_nltk_resources
+from utils.compact_posts import Vocabulary, CompactPost
+from utils.sketches import HeavyHitters
+from utils.sentiment import get_sentiment_engine
+
+AGGREGATION_MODES = ('exact', 'sketch')
+
+# Temizleme desenleri bir kez derlenir: URL, emoji ve noktalama dışı özel karakterler tek geçişte silinir
+STRIP_PATTERN = re.compile(r'http\S+|www\S+|https\S+|[\U00010000-\U0010ffff]|[^\w\s.,!?]', flags=re.MULTILINE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+ENTITY_PATTERN = re.compile(r'[#@]\w+')
+
+# word_tokenize'ın cümle başına uyguladığı tokenizer
+_word_tokenizer = NLTKWordTokenizer()
+
+
+class PostAggregate:
+    # Gönderi parçaları için birleştirilebilir kısmi toplamlar
     def __init__(self):
-        # NLTK gerekli dosyaları indir
-        nltk.download('punkt')
-        nltk.download('stopwords')
-        nltk.download('vader_lexicon')
-        nltk.download('averaged_perceptron_tagger')
+        self.word_counts = Counter()
+        self.bigram_counts = Counter()
+        self.hashtag_counts = Counter()
+        self.mention_counts = Counter()
+        self.first_word = None
+        self.last_word = None
+        self.word_total = 0
+        self.word_char_total = 0
+        self.sentence_total = 0
+        self.positive = 0
+        self.negative = 0
+        self.neutral = 0
+        self.compound_sum = 0
+
+    def add_post(self, processed_post):
+        words = processed_post['filtered_tokens']
+        if words:
+            # Bigramlar gönderi sınırlarını da kapsayan ardışık kelime dizisi üzerinden sayılır
+            if self.last_word is not None:
+                self.bigram_counts.update([(self.last_word, words[0])])
+            elif self.first_word is None:
+                self.first_word = words[0]
+            self.bigram_counts.update(zip(words, words[1:]))
+            self.last_word = words[-1]
         
-        self.stop_words = set(stopwords.words('turkish'))
-        self.sia = SentimentIntensityAnalyzer()
+        self.word_counts.update(words)
+        self.word_total += len(words)
+        self.word_char_total += sum(len(word) for word in words)
+        self.sentence_total += len(processed_post['sentences'])
+        self.hashtag_counts.update(processed_post['hashtags'])
+        self.mention_counts.update(processed_post['mentions'])
+        
+        # Duygu istatistiklerini güncelle
+        sentiment = processed_post['sentiment']
+        if sentiment['compound'] > 0.05:
+            self.positive += 1
+        elif sentiment['compound'] < -0.05:
+            self.negative += 1
+        else:
+            self.neutral += 1
+        self.compound_sum += sentiment['compound']
 
-    def process(self, profile_data):
-        if not profile_data or not profile_data.get('posts'):
+    def merge(self, other):
+        if other.first_word is not None:
+            if self.last_word is not None:
+                self.bigram_counts.update([(self.last_word, other.first_word)])
+            elif self.first_word is None:
+                self.first_word = other.first_word
+        if other.last_word is not None:
+            self.last_word = other.last_word
+        
+        self.word_counts.update(other.word_counts)
+        self.bigram_counts.update(other.bigram_counts)
+        self.hashtag_counts.update(other.hashtag_counts)
+        self.mention_counts.update(other.mention_counts)
+        self.word_total += other.word_total
+        self.word_char_total += other.word_char_total
+        self.sentence_total += other.sentence_total
+        self.positive += other.positive
+        self.negative += other.negative
+        self.neutral += other.neutral
+        self.compound_sum += other.compound_sum
+
+    @property
+    def post_count(self):
+        return self.positive + self.negative + self.neutral
+
+    def entity_totals(self):
+        # Toplam hashtag ve mention kullanımı
+        return sum(self.hashtag_counts.values()), sum(self.mention_counts.values())
+
+    def fill_analysis(self, analysis, post_count):
+        sentiment_stats = analysis['sentiment_stats']
+        sentiment_stats['positive'] = self.positive
+        sentiment_stats['negative'] = self.negative
+        sentiment_stats['neutral'] = self.neutral
+        sentiment_stats['compound'] = self.compound_sum
+
+        # Toplu analiz hesaplamaları
+        if post_count > 0:
+            word_total = self.word_total
+            
+            # Ortalama değerleri hesapla
+            analysis['content_stats']['avg_post_length'] = word_total / post_count
+            analysis['content_stats']['avg_word_length'] = self.word_char_total / word_total if word_total else 0
+            analysis['content_stats']['avg_sentence_length'] = word_total / self.sentence_total if self.sentence_total else 0
+            
+            # Kelime çeşitliliği (vocabulary richness)
+            analysis['content_stats']['vocabulary_richness'] = len(self.word_counts) / word_total if word_total else 0
+            
+            # En sık kullanılan kelimeler
+            analysis['top_words'] = self.word_counts.most_common(20)
+            
+            # En sık kullanılan bigramlar
+            analysis['top_bigrams'] = self._top_bigrams(10)
+            
+            # En sık kullanılan hashtag ve mentionlar
+            analysis['top_hashtags'] = self.hashtag_counts.most_common(10)
+            analysis['top_mentions'] = self.mention_counts.most_common(10)
+            
+            # Normalize sentiment compound score
+            sentiment_stats['compound'] /= post_count
+
+    def _top_bigrams(self, n):
+        bigram_finder = BigramCollocationFinder(FreqDist(self.word_counts), FreqDist(self.bigram_counts))
+        return bigram_finder.nbest(BigramAssocMeasures.likelihood_ratio, n)
+
+
+class SketchPostAggregate(PostAggregate):
+    # Sayaçlar yerine sabit bellekli taslaklar; toplu analiz alanları aynıdır, en sık öğeler ve
+    # kelime çeşitliliği yaklaşık hesaplanır (sayı hatası en fazla epsilon * toplam, 1 - delta olasılıkla)
+    def __init__(self, epsilon=None, delta=None):
+        super().__init__()
+        epsilon = epsilon or config.SKETCH_EPSILON
+        delta = delta or config.SKETCH_DELTA
+        self.word_counts = HeavyHitters(epsilon, delta, distinct=True)
+        self.bigram_counts = HeavyHitters(epsilon, delta)
+        self.hashtag_counts = HeavyHitters(epsilon, delta)
+        self.mention_counts = HeavyHitters(epsilon, delta)
+
+    def entity_totals(self):
+        # Taslaklar toplam sayıyı kesin olarak tutar
+        return self.hashtag_counts.total, self.mention_counts.total
+
+    def _top_bigrams(self, n):
+        # Olabilirlik oranı yalnızca izlenen sık bigramlar için hesaplanır; kelime sayıları Count-Min tahminidir
+        candidates = self.bigram_counts.most_common()
+        if not candidates:
+            return []
+        left = self.word_counts.estimate(bigram[0] for bigram, _ in candidates)
+        right = self.word_counts.estimate(bigram[1] for bigram, _ in candidates)
+        scored = []
+        for (bigram, count), n_ix, n_xi in zip(candidates, left, right):
+            count = min(count, n_ix, n_xi)
+            scored.append((bigram, BigramAssocMeasures.likelihood_ratio(count, (n_ix, n_xi), self.word_total)))
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        return [bigram for bigram, _ in scored[:n]]
+
+
+def new_aggregate(aggregation=None):
+    aggregation = aggregation or config.TEXT_AGGREGATION
+    if aggregation not in AGGREGATION_MODES:
+        raise ValueError(f"Bilinmeyen toplama modu: {aggregation}")
+    return SketchPostAggregate() if aggregation == 'sketch' else PostAggregate()
+
+
+_worker_processor = None
+_process_pools = {}
+_process_pools_lock = threading.Lock()
+
+
+def _init_worker():
+    global _worker_processor
+    _worker_processor = TextProcessor(workers=1)
+
+
+def _process_chunk(posts, aggregation):
+    return _worker_processor._process_posts(posts, aggregate=new_aggregate(aggregation))
+
+
+def _get_process_pool(workers):
+    # Süreç havuzu ve işçilerdeki NLTK kaynakları çağrılar arasında yeniden kullanılır
+    with _process_pools_lock:
+        pool = _process_pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            _process_pools[workers] = pool
+        return pool
+
+
+class ProcessedPostStream:
+    # İşlenen gönderileri tek tek verir; toplu analiz yalnızca sayaçlarla (PostAggregate) tutulur.
+    # Gönderileri saklamak tüketiciye bırakılır, bu nedenle bellek kullanımı gönderi sayısıyla büyümez.
+    def __init__(self, processor, posts):
+        self.processor = processor
+        self.posts = posts
+        self.aggregate = processor._new_aggregate()
+        self.post_count = 0
+
+    def __iter__(self):
+        # Duygu analizi toplu yapılabilsin diye gönderiler küçük gruplar halinde işlenir
+        posts = iter(self.posts)
+        batch_size = self.processor.sentiment.batch_size
+        while True:
+            batch = list(islice(posts, batch_size))
+            if not batch:
+                return
+            for processed_post in self.processor._process_batch(batch):
+                self.aggregate.add_post(processed_post)
+                self.post_count += 1
+                yield processed_post
+
+    def result(self, profile_data=None):
+        # Akış tükendikten sonra 'posts' anahtarı olmadan process() ile aynı toplu analizi döner
+        if self.post_count == 0:
             return None
+        
+        processed_data = self.processor._new_processed_data(profile_data or {})
+        del processed_data['posts']
+        self.processor._fill_aggregate_analysis(processed_data['aggregate_analysis'], self.aggregate, self.post_count)
+        return processed_data
+
+
+class TextProcessor:
+    def __init__(self, workers=None, chunk_size=None, compact=None, aggregation=None):
+        # NLTK verileri süreç başına bir kez doğrulanıp yüklenir, burada indirme yapılmaz
+        resources = get_nltk_resources()
+        self.stop_words = resources.stop_words
+        self.sia = resources.sia
+        # Gönderi duyguları metin listeleri halinde toplu puanlanır (ARPA_SENTIMENT_BACKEND)
+        self.sentiment = get_sentiment_engine()
+        
+        self.workers = workers or config.TEXT_WORKERS
+        self.chunk_size = chunk_size or config.TEXT_CHUNK_SIZE or None
+        # True ise process() gönderileri ortak sözlüğe bağlı CompactPost olarak döner
+        self.compact = config.TEXT_COMPACT_POSTS if compact is None else compact
+        # 'exact': sayaçlar, 'sketch': sabit bellekli taslaklarla toplu analiz
+        self.aggregation = aggregation or config.TEXT_AGGREGATION
+
+    def process(self, profile_data, workers=None):
+        processed_data, _ = self.process_with_aggregate(profile_data, workers)
+        return processed_data
+
+    def process_with_aggregate(self, profile_data, workers=None):
+        # process() ile aynı; toplu analizin kurulduğu PostAggregate de döner (klon eğitiminde yeniden kullanılır)
+        if not profile_data or not profile_data.get('posts'):
+            return None, None
 
-        processed_data = {
+        processed_data = self._new_processed_data(profile_data)
+
+        posts = profile_data['posts']
+        workers = self.workers if workers is None else workers
+        vocabulary = Vocabulary(self.stop_words) if self.compact else None
+        
+        if workers > 1 and len(posts) >= config.TEXT_PARALLEL_MIN_POSTS:
+            processed_posts, aggregate = self._process_parallel(posts, workers, vocabulary)
+        else:
+            processed_posts, aggregate = self._process_posts(posts, vocabulary)
+        
+        processed_data['posts'] = processed_posts
+        self._fill_aggregate_analysis(processed_data['aggregate_analysis'], aggregate, len(posts))
+
+        return processed_data, aggregate
+
+    def process_stream(self, posts):
+        # Gönderi yineleyicisini (ör. veri toplayıcıdan gelen akış) sınırlı bellekle işler
+        return ProcessedPostStream(self, posts)
+
+    def _new_processed_data(self, profile_data):
+        return {
             'posts': [],
             'aggregate_analysis': {
                 'sentiment_stats': {
@@ -50,117 +306,124 @@ class TextProcessor:
             'engagement_metrics': profile_data.get('engagement_metrics', {})
         }
 
-        all_words = []
-        all_sentences = []
-        all_hashtags = []
-        all_mentions = []
+    def _process_batch(self, posts):
+        cleaned_texts = [self._clean_text(post.get('content', '')) for post in posts]
+        sentiments = self.sentiment.score(cleaned_texts)
+        return [self._process_post(post, cleaned_text, sentiment)
+                for post, cleaned_text, sentiment in zip(posts, cleaned_texts, sentiments)]
+
+    def _process_post(self, post, cleaned_text=None, sentiment=None):
+        content = post.get('content', '')
         
-        # Her gönderiyi işle
-        for post in profile_data['posts']:
-            content = post.get('content', '')
-            
-            # Metin temizleme
+        # Metin temizleme
+        if cleaned_text is None:
             cleaned_text = self._clean_text(content)
-            
-            # Tokenization
-            tokens = word_tokenize(cleaned_text)
-            sentences = sent_tokenize(cleaned_text)
-            
-            # Stop words'leri kaldır
-            filtered_tokens = [token for token in tokens if token not in self.stop_words]
-            
-            # Duygu analizi
-            sentiment = self.sia.polarity_scores(cleaned_text)
-            
-            # Kelime frekansı
-            word_freq = self._get_word_frequency(filtered_tokens)
-            
-            # Hashtag ve mention analizi
-            hashtags = re.findall(r'#\w+', content)
-            mentions = re.findall(r'@\w+', content)
-            
-            # Bigram analizi
-            bigrams = list(nltk.bigrams(filtered_tokens))
-            
-            processed_post = {
-                'original_text': content,
-                'cleaned_text': cleaned_text,
-                'tokens': tokens,
-                'filtered_tokens': filtered_tokens,
-                'sentences': sentences,
-                'sentiment': sentiment,
-                'word_frequency': word_freq,
-                'hashtags': hashtags,
-                'mentions': mentions,
-                'bigrams': bigrams
-            }
-            
-            # Orijinal post verilerini koru
-            processed_post.update({k:v for k,v in post.items() if k not in processed_post})
-            
-            processed_data['posts'].append(processed_post)
-            
-            # Toplu analiz için veri toplama
-            all_words.extend(filtered_tokens)
-            all_sentences.extend(sentences)
-            all_hashtags.extend(hashtags)
-            all_mentions.extend(mentions)
-            
-            # Duygu istatistiklerini güncelle
-            if sentiment['compound'] > 0.05:
-                processed_data['aggregate_analysis']['sentiment_stats']['positive'] += 1
-            elif sentiment['compound'] < -0.05:
-                processed_data['aggregate_analysis']['sentiment_stats']['negative'] += 1
-            else:
-                processed_data['aggregate_analysis']['sentiment_stats']['neutral'] += 1
-            
-            processed_data['aggregate_analysis']['sentiment_stats']['compound'] += sentiment['compound']
+        
+        # Tokenization
+        tokens, sentences = self._tokenize(cleaned_text)
+        
+        # Stop words'leri kaldır
+        filtered_tokens = [token for token in tokens if token not in self.stop_words]
+        
+        # Duygu analizi
+        if sentiment is None:
+            sentiment = self.sentiment.score_one(cleaned_text)
+        
+        # Kelime frekansı
+        word_freq = self._get_word_frequency(filtered_tokens)
+        
+        # Hashtag ve mention analizi
+        hashtags, mentions = self._extract_entities(post, content)
+        
+        # Bigram analizi
+        bigrams = list(nltk.bigrams(filtered_tokens))
+        
+        processed_post = {
+            'original_text': content,
+            'cleaned_text': cleaned_text,
+            'tokens': tokens,
+            'filtered_tokens': filtered_tokens,
+            'sentences': sentences,
+            'sentiment': sentiment,
+            'word_frequency': word_freq,
+            'hashtags': hashtags,
+            'mentions': mentions,
+            'bigrams': bigrams
+        }
+        
+        # Orijinal post verilerini koru
+        processed_post.update({k:v for k,v in post.items() if k not in processed_post})
+        
+        return processed_post
 
-        # Toplu analiz hesaplamaları
-        if len(profile_data['posts']) > 0:
-            # Ortalama değerleri hesapla
-            processed_data['aggregate_analysis']['content_stats']['avg_post_length'] = len(all_words) / len(profile_data['posts'])
-            processed_data['aggregate_analysis']['content_stats']['avg_word_length'] = sum(len(word) for word in all_words) / len(all_words) if all_words else 0
-            processed_data['aggregate_analysis']['content_stats']['avg_sentence_length'] = len(all_words) / len(all_sentences) if all_sentences else 0
-            
-            # Kelime çeşitliliği (vocabulary richness)
-            unique_words = set(all_words)
-            processed_data['aggregate_analysis']['content_stats']['vocabulary_richness'] = len(unique_words) / len(all_words) if all_words else 0
-            
-            # En sık kullanılan kelimeler
-            word_freq = FreqDist(all_words)
-            processed_data['aggregate_analysis']['top_words'] = word_freq.most_common(20)
-            
-            # En sık kullanılan bigramlar
-            bigram_finder = BigramCollocationFinder.from_words(all_words)
-            processed_data['aggregate_analysis']['top_bigrams'] = bigram_finder.nbest(BigramAssocMeasures.likelihood_ratio, 10)
-            
-            # En sık kullanılan hashtag ve mentionlar
-            hashtag_freq = Counter(all_hashtags)
-            mention_freq = Counter(all_mentions)
-            processed_data['aggregate_analysis']['top_hashtags'] = hashtag_freq.most_common(10)
-            processed_data['aggregate_analysis']['top_mentions'] = mention_freq.most_common(10)
-            
-            # Normalize sentiment compound score
-            processed_data['aggregate_analysis']['sentiment_stats']['compound'] /= len(profile_data['posts'])
+    def _new_aggregate(self):
+        return new_aggregate(self.aggregation)
 
-        return processed_data
+    def _process_posts(self, posts, vocabulary=None, aggregate=None):
+        processed_posts = []
+        if aggregate is None:
+            aggregate = self._new_aggregate()
+        for post, processed_post in zip(posts, self._process_batch(posts)):
+            aggregate.add_post(processed_post)
+            if vocabulary is not None:
+                processed_post = CompactPost(vocabulary, processed_post, post)
+            processed_posts.append(processed_post)
+        return processed_posts, aggregate
 
-    def _clean_text(self, text):
-        # URL'leri kaldır
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    def _process_parallel(self, posts, workers, vocabulary=None):
+        # Gönderiler parçalara bölünüp süreç havuzunda işlenir, sonuçlar sırayla birleştirilir
+        chunk_size = self.chunk_size or max(1, math.ceil(len(posts) / (workers * 4)))
+        chunks = [posts[i:i + chunk_size] for i in range(0, len(posts), chunk_size)]
         
-        # Emojileri kaldır
-        text = re.sub(r'[\U00010000-\U0010ffff]', '', text)
+        processed_posts = []
+        aggregate = self._new_aggregate()
+        chunk_results = _get_process_pool(workers).map(_process_chunk, chunks, repeat(self.aggregation))
+        for chunk, (chunk_posts, chunk_aggregate) in zip(chunks, chunk_results):
+            if vocabulary is not None:
+                # Sözlük ana süreçte tutulur, parçalar geldikçe sıkıştırılır
+                chunk_posts = [CompactPost(vocabulary, processed_post, post)
+                               for processed_post, post in zip(chunk_posts, chunk)]
+            processed_posts.extend(chunk_posts)
+            aggregate.merge(chunk_aggregate)
         
-        # Özel karakterleri kaldır ama noktalama işaretlerini koru
-        text = re.sub(r'[^\w\s.,!?]', '', text)
+        # Ondalıklı toplam, seri yol ile birebir aynı sonucu vermesi için gönderi sırasıyla yeniden toplanır
+        aggregate.compound_sum = 0
+        for processed_post in processed_posts:
+            aggregate.compound_sum += processed_post['sentiment']['compound']
+        
+        return processed_posts, aggregate
+
+    def _fill_aggregate_analysis(self, analysis, aggregate, post_count):
+        aggregate.fill_analysis(analysis, post_count)
+
+    def _clean_text(self, text):
+        text = STRIP_PATTERN.sub('', text)
         
         # Fazla boşlukları kaldır
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
         
         return text.lower()
 
+    def _tokenize(self, cleaned_text):
+        # Cümleler bir kez bölünür, kelimeler cümle başına çıkarılır (word_tokenize ile aynı sonuç)
+        sentences = sent_tokenize(cleaned_text)
+        tokens = [token for sentence in sentences for token in _word_tokenizer.tokenize(sentence)]
+        return tokens, sentences
+
+    def _extract_entities(self, post, content):
+        # Veri toplayıcının zaten çıkardığı listeler varsa yeniden kullanılır
+        if 'hashtags' in post and 'mentions' in post:
+            return post['hashtags'], post['mentions']
+        
+        hashtags = []
+        mentions = []
+        for entity in ENTITY_PATTERN.findall(content):
+            if entity[0] == '#':
+                hashtags.append(entity)
+            else:
+                mentions.append(entity)
+        return hashtags, mentions
+
     def _get_word_frequency(self, tokens):
         # Stop words'leri kaldır
         tokens = [token for token in tokens if token not in self.stop_words]